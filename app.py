@@ -18,39 +18,17 @@ Team: Ghazala (Senior TL), Megha (Senior TL), Afreen (Trainee TL), Soumya (Train
 Version: 12.0 - Complete OCR/NER Edition
 """
 
+# Only light modules at the top: the login page must not wait for pandas, plotly or PIL.
+# Each view imports the heavy libraries it needs (cached in sys.modules after the first use)
+# Startup profile: python benchmarks/bench_startup.py
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import json
 import io
-from PIL import Image
-import re
-
-# Try to import OCR/NER libraries
-try:
-    import pytesseract
-    OCR_AVAILABLE = True
-except ImportError:
-    OCR_AVAILABLE = False
-
-try:
-    import cv2
-    CV2_AVAILABLE = True
-except ImportError:
-    CV2_AVAILABLE = False
-
-try:
-    import spacy
-    try:
-        nlp = spacy.load("en_core_web_sm")
-        NER_AVAILABLE = True
-    except:
-        NER_AVAILABLE = False
-except ImportError:
-    NER_AVAILABLE = False
+import os
+import queue
+import threading
+from ironlady_ocr import ENGINES, document_hash
 
 # ============================================
 # PAGE CONFIGURATION
@@ -198,6 +176,12 @@ if 'team_data' not in st.session_state:
 if 'sheets_data_loaded' not in st.session_state:
     st.session_state.sheets_data_loaded = False
 
+if 'data_as_of' not in st.session_state:
+    st.session_state.data_as_of = None
+
+if 'data_from_snapshot' not in st.session_state:
+    st.session_state.data_from_snapshot = False
+
 if 'uploaded_documents' not in st.session_state:
     st.session_state.uploaded_documents = {}
 
@@ -207,6 +191,9 @@ if 'ocr_results' not in st.session_state:
 if 'checklist_state' not in st.session_state:
     st.session_state.checklist_state = {}
 
+if 'active_view' not in st.session_state:
+    st.session_state.active_view = "📊 My Dashboard"
+
 # ============================================
 # USER CREDENTIALS
 # ============================================
@@ -287,279 +274,303 @@ DAILY_CHECKLISTS = {
 }
 
 # ============================================
-# OCR FUNCTIONS
+# GOOGLE SHEETS INTEGRATION
 # ============================================
 
-def preprocess_image(image):
-    """Preprocess image for better OCR results"""
-    if not CV2_AVAILABLE:
-        return image
-    
+def parse_team_sheet(all_data):
+    """Parse a team leader's worksheet grid (rows as returned by get_all_values) with complex structure"""
     try:
-        # Convert PIL to OpenCV format
-        img_array = np.array(image)
-        
-        # Convert to grayscale
-        gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
-        
-        # Apply thresholding
-        thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
+        from ironlady_sheets import summarize_team_grid
         
-        # Noise removal
-        denoised = cv2.fastNlMeansDenoising(thresh)
-        
-        return Image.fromarray(denoised)
+        return summarize_team_grid(all_data)
+    
     except Exception as e:
-        return image
+        st.error(f"Error parsing sheet: {e}")
+        return None
+
+def parse_and_record_team_sheet(team, all_data):
+    """Parse a team sheet and queue it for the local RM history (recorded in the background)"""
+    data = parse_team_sheet(all_data)
+    _history_queue().put((team, all_data))
+    return data
+
+@st.cache_resource(show_spinner=False)
+def _history_queue():
+    """Team sheets waiting to be recorded, drained by one background thread per process"""
+    pending = queue.Queue()
+    threading.Thread(target=_record_history, args=(pending,), name='rm-history', daemon=True).start()
+    return pending
+
+def _record_history(pending):
+    """
+    Background worker: store the date blocks of each queued team sheet that are new or
+    changed since this process last recorded it (on its first sheet, those dated on or
+    after the team's newest recorded date), then fold them into the rollups
+    """
+    from rm_history import append_records, latest_recorded_date, records_from_grid
+    from rm_rollups import update_rollups
+    
+    recorded = {}  # team -> {date: fingerprint} of blocks already in the history
+    while True:
+        team, all_data = pending.get()
+        try:
+            since = None
+            if team not in recorded:
+                recorded[team] = {}
+                since = latest_recorded_date(team)
+            
+            records = records_from_grid(team, all_data, since=since, recorded=recorded[team])
+            append_records(records)
+            update_rollups(records)
+        except Exception as e:
+            # Start over from the newest recorded date next time
+            recorded.pop(team, None)
+            print(f"⚠️  Could not record RM history for {team}: {e}")
+
+# Shared sheet cache: one download serves every session in this process
+SHEETS_CACHE_TTL = int(os.getenv('SHEETS_CACHE_TTL', '300'))  # seconds
+SHEETS_CACHE_MAX_ENTRIES = int(os.getenv('SHEETS_CACHE_MAX_ENTRIES', '8'))
+
+# How often to ask Drive whether the spreadsheet changed
+SHEETS_VERSION_CHECK_TTL = int(os.getenv('SHEETS_VERSION_CHECK_TTL', '30'))  # seconds
+
+# Map worksheet names to team leaders
+SHEET_MAPPING = {
+    'Ghazala': 'ghazala',
+    'Megha': 'megha',
+    'Afreen': 'afreen',
+    'Soumya': 'soumya'
+}
 
-def extract_text_from_image(image):
-    """Extract text from image using OCR"""
-    if not OCR_AVAILABLE:
-        return None, "OCR not available. Install pytesseract."
+@st.cache_resource(show_spinner=False)
+def get_sheets_session(sheet_id):
+    """Authorized Sheets session shared by all users of this process"""
+    from ironlady_sheets import SHEETS_BACKEND, open_sheets_session
     
-    try:
-        # Preprocess image
-        processed_image = preprocess_image(image)
-        
-        # Extract text
-        text = pytesseract.image_to_string(processed_image)
-        
-        return text, None
-    except Exception as e:
-        return None, f"OCR Error: {str(e)}"
+    credentials_dict = {} if SHEETS_BACKEND == 'local' else dict(st.secrets['GOOGLE_SHEETS_CREDENTIALS'])
+    return open_sheets_session(credentials_dict, sheet_id)
 
-# ============================================
-# NER FUNCTIONS
-# ============================================
+def configured_sheet_id():
+    """Sheet ID to load team data from, or '' when no sheet source is configured"""
+    from ironlady_sheets import SHEETS_BACKEND
+    
+    # The local backend (SHEETS_BACKEND=local) serves a workbook file, no secrets needed
+    if SHEETS_BACKEND == 'local':
+        return 'local'
+    
+    if 'GOOGLE_SHEETS_CREDENTIALS' in st.secrets:
+        return st.secrets.get('GOOGLE_SHEET_ID', '')
+    
+    return ''
 
-def extract_entities(text):
-    """Extract named entities from text"""
-    if not NER_AVAILABLE:
-        return None, "NER not available"
+@st.cache_resource(show_spinner=False)
+def get_parsed_sheet_cache():
+    """Parse results per worksheet, reused while a sheet's content is unchanged"""
+    from ironlady_sheets import ParsedSheetCache
     
-    try:
-        doc = nlp(text)
-        
-        entities = {
-            'PERSON': [],
-            'ORG': [],
-            'DATE': [],
-            'MONEY': [],
-            'CARDINAL': [],
-            'PERCENT': [],
-            'PHONE': [],
-            'EMAIL': []
-        }
-        
-        # Extract spaCy entities
-        for ent in doc.ents:
-            if ent.label_ in entities:
-                entities[ent.label_].append(ent.text)
-        
-        # Extract phone numbers (simple regex)
-        phones = re.findall(r'\b\d{10}\b|\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', text)
-        entities['PHONE'] = phones
-        
-        # Extract emails (simple regex)
-        emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
-        entities['EMAIL'] = emails
+    return ParsedSheetCache()
+
+@st.cache_resource(show_spinner=False)
+def get_ocr_cache():
+    """OCR/NER results by file content hash, shared by every session of this process"""
+    from ironlady_ocr import OCRResultCache
+    
+    return OCRResultCache()
+
+@st.cache_resource(show_spinner=False)
+def get_ocr_pool():
+    """Worker processes for batch OCR, shared by every session of this process"""
+    from ironlady_ocr import OCRWorkerPool
+    
+    return OCRWorkerPool()
+
+@st.cache_resource(show_spinner=False)
+def _sheets_data_version():
+    """Process-wide data version, bumped by 'Reload Google Sheets'"""
+    return {'version': 0}
+
+@st.cache_data(ttl=SHEETS_VERSION_CHECK_TTL, show_spinner=False)
+def get_drive_version(sheet_id, data_version):
+    """Drive version of the spreadsheet file, re-checked at most every SHEETS_VERSION_CHECK_TTL seconds"""
+    return get_sheets_session(sheet_id).drive_version()
+
+@st.cache_data(ttl=SHEETS_CACHE_TTL, max_entries=SHEETS_CACHE_MAX_ENTRIES, show_spinner=False)
+def fetch_team_data(sheet_id, data_version, drive_version=None):
+    """
+    Download and parse all team sheets - cached process-wide by sheet ID and data version
+    Grids are only re-downloaded when Drive reports a new file version, and only
+    worksheets whose content changed are re-parsed
+    """
+    session = get_sheets_session(sheet_id)
+    parsed_cache = get_parsed_sheet_cache()
+    
+    # Match worksheets to team leaders
+    matched_sheets = []
+    for worksheet in session.worksheets():
+        sheet_title = worksheet.title
+        
+        # Find matching team leader
+        username = None
+        for sheet_name, user in SHEET_MAPPING.items():
+            if sheet_name.lower() in sheet_title.lower():
+                username = user
+                break
         
-        # Remove duplicates
-        for key in entities:
-            entities[key] = list(set(entities[key]))
+        if username and username in USERS:
+            matched_sheets.append((sheet_title, username))
+    
+    # Fetch all matched sheets concurrently, within quota (skipped if unchanged)
+    grids = session.fetch_grids([title for title, _ in matched_sheets], version=drive_version)
+    
+    # Parse each team leader's sheet (and record its RM history)
+    team_data = {}
+    for sheet_title, username in matched_sheets:
+        team = USERS[username]['name']
+        data = parsed_cache.parse(
+            sheet_title,
+            grids[sheet_title],
+            lambda grid, team=team: parse_and_record_team_sheet(team, grid)
+        )
         
-        return entities, None
-    except Exception as e:
-        return None, f"NER Error: {str(e)}"
-
-def extract_metrics_from_text(text):
-    """Extract sales metrics from text"""
-    metrics = {
-        'pitches': [],
-        'registrations': [],
-        'leads': [],
-        'rms': []
-    }
+        if data:
+            team_data[username] = data
     
-    # Look for numbers near keywords
-    patterns = {
-        'pitches': r'(?:pitch|pitches|calls?)\s*[:=]?\s*(\d+)',
-        'registrations': r'(?:registration|registrations|reg|regs)\s*[:=]?\s*(\d+)',
-        'leads': r'(?:lead|leads)\s*[:=]?\s*(\d+)',
-        'rms': r'(?:rm|rms|team\s*member)\s*[:=]?\s*(\d+)'
+    return team_data
+
+def invalidate_sheets_cache(sheet_id):
+    """Drop cached sheet data for every session so the next load re-checks the spreadsheet"""
+    _sheets_data_version()['version'] += 1
+    fetch_team_data.clear()
+    get_sheets_session(sheet_id).refresh_metadata()
+
+@st.cache_resource(show_spinner=False)
+def _latest_team_data():
+    """
+    Newest team data known to this process, seeded from the on-disk snapshot
+    so a cold start can render immediately while Google Sheets is fetched
+    """
+    from team_snapshot import load_snapshot
+    
+    team_data, saved_at = load_snapshot()
+    return {
+        'team_data': team_data,
+        'as_of': saved_at,
+        'from_snapshot': bool(team_data),
+        'refreshing': False,
+        'stale_reason': None,
+        'lock': threading.Lock()
     }
+
+def mark_team_data_stale(error):
+    """
+    Google Sheets failed (or its circuit breaker is open): keep serving the newest data
+    already known - from memory or the snapshot - flagged stale until a fetch succeeds
+    """
+    latest = _latest_team_data()
+    with latest['lock']:
+        latest['stale_reason'] = str(error)
+    
+    return sync_team_data()
+
+def publish_team_data(team_data):
+    """Make freshly fetched team data the process-wide latest and write it to the snapshot"""
+    from team_snapshot import save_snapshot
     
-    for key, pattern in patterns.items():
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        metrics[key] = [int(m) for m in matches]
+    latest = _latest_team_data()
+    as_of = datetime.now()
     
-    return metrics
-
-# ============================================
-# GOOGLE SHEETS INTEGRATION
-# ============================================
+    with latest['lock']:
+        latest['team_data'] = team_data
+        latest['as_of'] = as_of
+        latest['from_snapshot'] = False
+        latest['stale_reason'] = None
+    
+    save_snapshot(team_data, as_of)
+    return as_of
 
-def parse_team_sheet(worksheet):
-    """Parse a team leader's worksheet with complex structure"""
+def _refresh_team_data(sheet_id):
+    """Background worker: fetch the team sheets and publish the result"""
+    latest = _latest_team_data()
+    
     try:
-        all_data = worksheet.get_all_values()
-        
-        # Find the team leader name from the sheet
-        team_name = None
-        for row in all_data[:10]:
-            if row[1] and ('-' in row[1] or 'Rising' in row[1] or 'Winners' in row[1] or 'Flyers' in row[1] or 'Getters' in row[1]):
-                team_name = row[1]
-                break
+        data_version = _sheets_data_version()['version']
+        drive_version = get_drive_version(sheet_id, data_version)
+        team_data = fetch_team_data(sheet_id, data_version, drive_version)
         
-        # Initialize aggregates
-        total_wa_audit = 0
-        total_call_audit = 0
-        total_mocks = 0
-        total_sl_calls = 0
-        total_registrations = 0
-        total_pitches = 0
-        total_current_mc = 0
-        rm_count = 0
-        
-        # Parse each row looking for achieved values
-        for row in all_data:
-            if len(row) < 15:
-                continue
-            
-            # Check if this is a data row (has RM name and numbers)
-            rm_name = row[1] if len(row) > 1 else ''
-            
-            # Skip header rows and team name rows
-            if not rm_name or 'RM Name' in rm_name or 'Target' in rm_name or 'Achieved' in rm_name:
-                continue
-            if team_name and team_name in rm_name:
-                continue
-            
-            # Try to extract achieved values from various columns
-            try:
-                # WA Audit Achieved (column D, index 3)
-                if len(row) > 3 and row[3] and row[3].strip() and row[3].strip().isdigit():
-                    total_wa_audit += int(row[3])
-                
-                # Call Audit Achieved (column F, index 5)
-                if len(row) > 5 and row[5] and row[5].strip() and row[5].strip().isdigit():
-                    total_call_audit += int(row[5])
-                
-                # Mocks Achieved (column H, index 7)
-                if len(row) > 7 and row[7] and row[7].strip() and row[7].strip().isdigit():
-                    total_mocks += int(row[7])
-                
-                # SL Calls Achieved (column J, index 9)
-                if len(row) > 9 and row[9] and row[9].strip() and row[9].strip().isdigit():
-                    total_sl_calls += int(row[9])
-                
-                # Follow ups Registrations Achieved (column L, index 11)
-                if len(row) > 11 and row[11] and row[11].strip():
-                    val = row[11].strip()
-                    # Extract number even if it has text (like "1-Shwetha")
-                    num = re.findall(r'\d+', val)
-                    if num:
-                        total_registrations += int(num[0])
-                
-                # Pitches Achieved (column N, index 13)
-                if len(row) > 13 and row[13] and row[13].strip() and row[13].strip().isdigit():
-                    total_pitches += int(row[13])
-                
-                # Current MC Registrations Achieved (column P, index 15)
-                if len(row) > 15 and row[15] and row[15].strip() and row[15].strip().isdigit():
-                    total_current_mc += int(row[15])
-                
-                # Count this RM if they have any data
-                if any([row[3], row[5], row[7], row[9], row[11], row[13], row[15]]):
-                    rm_count += 1
-            except:
-                continue
-        
-        # Calculate conversion rate
-        conversion_rate = round((total_registrations / total_pitches * 100), 1) if total_pitches > 0 else 0.0
-        
-        return {
-            'team_name': team_name,
-            'total_rms': rm_count,
-            'total_wa_audit': total_wa_audit,
-            'total_call_audit': total_call_audit,
-            'total_mocks': total_mocks,
-            'total_sl_calls': total_sl_calls,
-            'total_pitches': total_pitches,
-            'total_registrations': total_registrations,
-            'total_current_mc': total_current_mc,
-            'conversion_rate': conversion_rate
-        }
-    
+        if team_data:
+            publish_team_data(team_data)
     except Exception as e:
-        st.error(f"Error parsing sheet: {e}")
-        return None
+        print(f"⚠️  Background refresh from Google Sheets failed: {e}")
+        with latest['lock']:
+            latest['stale_reason'] = str(e)
+    finally:
+        latest['refreshing'] = False
+
+def refresh_in_background():
+    """Start a background refresh from Google Sheets unless one is already running"""
+    sheet_id = configured_sheet_id()
+    if not sheet_id:
+        return False
+    
+    latest = _latest_team_data()
+    with latest['lock']:
+        if latest['refreshing']:
+            return True
+        latest['refreshing'] = True
+    
+    threading.Thread(target=_refresh_team_data, args=(sheet_id,), daemon=True).start()
+    return True
+
+def sync_team_data():
+    """Adopt the process-wide latest team data if it is newer than this session's copy"""
+    latest = _latest_team_data()
+    
+    with latest['lock']:
+        team_data = latest['team_data']
+        as_of = latest['as_of']
+        from_snapshot = latest['from_snapshot']
+    
+    if not team_data:
+        return False
+    
+    if st.session_state.data_as_of is None or (as_of and as_of > st.session_state.data_as_of):
+        st.session_state.team_data.update(team_data)
+        st.session_state.data_as_of = as_of
+        st.session_state.data_from_snapshot = from_snapshot
+        st.session_state.sheets_data_loaded = True
+    
+    return True
 
-def load_from_sheets():
-    """Load data from Google Sheets with multiple team sheets"""
+def load_from_sheets(force_refresh=False):
+    """Load data from Google Sheets with multiple team sheets (served from the shared cache when fresh)"""
     try:
-        import gspread
-        from google.oauth2.service_account import Credentials
+        # Sheet source from Streamlit secrets (or the local backend)
+        sheet_id = configured_sheet_id()
         
-        # Try to get credentials from Streamlit secrets
-        if 'GOOGLE_SHEETS_CREDENTIALS' in st.secrets:
-            credentials_dict = dict(st.secrets['GOOGLE_SHEETS_CREDENTIALS'])
-            sheet_id = st.secrets.get('GOOGLE_SHEET_ID', '')
+        if sheet_id:
+            if force_refresh:
+                invalidate_sheets_cache(sheet_id)
             
-            if sheet_id:
-                credentials = Credentials.from_service_account_info(
-                    credentials_dict,
-                    scopes=[
-                        'https://www.googleapis.com/auth/spreadsheets.readonly',
-                        'https://www.googleapis.com/auth/drive.readonly'
-                    ]
-                )
-                
-                client = gspread.authorize(credentials)
-                spreadsheet = client.open_by_key(sheet_id)
-                
-                # Get all worksheets
-                worksheets = spreadsheet.worksheets()
-                
-                # Map worksheet names to team leaders
-                sheet_mapping = {
-                    'Ghazala': 'ghazala',
-                    'Megha': 'megha',
-                    'Afreen': 'afreen',
-                    'Soumya': 'soumya'
-                }
-                
-                loaded_count = 0
-                
-                # Parse each team leader's sheet
-                for worksheet in worksheets:
-                    sheet_title = worksheet.title
-                    
-                    # Find matching team leader
-                    username = None
-                    for sheet_name, user in sheet_mapping.items():
-                        if sheet_name.lower() in sheet_title.lower():
-                            username = user
-                            break
-                    
-                    if username and username in USERS:
-                        # Parse the sheet
-                        data = parse_team_sheet(worksheet)
-                        
-                        if data:
-                            # Store in session state
-                            st.session_state.team_data[username] = data
-                            loaded_count += 1
-                
-                if loaded_count > 0:
-                    st.session_state.sheets_data_loaded = True
-                    return True, f"Data loaded from {loaded_count} team sheets successfully!"
-                else:
-                    return False, "No data found in sheets"
+            data_version = _sheets_data_version()['version']
+            drive_version = get_drive_version(sheet_id, data_version)
+            team_data = fetch_team_data(sheet_id, data_version, drive_version)
+            
+            if team_data:
+                # Store in session state (and in the snapshot for the next cold start)
+                st.session_state.team_data.update(team_data)
+                st.session_state.sheets_data_loaded = True
+                st.session_state.data_as_of = publish_team_data(team_data)
+                st.session_state.data_from_snapshot = False
+                return True, f"Data loaded from {len(team_data)} team sheets successfully!"
+            else:
+                return False, "No data found in sheets"
         
         return False, "Google Sheets not configured"
     
     except Exception as e:
+        if mark_team_data_stale(e):
+            as_of = st.session_state.data_as_of.strftime('%d %b, %I:%M %p') if st.session_state.data_as_of else 'the last snapshot'
+            return False, f"Google Sheets unavailable ({e}) - showing data from {as_of}"
         return False, f"Error loading from Google Sheets: {str(e)}"
 
 # ============================================
@@ -592,10 +603,14 @@ def show_login():
                 st.session_state.logged_in = True
                 st.session_state.current_user = username.lower()
                 
-                # Try to load Google Sheets data on login
-                success, message = load_from_sheets()
-                if success:
-                    st.success(message)
+                # Show the last snapshot right away and refresh behind it;
+                # without a snapshot, load Google Sheets data before continuing
+                if sync_team_data():
+                    refresh_in_background()
+                else:
+                    success, message = load_from_sheets()
+                    if success:
+                        st.success(message)
                 
                 st.rerun()
             else:
@@ -617,6 +632,23 @@ def show_login():
 # SIDEBAR
 # ============================================
 
+def show_data_freshness():
+    """Show when the team data was last fetched and whether a refresh is running"""
+    
+    if st.session_state.data_as_of is None:
+        return
+    
+    as_of = st.session_state.data_as_of.strftime('%d %b, %I:%M %p')
+    source = " (saved snapshot)" if st.session_state.data_from_snapshot else ""
+    latest = _latest_team_data()
+    status = " · 🔄 refreshing..." if latest['refreshing'] else ""
+    if latest['stale_reason']:
+        status += " · ⚠️ stale - Google Sheets unavailable"
+    
+    st.sidebar.markdown(f"""
+    <p style='color: rgba(255,255,255,0.85); margin: 0; font-size: 0.8rem;'>🕒 Data as of {as_of}{source}{status}</p>
+    """, unsafe_allow_html=True)
+
 def show_sidebar():
     """Display sidebar with user info and navigation"""
     
@@ -638,6 +670,14 @@ def show_sidebar():
     </div>
     """, unsafe_allow_html=True)
     
+    show_data_freshness()
+    
+    st.sidebar.markdown("---")
+    
+    # Navigation - only the selected view runs on each rerun
+    st.sidebar.markdown("<p style='color: white; font-weight: 700;'>🧭 NAVIGATION</p>", unsafe_allow_html=True)
+    st.sidebar.radio("View", list(VIEWS), key='active_view', label_visibility='collapsed')
+    
     st.sidebar.markdown("---")
     
     # Quick actions
@@ -645,7 +685,7 @@ def show_sidebar():
     
     if st.sidebar.button("🔄 Reload Google Sheets", use_container_width=True):
         with st.spinner("Loading..."):
-            success, message = load_from_sheets()
+            success, message = load_from_sheets(force_refresh=True)
             if success:
                 st.sidebar.success(message)
                 st.rerun()
@@ -767,34 +807,31 @@ def show_team_performance():
         }
     }
     
-    # Create tabs for each team
-    tab_names = list(teams.keys())
-    tabs = st.tabs(tab_names)
+    # One team at a time - each embedded sheet is a full Google Sheets page load
+    team_name = st.radio("Team", list(teams.keys()), horizontal=True, key='team_sheet_view', label_visibility='collapsed')
+    
+    gid = teams[team_name]['gid']
+    embed_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/edit?gid={gid}&rm=minimal&single=true&widget=false"
+    full_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/edit?gid={gid}"
+    
+    st.markdown(f"### {team_name}")
+    
+    # Embed sheet
+    st.markdown(
+        f'''
+        <iframe 
+            src="{embed_url}" 
+            width="100%" 
+            height="700" 
+            frameborder="0"
+            style="border: 2px solid {teams[team_name]['color']}; border-radius: 10px;"
+        ></iframe>
+        ''',
+        unsafe_allow_html=True
+    )
     
-    for tab, team_name in zip(tabs, tab_names):
-        with tab:
-            gid = teams[team_name]['gid']
-            embed_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/edit?gid={gid}&rm=minimal&single=true&widget=false"
-            full_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/edit?gid={gid}"
-            
-            st.markdown(f"### {team_name}")
-            
-            # Embed sheet
-            st.markdown(
-                f'''
-                <iframe 
-                    src="{embed_url}" 
-                    width="100%" 
-                    height="700" 
-                    frameborder="0"
-                    style="border: 2px solid {teams[team_name]['color']}; border-radius: 10px;"
-                ></iframe>
-                ''',
-                unsafe_allow_html=True
-            )
-            
-            # Link to open in new tab
-            st.markdown(f"[🔗 Open in New Tab]({full_url})")
+    # Link to open in new tab
+    st.markdown(f"[🔗 Open in New Tab]({full_url})")
 
 # ============================================
 # TAB 3: ANALYTICS
@@ -803,6 +840,9 @@ def show_team_performance():
 def show_analytics():
     """Show advanced analytics"""
     
+    import pandas as pd
+    import plotly.express as px
+    
     st.markdown("# 📈 ADVANCED ANALYTICS")
     st.markdown("---")
     
@@ -930,8 +970,93 @@ def show_analytics():
 # TAB 4: DOCUMENT UPLOAD WITH OCR/NER
 # ============================================
 
+def show_ocr_result(result, file_details):
+    """Show one image's OCR/NER results (see ironlady_ocr.analyze_image) and add them to its file details"""
+    text = result['text']
+    if not text:
+        st.warning(f"⚠️ Could not extract text: {result['error']}")
+        return
+    
+    st.success("✅ OCR Complete")
+    
+    # Store OCR result
+    file_details['ocr_text'] = text
+    file_details['has_ocr'] = True
+    
+    # Show extracted text
+    with st.expander("📄 Extracted Text", expanded=True):
+        st.text_area("OCR Output", text, height=200, key=f"ocr_{file_details['content_hash']}")
+    
+    entities = result['entities']
+    if entities:
+        file_details['entities'] = entities
+        file_details['has_ner'] = True
+        
+        st.markdown("##### 🎯 Extracted Entities")
+        
+        # Display entities in columns
+        ent_col1, ent_col2 = st.columns(2)
+        
+        with ent_col1:
+            if entities.get('PERSON'):
+                st.markdown("**👤 People:**")
+                for person in entities['PERSON']:
+                    st.markdown(f"- {person}")
+            
+            if entities.get('DATE'):
+                st.markdown("**📅 Dates:**")
+                for date in entities['DATE']:
+                    st.markdown(f"- {date}")
+            
+            if entities.get('PHONE'):
+                st.markdown("**📞 Phone Numbers:**")
+                for phone in entities['PHONE']:
+                    st.markdown(f"- {phone}")
+        
+        with ent_col2:
+            if entities.get('ORG'):
+                st.markdown("**🏢 Organizations:**")
+                for org in entities['ORG']:
+                    st.markdown(f"- {org}")
+            
+            if entities.get('CARDINAL'):
+                st.markdown("**🔢 Numbers:**")
+                for num in entities['CARDINAL'][:5]:  # Show first 5
+                    st.markdown(f"- {num}")
+            
+            if entities.get('EMAIL'):
+                st.markdown("**📧 Emails:**")
+                for email in entities['EMAIL']:
+                    st.markdown(f"- {email}")
+    
+    metrics = result['metrics']
+    if metrics and any(metrics.values()):
+        file_details['metrics'] = metrics
+        
+        st.markdown("##### 📊 Detected Metrics")
+        met_cols = st.columns(4)
+        
+        with met_cols[0]:
+            if metrics['pitches']:
+                st.metric("Pitches", metrics['pitches'][0])
+        with met_cols[1]:
+            if metrics['registrations']:
+                st.metric("Registrations", metrics['registrations'][0])
+        with met_cols[2]:
+            if metrics['leads']:
+                st.metric("Leads", metrics['leads'][0])
+        with met_cols[3]:
+            if metrics['rms']:
+                st.metric("RMs", metrics['rms'][0])
+
+@st.fragment
 def show_document_upload():
-    """Enhanced document upload with OCR and NER"""
+    """
+    Enhanced document upload with OCR and NER
+    A fragment: uploads and widget changes rerun this panel only, not the whole app
+    """
+    
+    import pandas as pd
     
     st.markdown("### 📁 DOCUMENT MANAGEMENT WITH OCR/NER")
     
@@ -946,23 +1071,23 @@ def show_document_upload():
     </div>
     """, unsafe_allow_html=True)
     
-    # Check availability
+    # Check availability (None while the engines are still loading in the background)
+    engines = ENGINES.status()
+    status_labels = {True: "✅ Available", False: "❌ Not installed", None: "⏳ Loading..."}
+    
     col1, col2, col3 = st.columns(3)
     with col1:
-        status = "✅ Available" if OCR_AVAILABLE else "❌ Not installed"
-        st.metric("OCR Status", status)
+        st.metric("OCR Status", status_labels[engines['ocr']])
     with col2:
-        status = "✅ Available" if NER_AVAILABLE else "❌ Not installed"
-        st.metric("NER Status", status)
+        st.metric("NER Status", status_labels[engines['ner']])
     with col3:
-        status = "✅ Available" if CV2_AVAILABLE else "❌ Not installed"
-        st.metric("Image Processing", status)
+        st.metric("Image Processing", status_labels[engines['cv2']])
     
-    if not OCR_AVAILABLE:
+    if engines['ocr'] is False:
         st.warning("⚠️ To enable OCR: `pip install pytesseract pillow opencv-python`")
         st.info("💡 Also install Tesseract: https://github.com/tesseract-ocr/tesseract")
     
-    if not NER_AVAILABLE:
+    if engines['ner'] is False:
         st.warning("⚠️ To enable NER: `pip install spacy && python -m spacy download en_core_web_sm`")
     
     st.markdown("---")
@@ -997,119 +1122,70 @@ def show_document_upload():
         if category_key not in st.session_state.uploaded_documents[user]:
             st.session_state.uploaded_documents[user][category_key] = []
         
+        stored_docs = st.session_state.uploaded_documents[user][category_key]
+        stored_hashes = {doc.get('content_hash') for doc in stored_docs}
+        
+        def store(file_details):
+            # Once per content - the uploader hands back the same files on every rerun
+            if file_details['content_hash'] not in stored_hashes:
+                stored_docs.append(file_details)
+                stored_hashes.add(file_details['content_hash'])
+        
+        # Waits for the engines only if the background warm-up hasn't finished
+        ENGINES.load()
+        
+        # Lay out every file first; OCR results fill in below as each image finishes
+        pending = {}
         for uploaded_file in uploaded_files:
+            data = uploaded_file.getvalue()
+            content_hash = document_hash(data)
+            
             file_details = {
                 'name': uploaded_file.name,
                 'size': uploaded_file.size,
                 'type': uploaded_file.type,
                 'upload_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'category': selected_category
+                'category': selected_category,
+                'content_hash': content_hash
             }
             
+            if content_hash in pending:
+                st.markdown(f"↩️ **{uploaded_file.name}** is the same file as **{pending[content_hash][2]['name']}**")
+                continue
+            
             # Process image files with OCR
             if uploaded_file.type.startswith('image/'):
                 st.markdown(f"#### 🖼️ Processing: {uploaded_file.name}")
                 
                 # Display image
-                image = Image.open(uploaded_file)
                 col1, col2 = st.columns([1, 2])
                 
                 with col1:
-                    st.image(image, caption=uploaded_file.name, use_column_width=True)
+                    st.image(data, caption=uploaded_file.name, use_column_width=True)
                 
                 with col2:
-                    if OCR_AVAILABLE:
-                        with st.spinner("🔍 Extracting text with OCR..."):
-                            text, error = extract_text_from_image(image)
-                            
-                            if text:
-                                st.success("✅ OCR Complete")
-                                
-                                # Store OCR result
-                                file_details['ocr_text'] = text
-                                file_details['has_ocr'] = True
-                                
-                                # Show extracted text
-                                with st.expander("📄 Extracted Text", expanded=True):
-                                    st.text_area("OCR Output", text, height=200, key=f"ocr_{uploaded_file.name}")
-                                
-                                # NER Analysis
-                                if NER_AVAILABLE and text.strip():
-                                    with st.spinner("🧠 Analyzing entities..."):
-                                        entities, error = extract_entities(text)
-                                        
-                                        if entities:
-                                            file_details['entities'] = entities
-                                            file_details['has_ner'] = True
-                                            
-                                            st.markdown("##### 🎯 Extracted Entities")
-                                            
-                                            # Display entities in columns
-                                            ent_col1, ent_col2 = st.columns(2)
-                                            
-                                            with ent_col1:
-                                                if entities.get('PERSON'):
-                                                    st.markdown("**👤 People:**")
-                                                    for person in entities['PERSON']:
-                                                        st.markdown(f"- {person}")
-                                                
-                                                if entities.get('DATE'):
-                                                    st.markdown("**📅 Dates:**")
-                                                    for date in entities['DATE']:
-                                                        st.markdown(f"- {date}")
-                                                
-                                                if entities.get('PHONE'):
-                                                    st.markdown("**📞 Phone Numbers:**")
-                                                    for phone in entities['PHONE']:
-                                                        st.markdown(f"- {phone}")
-                                            
-                                            with ent_col2:
-                                                if entities.get('ORG'):
-                                                    st.markdown("**🏢 Organizations:**")
-                                                    for org in entities['ORG']:
-                                                        st.markdown(f"- {org}")
-                                                
-                                                if entities.get('CARDINAL'):
-                                                    st.markdown("**🔢 Numbers:**")
-                                                    for num in entities['CARDINAL'][:5]:  # Show first 5
-                                                        st.markdown(f"- {num}")
-                                                
-                                                if entities.get('EMAIL'):
-                                                    st.markdown("**📧 Emails:**")
-                                                    for email in entities['EMAIL']:
-                                                        st.markdown(f"- {email}")
-                                        
-                                        # Extract metrics
-                                        metrics = extract_metrics_from_text(text)
-                                        if any(metrics.values()):
-                                            file_details['metrics'] = metrics
-                                            
-                                            st.markdown("##### 📊 Detected Metrics")
-                                            met_cols = st.columns(4)
-                                            
-                                            with met_cols[0]:
-                                                if metrics['pitches']:
-                                                    st.metric("Pitches", metrics['pitches'][0])
-                                            with met_cols[1]:
-                                                if metrics['registrations']:
-                                                    st.metric("Registrations", metrics['registrations'][0])
-                                            with met_cols[2]:
-                                                if metrics['leads']:
-                                                    st.metric("Leads", metrics['leads'][0])
-                                            with met_cols[3]:
-                                                if metrics['rms']:
-                                                    st.metric("RMs", metrics['rms'][0])
-                            else:
-                                st.warning(f"⚠️ Could not extract text: {error}")
+                    if ENGINES.pytesseract is not None:
+                        placeholder = st.empty()
+                        placeholder.info("⏳ Waiting for OCR...")
+                        pending[content_hash] = (data, placeholder, file_details)
                     else:
                         st.info("💡 OCR not available. Install pytesseract to extract text.")
+                        store(file_details)
             
             else:
                 # Non-image files
                 st.markdown(f"✅ **{uploaded_file.name}** ({uploaded_file.size / 1024:.1f} KB)")
-            
-            # Store file details
-            st.session_state.uploaded_documents[user][category_key].append(file_details)
+                store(file_details)
+        
+        if pending:
+            # OCR runs across the worker processes; cached results (by content hash) come back at once
+            documents = {content_hash: data for content_hash, (data, _, _) in pending.items()}
+            with st.spinner(f"🔍 Extracting text from {len(pending)} image(s) with OCR..."):
+                for content_hash, result in get_ocr_cache().analyze_many(documents, get_ocr_pool()):
+                    _, placeholder, file_details = pending[content_hash]
+                    with placeholder.container():
+                        show_ocr_result(result, file_details)
+                    store(file_details)
         
         st.success(f"✅ Processed {len(uploaded_files)} file(s)")
         st.markdown("---")
@@ -1185,7 +1261,7 @@ def show_document_upload():
             if st.button("🗑️ Clear All Documents", use_container_width=True):
                 st.session_state.uploaded_documents[user] = {}
                 st.success("✅ All documents cleared")
-                st.rerun()
+                st.rerun(scope="fragment")
         
         else:
             st.info("📝 No documents uploaded yet")
@@ -1197,6 +1273,8 @@ def show_document_upload():
 def show_ai_insights():
     """Show AI-powered insights"""
     
+    import pandas as pd
+    
     st.markdown("# 🤖 AI-POWERED INSIGHTS")
     st.markdown("---")
     
@@ -1332,8 +1410,12 @@ def show_ai_insights():
 # TAB 6: DAILY CHECKLIST
 # ============================================
 
+@st.fragment
 def show_daily_checklist():
-    """Show daily checklist"""
+    """
+    Show daily checklist
+    A fragment: ticking a task reruns this panel only, not the whole app
+    """
     
     st.markdown("# ✅ DAILY CHECKLIST")
     
@@ -1348,7 +1430,7 @@ def show_daily_checklist():
                 saved_data = json.load(uploaded_checklist)
                 st.session_state.checklist_state = saved_data
                 st.success("✅ Checklist progress restored!")
-                st.rerun()
+                st.rerun(scope="fragment")
             except:
                 st.error("❌ Invalid checklist file")
     
@@ -1378,15 +1460,16 @@ def show_daily_checklist():
         # Get completion status
         is_completed = st.session_state.checklist_state[user][day_type].get(idx, False)
         
-        if is_completed:
-            completed_count += 1
-        
         # Task row
         col1, col2, col3, col4 = st.columns([0.5, 3, 1, 1])
         
         with col1:
-            checkbox = st.checkbox("", value=is_completed, key=task_key)
-            st.session_state.checklist_state[user][day_type][idx] = checkbox
+            # The checkbox already holds this click - use it so the row and progress update in the same rerun
+            is_completed = st.checkbox("", value=is_completed, key=task_key)
+            st.session_state.checklist_state[user][day_type][idx] = is_completed
+        
+        if is_completed:
+            completed_count += 1
         
         with col2:
             style = "text-decoration: line-through; opacity: 0.6;" if is_completed else ""
@@ -1442,13 +1525,13 @@ def show_daily_checklist():
             for idx in range(len(tasks)):
                 st.session_state.checklist_state[user][day_type][idx] = True
             st.success("✅ All tasks marked complete!")
-            st.rerun()
+            st.rerun(scope="fragment")
     
     with col2:
         if st.button("🔄 Reset Checklist", use_container_width=True):
             st.session_state.checklist_state[user][day_type] = {}
             st.success("🔄 Checklist reset!")
-            st.rerun()
+            st.rerun(scope="fragment")
     
     with col3:
         # Download checklist state
@@ -1465,41 +1548,33 @@ def show_daily_checklist():
 # MAIN APP
 # ============================================
 
+# Sidebar navigation: view label -> function rendering it
+VIEWS = {
+    "📊 My Dashboard": show_my_dashboard,
+    "🏆 Team Performance": show_team_performance,
+    "📈 Analytics": show_analytics,
+    "📁 Documents (OCR/NER)": show_document_upload,
+    "🤖 AI Insights": show_ai_insights,
+    "✅ Daily Checklist": show_daily_checklist,
+}
+
 def main():
     """Main application"""
     
     if not st.session_state.logged_in:
         show_login()
     else:
-        show_sidebar()
-        
-        # Main content tabs
-        tabs = st.tabs([
-            "📊 My Dashboard",
-            "🏆 Team Performance",
-            "📈 Analytics",
-            "📁 Documents (OCR/NER)",
-            "🤖 AI Insights",
-            "✅ Daily Checklist"
-        ])
+        # OCR/NER engines (pytesseract, OpenCV, spaCy) load once per process in the background
+        # after login, so they never compete with the login page; reruns and sessions reuse them
+        ENGINES.warm_up()
         
-        with tabs[0]:
-            show_my_dashboard()
+        # Pick up data published by a background refresh
+        sync_team_data()
         
-        with tabs[1]:
-            show_team_performance()
-        
-        with tabs[2]:
-            show_analytics()
-        
-        with tabs[3]:
-            show_document_upload()
-        
-        with tabs[4]:
-            show_ai_insights()
+        show_sidebar()
         
-        with tabs[5]:
-            show_daily_checklist()
+        # Only the selected view is built - the others cost nothing on this rerun
+        VIEWS.get(st.session_state.active_view, show_my_dashboard)()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,72 @@
+"""
+IRON LADY - Benchmark: batch OCR of a multi-file upload
+OCRs a batch of synthetic WA audit style screenshots one at a time (as the dashboard
+used to) and through OCRWorkerPool, reporting the time to the first result and to the
+whole batch. Needs pytesseract and the Tesseract binary (OpenCV optional)
+
+Usage: python benchmarks/bench_batch_ocr.py [--images N] [--workers N]
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ironlady_ocr import ENGINES, OCR_WORKERS, OCRWorkerPool
+
+RM_NAMES = ['Asha', 'Bhavana', 'Chitra', 'Divya', 'Esha', 'Farah', 'Gita']
+
+def make_screenshot(seed):
+    """A phone-sized PNG with a few lines of metrics text"""
+    from PIL import Image, ImageDraw
+    
+    rng = random.Random(seed)
+    image = Image.new('RGB', (1080, 1920), 'white')
+    draw = ImageDraw.Draw(image)
+    
+    lines = [f"{rng.choice(RM_NAMES)} - WA audit"] + [
+        f"{label}: {rng.randint(0, 40)}" for label in ('Pitches', 'Registrations', 'Leads', 'RMs')
+    ] * 6
+    for index, line in enumerate(lines):
+        draw.text((60, 60 + index * 70), line, fill='black')
+    
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+def run_batch(pool, documents):
+    """(seconds to the first result, seconds to the last)"""
+    start = time.perf_counter()
+    first = None
+    for _ in pool.ocr(documents):
+        if first is None:
+            first = time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Sequential vs process-pool OCR of one upload")
+    parser.add_argument('--images', type=int, default=12, help="screenshots in the upload")
+    parser.add_argument('--workers', type=int, default=OCR_WORKERS, help="OCR worker processes")
+    args = parser.parse_args()
+    
+    if ENGINES.load().pytesseract is None:
+        print(f"❌ OCR not available: {ENGINES.errors.get('ocr')}")
+        sys.exit(1)
+    
+    documents = {index: make_screenshot(index) for index in range(args.images)}
+    print(f"{args.images} screenshots, OpenCV preprocessing {'on' if ENGINES.cv2 else 'off'}")
+    
+    pool = OCRWorkerPool(args.workers)
+    run_batch(pool, dict(list(documents.items())[:args.workers]))  # start the workers outside the timing
+    
+    print(f"{'mode':<24} {'first result':>12} {'whole batch':>12}")
+    for name, batch_pool in [('sequential', OCRWorkerPool(1)), (f'pool ({args.workers} workers)', pool)]:
+        first, total = run_batch(batch_pool, documents)
+        print(f"{name:<24} {first:>11.2f}s {total:>11.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+IRON LADY - Benchmark: Checklists date matching
+Checks match_checklist_dates() on every spelling the Checklists sheet uses (day-first
+and month-first slash dates included) and compares its speed with the previous
+per-format str.contains search on a synthetic sheet of N rows
+Exits 1 if any cell is matched wrongly
+
+Usage: python benchmarks/bench_checklist_dates.py [rows ...]
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from send_ironlady_branded_email import match_checklist_dates
+
+DEFAULT_ROW_COUNTS = [10_000, 200_000]
+TARGET_DATE = date(2025, 11, 5)
+
+# (cell, falls on TARGET_DATE)
+CASES = [
+    ('2025-11-05', True),
+    ('2025-11-05 18:42:10', True),
+    ('2025-11-05T09:30', True),
+    ('November 05, 2025', True),
+    ('Nov 05, 2025', True),
+    ('Nov 5', True),
+    ('05/11/2025', True),  # day-first
+    ('11/05/2025', True),  # month-first
+    ('5/11/2025 09:30:00', True),
+    (' 11/05/2025 ', True),
+    ('2025-05-11', False),
+    ('06/11/2025', False),
+    ('11/06/2025', False),
+    ('November 05, 2024', False),
+    ('Nov 6', False),
+    ('', False),
+    (None, False),
+]
+
+def legacy_filter(df, date_str):
+    """Rows the old per-format str.contains search kept (reference)"""
+    parsed = pd.Timestamp(date_str)
+    date_formats = [
+        date_str,
+        parsed.strftime('%b %d'),
+        parsed.strftime('%B %d, %Y'),
+        parsed.strftime('%m/%d/%Y'),
+        parsed.strftime('%d/%m/%Y'),
+    ]
+    for date_format in date_formats:
+        filtered_df = df[df['Date'].str.contains(date_format, na=False, case=False)].copy()
+        if len(filtered_df) > 0:
+            return filtered_df
+    return pd.DataFrame()
+
+def make_sheet(rows, seed=7):
+    """Checklists Date column over 60 days, each row in one of the sheet's spellings"""
+    rng = random.Random(seed)
+    formats = ['%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%B %d, %Y', '%b %d', '%m/%d/%Y', '%d/%m/%Y']
+    days = [TARGET_DATE - timedelta(days=offset) for offset in range(60)]
+    cells = [rng.choice(days).strftime(rng.choice(formats)) for _ in range(rows)]
+    return pd.DataFrame({'Date': cells})
+
+def check_cases():
+    """Wrongly matched (cell, expected) pairs"""
+    values = pd.Series([cell for cell, _ in CASES])
+    matches = match_checklist_dates(values, TARGET_DATE)
+    return [(cell, expected) for (cell, expected), match in zip(CASES, matches) if bool(match) != expected]
+
+def best_time(func, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    failures = check_cases()
+    for cell, expected in failures:
+        print(f"❌ {cell!r} should {'' if expected else 'not '}match {TARGET_DATE.isoformat()}")
+    if failures:
+        sys.exit(1)
+    print(f"✅ {len(CASES)} date spellings matched correctly")
+    
+    row_counts = [int(arg) for arg in sys.argv[1:]] or DEFAULT_ROW_COUNTS
+    print(f"\n{'rows':>8}  {'str.contains':>12}  {'match':>9}  {'speedup':>7}")
+    for rows in row_counts:
+        df = make_sheet(rows)
+        legacy = best_time(lambda: legacy_filter(df, TARGET_DATE.isoformat()))
+        current = best_time(lambda: df[match_checklist_dates(df['Date'], TARGET_DATE)])
+        print(f"{rows:>8}  {legacy * 1000:>10.1f}ms  {current * 1000:>7.1f}ms  {legacy / current:>6.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""
+IRON LADY - Benchmark: daily report email rendering
+Compares the list-joined f-string templates in email_templates.py with the previous
+f-string / += renderer on synthetic orgs of N teams x 30 RMs
+
+Usage: python benchmarks/bench_email_html.py [teams ...]
+"""
+
+import os
+import random
+import re
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from email_templates import render_report_html
+from send_ironlady_branded_email import IRONLADY_COLORS, aggregate_team_summary
+
+DEFAULT_TEAM_COUNTS = [4, 50, 200]
+RMS_PER_TEAM = 30
+METRICS = ['wa_audit', 'call_audit', 'mocks', 'sl_calls', 'registrations']
+STYLE_PATTERN = re.compile(r'<style>.*?</style>', re.S)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+
+# Replaced per run with the synthetic org (the legacy renderer reads it as a global)
+TEAM_LEADERS = {}
+
+def make_org(team_count, rms_per_team=RMS_PER_TEAM, seed=7):
+    """Build team_data and checklist_status for a synthetic org"""
+    rng = random.Random(seed)
+    team_leaders = {}
+    team_data = {}
+    checklist_status = {}
+    
+    for team in range(team_count):
+        sheet_name = f"Leader{team}"
+        team_leaders[sheet_name] = f"Leader {team} - Team {team}"
+        
+        rms = []
+        for rm_number in range(rms_per_team):
+            rm = {'rm_name': f"RM {team}-{rm_number}"}
+            for metric in METRICS:
+                rm[f'{metric}_target'] = rng.randint(0, 20)
+                rm[f'{metric}_achieved'] = rng.randint(0, 20)
+            rms.append(rm)
+        team_data[sheet_name] = {'display_name': team_leaders[sheet_name], 'rms': rms}
+        
+        if rng.random() > 0.2:
+            total = rng.randint(5, 15)
+            completed = rng.randint(0, total)
+            checklist_status[sheet_name] = {
+                'completed': completed,
+                'total': total,
+                'percentage': round(completed / total * 100, 1),
+                'day_type': rng.choice(['Day 1-1', 'Day 1', 'Day 2'])
+            }
+    
+    return team_leaders, team_data, checklist_status
+
+def visible_text(html):
+    """Text a reader sees (stylesheet, tags and whitespace runs removed), to compare renderers"""
+    return ' '.join(TAG_PATTERN.sub(' ', STYLE_PATTERN.sub(' ', html)).split())
+
+def measure(render, repeat=5):
+    """(best time, peak traced memory, result) over repeat runs"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = render()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    
+    tracemalloc.start()
+    render()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return best, peak, result
+
+def legacy_create_email_html(team_summary, team_data, checklist_status={}, report_label=None):
+    """f-string and += renderer that create_email_html() used before email_templates (reference)"""
+    
+    if report_label is None:
+        report_label = datetime.now().strftime('%B %d, %Y')
+    
+    # Calculate overall totals
+    total_rms = sum(t['total_rms'] for t in team_summary.values())
+    total_reg_target = sum(t['registrations_target'] for t in team_summary.values())
+    total_reg_achieved = sum(t['registrations_achieved'] for t in team_summary.values())
+    avg_conversion = round((total_reg_achieved / total_reg_target * 100), 1) if total_reg_target > 0 else 0
+    
+    # Team summary table
+    team_rows = ""
+    for team_name, data in team_summary.items():
+        conv = data['conversion_rate']
+        if conv >= 15:
+            conv_color = IRONLADY_COLORS['success']
+            conv_icon = '✅'
+        elif conv >= 10:
+            conv_color = IRONLADY_COLORS['primary']
+            conv_icon = '⚠️'
+        else:
+            conv_color = '#dc3545'
+            conv_icon = '❌'
+        
+        team_rows += f"""
+        <tr>
+            <td style="padding: 12px;"><strong>{data['display_name']}</strong></td>
+            <td style="padding: 12px; text-align: center;">{data['total_rms']}</td>
+            <td style="padding: 12px; text-align: center;">{data['registrations_target']}</td>
+            <td style="padding: 12px; text-align: center;">{data['registrations_achieved']}</td>
+            <td style="padding: 12px; text-align: center;">
+                {conv_icon} <span style="color: {conv_color}; font-weight: 700;">{conv}%</span>
+            </td>
+        </tr>
+        """
+    
+    # RM-level details for each team
+    rm_details_html = ""
+    for team_name, team_info in team_data.items():
+        display_name = team_info['display_name']
+        rms = team_info['rms']
+        
+        if not rms:
+            continue
+        
+        rm_details_html += f"""
+        <h3 style="color: {IRONLADY_COLORS['secondary']}; margin-top: 30px; padding: 10px; background: {IRONLADY_COLORS['accent']};">
+            {display_name} - RM Details
+        </h3>
+        <table style="width: 100%; border-collapse: collapse; margin: 10px 0; font-size: 0.9rem;">
+            <tr style="background: {IRONLADY_COLORS['secondary']}; color: white;">
+                <th style="padding: 10px; text-align: left;">RM Name</th>
+                <th style="padding: 10px; text-align: center;">WA Audit<br/><small>T/A</small></th>
+                <th style="padding: 10px; text-align: center;">Call Audit<br/><small>T/A</small></th>
+                <th style="padding: 10px; text-align: center;">Mocks<br/><small>T/A</small></th>
+                <th style="padding: 10px; text-align: center;">SL Calls<br/><small>T/A</small></th>
+                <th style="padding: 10px; text-align: center;">Registrations<br/><small>T/A</small></th>
+            </tr>
+        """
+        
+        for rm in rms:
+            rm_details_html += f"""
+            <tr>
+                <td style="padding: 10px;">{rm['rm_name']}</td>
+                <td style="padding: 10px; text-align: center;">{rm['wa_audit_target']}/{rm['wa_audit_achieved']}</td>
+                <td style="padding: 10px; text-align: center;">{rm['call_audit_target']}/{rm['call_audit_achieved']}</td>
+                <td style="padding: 10px; text-align: center;">{rm['mocks_target']}/{rm['mocks_achieved']}</td>
+                <td style="padding: 10px; text-align: center;">{rm['sl_calls_target']}/{rm['sl_calls_achieved']}</td>
+                <td style="padding: 10px; text-align: center;">{rm['registrations_target']}/{rm['registrations_achieved']}</td>
+            </tr>
+            """
+        
+        rm_details_html += "</table>"
+    
+    # Checklist status section - IMPROVED DISPLAY
+    checklist_html = ""
+    if checklist_status and len(checklist_status) > 0:
+        checklist_html = f"""
+        <h2 class="section-title">✅ Daily Checklist Status</h2>
+        <table style="width: 100%; border-collapse: collapse; margin: 20px 0;">
+            <tr style="background: {IRONLADY_COLORS['secondary']}; color: white;">
+                <th style="padding: 12px; text-align: left;">Team Leader</th>
+                <th style="padding: 12px; text-align: center;">Day Type</th>
+                <th style="padding: 12px; text-align: center;">Completed</th>
+                <th style="padding: 12px; text-align: center;">Total Tasks</th>
+                <th style="padding: 12px; text-align: center;">Progress</th>
+                <th style="padding: 12px; text-align: center;">Status</th>
+            </tr>
+        """
+        
+        for team_name, display_name in TEAM_LEADERS.items():
+            if team_name in checklist_status:
+                status = checklist_status[team_name]
+                percentage = status['percentage']
+                
+                if percentage == 100:
+                    status_icon = '✅'
+                    status_text = 'Complete'
+                    status_color = IRONLADY_COLORS['success']
+                elif percentage >= 50:
+                    status_icon = '⚠️'
+                    status_text = 'In Progress'
+                    status_color = IRONLADY_COLORS['primary']
+                else:
+                    status_icon = '❌'
+                    status_text = 'Not Started'
+                    status_color = '#dc3545'
+                
+                checklist_html += f"""
+                <tr>
+                    <td style="padding: 12px;"><strong>{display_name}</strong></td>
+                    <td style="padding: 12px; text-align: center;">{status['day_type']}</td>
+                    <td style="padding: 12px; text-align: center; font-weight: 700;">{status['completed']}</td>
+                    <td style="padding: 12px; text-align: center;">{status['total']}</td>
+                    <td style="padding: 12px; text-align: center;">
+                        <div style="background: #e0e0e0; height: 20px; border-radius: 10px; overflow: hidden; display: inline-block; width: 100px;">
+                            <div style="background: {status_color}; height: 100%; width: {percentage}%;"></div>
+                        </div>
+                        <span style="margin-left: 10px;">{percentage}%</span>
+                    </td>
+                    <td style="padding: 12px; text-align: center;">
+                        {status_icon} <span style="color: {status_color}; font-weight: 700;">{status_text}</span>
+                    </td>
+                </tr>
+                """
+            else:
+                checklist_html += f"""
+                <tr>
+                    <td style="padding: 12px;"><strong>{display_name}</strong></td>
+                    <td style="padding: 12px; text-align: center;" colspan="5">
+                        <span style="color: #999;">No checklist data</span>
+                    </td>
+                </tr>
+                """
+        
+        checklist_html += "</table>"
+    else:
+        # Show message that checklist data is not available
+        checklist_html = f"""
+        <h2 class="section-title">✅ Daily Checklist Status</h2>
+        <div style="background: {IRONLADY_COLORS['accent']}; padding: 20px; margin: 15px 0; border-left: 5px solid {IRONLADY_COLORS['primary']}; border-radius: 5px;">
+            <p style="margin: 0; color: #666;">
+                <strong>ℹ️ Checklist data not available</strong><br/>
+                <small>Please ensure the 'Checklists' worksheet exists and contains data for today's date.</small>
+            </p>
+        </div>
+        """
+    
+    # Complete HTML
+    html = f"""
+    <html>
+    <head>
+        <style>
+            body {{ font-family: Arial, sans-serif; background: {IRONLADY_COLORS['accent']}; margin: 0; padding: 0; }}
+            .container {{ max-width: 1000px; margin: 20px auto; background: white; border-radius: 10px; box-shadow: 0 4px 12px rgba(0,0,0,0.15); }}
+            .header {{ background: linear-gradient(135deg, {IRONLADY_COLORS['primary']} 0%, {IRONLADY_COLORS['secondary']} 100%); color: white; padding: 40px; text-align: center; }}
+            .header h1 {{ margin: 0; font-size: 2.5rem; letter-spacing: 3px; font-weight: 900; }}
+            .content {{ padding: 40px 30px; }}
+            .section-title {{ color: {IRONLADY_COLORS['secondary']}; font-size: 1.5rem; font-weight: 900; margin: 30px 0 15px; padding-bottom: 10px; border-bottom: 3px solid {IRONLADY_COLORS['primary']}; }}
+            .metric {{ background: {IRONLADY_COLORS['accent']}; padding: 20px; margin: 15px 0; border-left: 5px solid {IRONLADY_COLORS['primary']}; border-radius: 5px; }}
+            table {{ width: 100%; border-collapse: collapse; margin: 20px 0; }}
+            th {{ background: {IRONLADY_COLORS['secondary']}; color: white; padding: 15px; font-weight: 700; }}
+            td {{ padding: 12px; border-bottom: 1px solid #e0e0e0; }}
+            .highlight {{ background: {IRONLADY_COLORS['primary']}; color: white; padding: 3px 8px; border-radius: 3px; font-weight: 700; }}
+            .footer {{ background: {IRONLADY_COLORS['secondary']}; color: white; text-align: center; padding: 30px; }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1>IRON LADY</h1>
+                <p>Daily Performance Report</p>
+                <p>{report_label}</p>
+            </div>
+            <div class="content">
+                <h2 class="section-title">📊 Executive Summary</h2>
+                <div class="metric">
+                    <strong>Total RMs:</strong> {total_rms}<br/>
+                    <strong>Registration Target:</strong> {total_reg_target}<br/>
+                    <strong>Registrations Achieved:</strong> {total_reg_achieved}<br/>
+                    <strong>Achievement Rate:</strong> <span class="highlight">{avg_conversion}%</span>
+                </div>
+                
+                <h2 class="section-title">🏆 Team Leader Performance</h2>
+                <table>
+                    <tr>
+                        <th>Team Leader</th>
+                        <th style="text-align: center;">RMs</th>
+                        <th style="text-align: center;">Reg Target</th>
+                        <th style="text-align: center;">Reg Achieved</th>
+                        <th style="text-align: center;">Achievement %</th>
+                    </tr>
+                    {team_rows}
+                </table>
+                
+                <h2 class="section-title">📋 RM-Level Details</h2>
+                <p style="font-size: 0.9rem; color: #666;"><em>T/A = Target / Achieved</em></p>
+                {rm_details_html}
+                
+                {checklist_html}
+                
+                <h2 class="section-title">💡 Key Insights</h2>
+                <div class="metric">
+                    {'✅ <strong>Excellent!</strong> Team meeting targets.' if avg_conversion >= 80 else '⚠️ <strong>Action needed:</strong> Below target achievement.'}
+                </div>
+            </div>
+            <div class="footer">
+                <p style="font-size: 1.3rem; font-weight: 900;">IRON LADY</p>
+                <p>© 2024 Iron Lady. All rights reserved.</p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+    
+    return html
+
+def main():
+    global TEAM_LEADERS
+    team_counts = [int(arg) for arg in sys.argv[1:]] or DEFAULT_TEAM_COUNTS
+    report_label = datetime.now().strftime('%B %d, %Y')
+    
+    print(f"{'teams':>6}  {'RMs':>6}  {'f-string/+=':>12}  {'templates':>10}  {'speedup':>8}  {'peak before':>12}  {'peak after':>11}")
+    for team_count in team_counts:
+        TEAM_LEADERS, team_data, checklist_status = make_org(team_count)
+        team_summary = aggregate_team_summary(team_data)
+        
+        legacy_time, legacy_peak, legacy_html = measure(
+            lambda: legacy_create_email_html(team_summary, team_data, checklist_status, report_label)
+        )
+        compiled_time, compiled_peak, compiled_html = measure(
+            lambda: render_report_html(team_summary, team_data, checklist_status, TEAM_LEADERS, IRONLADY_COLORS, report_label)
+        )
+        
+        if visible_text(legacy_html) != visible_text(compiled_html):
+            print(f"❌ Rendered text differs for {team_count} teams")
+            sys.exit(1)
+        
+        print(
+            f"{team_count:>6}  {team_count * RMS_PER_TEAM:>6}  {legacy_time * 1000:>10.2f}ms  {compiled_time * 1000:>8.2f}ms"
+            f"  {legacy_time / compiled_time:>7.1f}x  {legacy_peak / 1024:>10.0f}KB  {compiled_peak / 1024:>9.0f}KB"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+IRON LADY - Benchmark: end-to-end email job and dashboard load
+Runs the daily email job (send_ironlady_branded_email.main) and the dashboard's
+load_from_sheets() against the local Sheets backend (local_sheets.py), serving a
+synthetic workbook with simulated API latency and 429 errors - no credentials needed
+
+Usage: python benchmarks/bench_end_to_end.py [--days N] [--rms N] [--runs N]
+                                             [--latency S ...] [--error-rate R ...]
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+WORK_DIR = tempfile.mkdtemp(prefix='ironlady_bench_')
+WORKBOOK_PATH = os.path.join(WORK_DIR, 'workbook.json')
+
+# Configure everything for an offline run before the job and the dashboard are imported
+os.environ.update({
+    'SHEETS_BACKEND': 'local',
+    'SHEETS_LOCAL_WORKBOOK': WORKBOOK_PATH,
+    'SHEETS_CACHE_PATH': os.path.join(WORK_DIR, 'grids.json'),
+    'RM_HISTORY_DIR': os.path.join(WORK_DIR, 'rm_history'),
+    'TEAM_SNAPSHOT_PATH': os.path.join(WORK_DIR, 'team_data.arrow'),
+    'JOB_TELEMETRY_PATH': os.path.join(WORK_DIR, 'job_telemetry.jsonl'),
+    'JOB_TRACE_MEMORY': 'false',  # tracemalloc would inflate the timings being measured
+    'CEO_EMAIL': '',
+    'AUTO_MAIL': '',
+    'TEAM_LEADER_EMAILS': '',
+})
+# The real quota limiter would dominate back-to-back runs; benchmark the pipeline itself
+os.environ.setdefault('SHEETS_READ_QUOTA_PER_MINUTE', '100000')
+os.environ.setdefault('SHEETS_READ_BURST', '1000')
+
+import ironlady_sheets
+from local_sheets import LocalSpreadsheet, save_workbook
+
+TEAMS = {
+    'Ghazala': 'Ghazala - Rising Stars',
+    'Megha': 'Megha - Winners',
+    'Afreen': 'Afreen - High Flyers',
+    'Soumya': 'Soumya - Goal Getters',
+    'Sweksha': 'Sweksha - Team',
+}
+RM_NAMES = ['Asha', 'Bhavana', 'Chitra', 'Divya', 'Esha', 'Farah', 'Gita', 'Hema', 'Isha', 'Kavya']
+
+def make_workbook(days, rms_per_team, seed=7):
+    """Team sheets with one block per day (ending today) plus a Checklists sheet"""
+    rng = random.Random(seed)
+    today = date.today()
+    report_days = [today - timedelta(days=offset) for offset in range(days - 1, -1, -1)]
+    rm_names = [f"{RM_NAMES[i % len(RM_NAMES)]} {i // len(RM_NAMES) + 1}" for i in range(rms_per_team)]
+    
+    grids = {}
+    for sheet_name, display_name in TEAMS.items():
+        grid = []
+        for day in report_days:
+            grid.append([day.strftime('%b %d'), display_name] + [''] * 14)
+            grid.append(['', 'RM Name'] + ['Target', 'Achieved'] * 7)
+            for rm_name in rm_names:
+                grid.append(['', rm_name] + [str(rng.randint(0, 12)) for _ in range(14)])
+        grids[sheet_name] = grid
+    
+    checklist = [['Username', 'Date', 'Day_Type', 'Task', 'Completed']]
+    for day in report_days:
+        for sheet_name in TEAMS:
+            for task in range(8):
+                checklist.append([
+                    sheet_name.lower(), day.isoformat(), 'Day 1', f"Task {task + 1}",
+                    rng.choice(['TRUE', 'FALSE'])
+                ])
+    grids['Checklists'] = checklist
+    
+    return grids
+
+@contextlib.contextmanager
+def count_requests():
+    """Count the requests made to every LocalSpreadsheet while the block runs"""
+    counts = {'requests': 0, 'errors': 0}
+    original = LocalSpreadsheet._simulate_request
+    
+    def counting_request(spreadsheet):
+        counts['requests'] += 1
+        try:
+            original(spreadsheet)
+        except Exception:
+            counts['errors'] += 1
+            raise
+    
+    LocalSpreadsheet._simulate_request = counting_request
+    try:
+        yield counts
+    finally:
+        LocalSpreadsheet._simulate_request = original
+
+def run_email_job():
+    """One full email job run (previews instead of sending); returns the exit code"""
+    import send_ironlady_branded_email
+    
+    try:
+        send_ironlady_branded_email.main([])
+    except SystemExit as e:
+        return e.code or 0
+    return 0
+
+def load_dashboard(cold):
+    """One dashboard load_from_sheets(); cold drops every process-wide cache first"""
+    import app
+    
+    if cold:
+        app.get_sheets_session.clear()
+        app.get_parsed_sheet_cache.clear()
+        app.get_drive_version.clear()
+        app.fetch_team_data.clear()
+    success, message = app.load_from_sheets(force_refresh=cold)
+    return 0 if success else 1
+
+def measure(func, runs):
+    """(median wall time, requests per run, 429s per run, exit code of the last run)"""
+    times = []
+    with count_requests() as counts:
+        for _ in range(runs):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                code = func()
+            times.append(time.perf_counter() - start)
+    
+    times.sort()
+    return times[len(times) // 2], counts['requests'] / runs, counts['errors'] / runs, code
+
+def clear_disk_cache():
+    cache_path = os.environ['SHEETS_CACHE_PATH']
+    if os.path.exists(cache_path):
+        os.remove(cache_path)
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end benchmark on the local Sheets backend")
+    parser.add_argument('--days', type=int, default=60, help="daily blocks per team sheet")
+    parser.add_argument('--rms', type=int, default=30, help="RMs per team")
+    parser.add_argument('--runs', type=int, default=3, help="runs per scenario (median reported)")
+    parser.add_argument('--latency', type=float, nargs='+', default=[0.0, 0.2], help="seconds per request")
+    parser.add_argument('--error-rate', type=float, nargs='+', default=[0.0, 0.1], help="share of requests failing with 429")
+    args = parser.parse_args()
+    
+    save_workbook(WORKBOOK_PATH, make_workbook(args.days, args.rms))
+    os.chdir(WORK_DIR)  # email previews land here
+    
+    print(f"Workbook: {len(TEAMS)} team sheets x {args.days} days x {args.rms} RMs ({WORKBOOK_PATH})")
+    print(f"{'scenario':<24}  {'latency':>7}  {'429 rate':>8}  {'median':>9}  {'requests':>8}  {'429s':>5}  {'exit':>4}")
+    
+    scenarios = [('email job', lambda: (clear_disk_cache(), run_email_job())[1])]
+    
+    # Import the dashboard up front (quietly) to find out whether its dependencies are installed
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            importlib.import_module('app')
+        scenarios += [
+            ('dashboard (cold)', lambda: load_dashboard(cold=True)),
+            ('dashboard (cached)', lambda: load_dashboard(cold=False)),
+        ]
+    except ImportError as e:
+        print(f"⚠️  Dashboard scenarios skipped - {e}")
+    
+    for latency in args.latency:
+        for error_rate in args.error_rate:
+            ironlady_sheets.SHEETS_LOCAL_LATENCY = latency
+            ironlady_sheets.SHEETS_LOCAL_ERROR_RATE = error_rate
+            
+            for name, func in scenarios:
+                median, requests, errors, code = measure(func, args.runs)
+                print(f"{name:<24}  {latency:>6.2f}s  {error_rate:>8.0%}  {median * 1000:>7.0f}ms  {requests:>8.1f}  {errors:>5.1f}  {code:>4}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+IRON LADY - Benchmark: Target/Achieved grid parsing
+Times summarize_team_grid() (the dashboard's team sheet summary) on synthetic team
+leader sheets of N rows, and the ParsedSheetCache hit that replaces it on reloads
+while a sheet is unchanged
+
+Usage: python benchmarks/bench_parse_team_sheet.py [rows ...]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ironlady_sheets import ParsedSheetCache, summarize_team_grid
+
+DEFAULT_ROW_COUNTS = [1000, 10000, 50000]
+RM_NAMES = ['Asha', 'Bhavana', 'Chitra', 'Divya', 'Esha', 'Farah', 'Gita']
+
+def make_team_grid(rows, seed=7):
+    """Build a sheet of daily blocks: date row, header row, then one row per RM"""
+    rng = random.Random(seed)
+    grid = [['Nov 1', 'Ghazala - Rising Stars'] + [''] * 14]
+    
+    while len(grid) < rows:
+        grid.append(['', 'RM Name'] + ['Target', 'Achieved'] * 7)
+        for rm_name in RM_NAMES:
+            row = ['', rm_name]
+            for col in range(2, 16):
+                value = str(rng.randint(0, 12)) if rng.random() > 0.1 else ''
+                if col == 11 and value and rng.random() < 0.2:
+                    value += '-Shwetha'
+                row.append(value)
+            grid.append(row)
+        grid.append([f"Nov {rng.randint(1, 30)}", 'Ghazala - Rising Stars'] + [''] * 14)
+    
+    return grid[:rows]
+
+def best_of(func, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    row_counts = [int(arg) for arg in sys.argv[1:]] or DEFAULT_ROW_COUNTS
+    
+    print(f"{'rows':>8}  {'parse':>10}  {'per 1k rows':>11}  {'unchanged':>10}  {'RMs':>6}")
+    for rows in row_counts:
+        grid = make_team_grid(rows)
+        parse_time, summary = best_of(lambda: summarize_team_grid(grid))
+        
+        if not summary or not summary['total_rms']:
+            print(f"❌ No RMs found in {rows} rows: {summary}")
+            sys.exit(1)
+        
+        cache = ParsedSheetCache()
+        cache.parse('Ghazala', grid, summarize_team_grid)
+        cached_time, cached = best_of(lambda: cache.parse('Ghazala', grid, summarize_team_grid))
+        
+        if cached != summary:
+            print(f"❌ Cached summary differs for {rows} rows")
+            sys.exit(1)
+        
+        print(
+            f"{rows:>8}  {parse_time * 1000:>8.1f}ms  {parse_time * 1e6 / rows:>9.1f}ms"
+            f"  {cached_time * 1000:>8.1f}ms  {summary['total_rms']:>6}"
+        )
+
+if __name__ == "__main__":
+    main()
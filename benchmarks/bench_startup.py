@@ -0,0 +1,178 @@
+"""
+IRON LADY - Benchmark: dashboard startup
+Measures what a cold dashboard process pays before the login page is on screen:
+- import profile of app.py (python -X importtime), with the slowest top-level imports
+  and any heavy library (pandas, plotly, spaCy, ...) imported before login
+- time to first render: a fresh process running app.py once with Streamlit's AppTest,
+  from interpreter start until the login page is built
+
+Every measurement runs in a new interpreter, so nothing is warm in sys.modules
+Results can be written as JSON (--json) and land in the Actions job summary when
+GITHUB_STEP_SUMMARY is set; --budget fails the run when first render gets slower
+
+Usage: python benchmarks/bench_startup.py [--runs N] [--top N] [--json PATH] [--budget S]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, 'app.py')
+
+# Libraries the login page must not wait for (beyond what Streamlit itself imports)
+HEAVY_MODULES = ['pandas', 'numpy', 'plotly.express', 'plotly.graph_objects', 'cv2', 'pytesseract', 'spacy', 'gspread']
+
+# Runs app.py once in bare mode (no server) - enough for -X importtime
+# The marker separates interpreter startup from the imports app.py triggers
+IMPORT_MARKER = '-- app.py --'
+IMPORT_SCRIPT = """
+import runpy, sys
+sys.path.insert(0, {root!r})
+sys.stderr.write({marker!r} + '\\n')
+runpy.run_path({app!r}, run_name='__main__')
+"""
+
+# Runs app.py once through AppTest and prints the timings as JSON
+RENDER_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+before = set(sys.modules)
+at = AppTest.from_file({app!r}, default_timeout=120)
+at.run()
+done = time.perf_counter()
+print(json.dumps({{
+    'streamlit_import_s': imported - start,
+    'script_run_s': done - imported,
+    'first_render_s': done - start,
+    'login_page': any(widget.label == 'Username' for widget in at.text_input),
+    'exception': [str(e.value) for e in at.exception],
+    'app_modules': sorted(set(sys.modules) - before),
+}}))
+"""
+
+def offline_env():
+    """Environment for a run that never reaches Google (the login page needs no data)"""
+    work_dir = tempfile.mkdtemp(prefix='ironlady_startup_')
+    env = dict(os.environ)
+    env.update({
+        'SHEETS_BACKEND': 'local',
+        'TEAM_SNAPSHOT_PATH': os.path.join(work_dir, 'team_data.arrow'),
+        'RM_HISTORY_DIR': os.path.join(work_dir, 'rm_history'),
+    })
+    return env
+
+def parse_importtime(stderr):
+    """[(module, self_us, cumulative_us, depth)] from -X importtime output"""
+    imports = []
+    lines = stderr.splitlines()
+    if IMPORT_MARKER in lines:
+        lines = lines[lines.index(IMPORT_MARKER) + 1:]
+    
+    for line in lines:
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        # One space after the bar, then two more per nesting level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return imports
+
+def import_profile(env):
+    """Import timings of one bare-mode run of app.py"""
+    script = IMPORT_SCRIPT.format(root=ROOT, app=APP_PATH, marker=IMPORT_MARKER)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', script],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    return parse_importtime(result.stderr)
+
+def first_render(env):
+    """Timings of one fresh-process AppTest run of app.py"""
+    script = RENDER_SCRIPT.format(root=ROOT, app=APP_PATH)
+    result = subprocess.run([sys.executable, '-c', script], cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"first render failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+def summary_markdown(results):
+    """Results as Markdown (GitHub Actions job summary)"""
+    lines = [
+        "### Dashboard startup",
+        "",
+        "| Metric | Value |",
+        "|---|---:|",
+        f"| Time to first render (median of {results['runs']}) | {results['first_render_s'] * 1000:.0f} ms |",
+        f"| Streamlit import | {results['streamlit_import_s'] * 1000:.0f} ms |",
+        f"| app.py script run | {results['script_run_s'] * 1000:.0f} ms |",
+        f"| Total import time | {results['import_total_s'] * 1000:.0f} ms |",
+        f"| Heavy modules before login | {', '.join(results['heavy_modules']) or 'none'} |",
+        "",
+        "| Slowest top-level imports | Cumulative (ms) |",
+        "|---|---:|",
+    ]
+    lines += [f"| {name} | {ms:.0f} |" for name, ms in results['slowest_imports']]
+    return '\n'.join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard cold start: import profile and time to first render")
+    parser.add_argument('--runs', type=int, default=5, help="fresh processes per measurement (median reported)")
+    parser.add_argument('--top', type=int, default=10, help="slowest top-level imports to list")
+    parser.add_argument('--json', help="write the results to this file")
+    parser.add_argument('--budget', type=float, help="exit 1 if median time to first render exceeds this (seconds)")
+    args = parser.parse_args()
+    
+    env = offline_env()
+    
+    imports = import_profile(env)
+    top_level = sorted((item for item in imports if item[3] == 0), key=lambda item: -item[2])
+    
+    renders = [first_render(env) for _ in range(args.runs)]
+    last = renders[-1]
+    if not last['login_page'] or last['exception']:
+        print(f"❌ Login page did not render: {last['exception']}")
+        sys.exit(1)
+    
+    results = {
+        'runs': args.runs,
+        'first_render_s': median(run['first_render_s'] for run in renders),
+        'streamlit_import_s': median(run['streamlit_import_s'] for run in renders),
+        'script_run_s': median(run['script_run_s'] for run in renders),
+        'import_total_s': sum(item[1] for item in imports) / 1e6,
+        'heavy_modules': [module for module in HEAVY_MODULES if module in last['app_modules']],
+        'slowest_imports': [(name, cumulative / 1000) for name, _, cumulative, _ in top_level[:args.top]],
+    }
+    
+    print(f"Time to first render: {results['first_render_s'] * 1000:.0f}ms median of {args.runs} "
+          f"(streamlit import {results['streamlit_import_s'] * 1000:.0f}ms, app.py run {results['script_run_s'] * 1000:.0f}ms)")
+    print(f"Total import time (bare mode): {results['import_total_s'] * 1000:.0f}ms")
+    print(f"Heavy modules imported before login: {', '.join(results['heavy_modules']) or 'none'}")
+    print(f"\n{'slowest top-level imports':<40} {'cumulative':>10}")
+    for name, ms in results['slowest_imports']:
+        print(f"{name:<40} {ms:>8.0f}ms")
+    
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    
+    step_summary = os.getenv('GITHUB_STEP_SUMMARY', '').strip()
+    if step_summary:
+        with open(step_summary, 'a', encoding='utf-8') as f:
+            f.write(summary_markdown(results) + '\n')
+    
+    if args.budget and results['first_render_s'] > args.budget:
+        print(f"❌ Time to first render {results['first_render_s']:.2f}s is over the {args.budget:.2f}s budget")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+"""
+IRON LADY - Daily Report Email Templates
+HTML templates for the daily email report (send_ironlady_branded_email.py)
+Each template is a function returning an f-string; sections are collected in lists
+and joined once, keeping render time and memory linear in the number of RMs
+RM rows use the .rm-table stylesheet classes instead of per-cell inline styles
+"""
+
+# ============================================
+# TEMPLATES
+# ============================================
+
+def team_row(data, conv_icon, conv_color):
+    return f"""
+        <tr>
+            <td style="padding: 12px;"><strong>{data['display_name']}</strong></td>
+            <td style="padding: 12px; text-align: center;">{data['total_rms']}</td>
+            <td style="padding: 12px; text-align: center;">{data['registrations_target']}</td>
+            <td style="padding: 12px; text-align: center;">{data['registrations_achieved']}</td>
+            <td style="padding: 12px; text-align: center;">
+                {conv_icon} <span style="color: {conv_color}; font-weight: 700;">{data['conversion_rate']}%</span>
+            </td>
+        </tr>
+        """
+
+def rm_table_start(display_name, colors):
+    return f"""
+        <h3 style="color: {colors['secondary']}; margin-top: 30px; padding: 10px; background: {colors['accent']};">
+            {display_name} - RM Details
+        </h3>
+        <table class="rm-table">
+            <tr style="background: {colors['secondary']}; color: white;">
+                <th style="padding: 10px; text-align: left;">RM Name</th>
+                <th style="padding: 10px; text-align: center;">WA Audit<br/><small>T/A</small></th>
+                <th style="padding: 10px; text-align: center;">Call Audit<br/><small>T/A</small></th>
+                <th style="padding: 10px; text-align: center;">Mocks<br/><small>T/A</small></th>
+                <th style="padding: 10px; text-align: center;">SL Calls<br/><small>T/A</small></th>
+                <th style="padding: 10px; text-align: center;">Registrations<br/><small>T/A</small></th>
+            </tr>
+        """
+
+def rm_row(rm):
+    return f"""
+            <tr>
+                <td class="rm-name">{rm['rm_name']}</td>
+                <td>{rm['wa_audit_target']}/{rm['wa_audit_achieved']}</td>
+                <td>{rm['call_audit_target']}/{rm['call_audit_achieved']}</td>
+                <td>{rm['mocks_target']}/{rm['mocks_achieved']}</td>
+                <td>{rm['sl_calls_target']}/{rm['sl_calls_achieved']}</td>
+                <td>{rm['registrations_target']}/{rm['registrations_achieved']}</td>
+            </tr>
+            """
+
+def trend_table_start(history_note):
+    return f"""
+        <h2 class="section-title">📈 Week-over-Week Trends</h2>
+        <p style="font-size: 0.9rem; color: #666;"><em>Registrations T/A over the last 7 and 28 days; change in achieved vs the previous 7 / 28 days</em></p>
+        {history_note}
+        <table>
+            <tr>
+                <th>Team Leader</th>
+                <th style="text-align: center;">7 Days<br/><small>T/A</small></th>
+                <th style="text-align: center;">vs Prev 7</th>
+                <th style="text-align: center;">28 Days<br/><small>T/A</small></th>
+                <th style="text-align: center;">vs Prev 28</th>
+            </tr>
+        """
+
+def trend_team_row(display_name, fields):
+    return f"""
+            <tr>
+                <td style="padding: 12px;"><strong>{display_name}</strong></td>
+                <td style="padding: 12px; text-align: center;">{fields['reg_7d']}</td>
+                <td style="padding: 12px; text-align: center;">{fields['reg_7d_delta']}</td>
+                <td style="padding: 12px; text-align: center;">{fields['reg_28d']}</td>
+                <td style="padding: 12px; text-align: center;">{fields['reg_28d_delta']}</td>
+            </tr>
+            """
+
+def trend_rm_table_start(display_name, colors):
+    return f"""
+        <h3 style="color: {colors['secondary']}; margin-top: 30px; padding: 10px; background: {colors['accent']};">
+            {display_name} - RM Trends
+        </h3>
+        <table class="rm-table">
+            <tr style="background: {colors['secondary']}; color: white;">
+                <th style="padding: 10px; text-align: left;">RM Name</th>
+                <th style="padding: 10px; text-align: center;">7 Days<br/><small>T/A</small></th>
+                <th style="padding: 10px; text-align: center;">vs Prev 7</th>
+                <th style="padding: 10px; text-align: center;">28 Days<br/><small>T/A</small></th>
+                <th style="padding: 10px; text-align: center;">vs Prev 28</th>
+            </tr>
+        """
+
+def trend_rm_row(rm_name, fields):
+    return f"""
+            <tr>
+                <td class="rm-name">{rm_name}</td>
+                <td>{fields['reg_7d']}</td>
+                <td>{fields['reg_7d_delta']}</td>
+                <td>{fields['reg_28d']}</td>
+                <td>{fields['reg_28d_delta']}</td>
+            </tr>
+            """
+
+def trend_history_note(days_recorded):
+    return f"""
+        <p style="font-size: 0.9rem; color: #666;">ℹ️ Based on {days_recorded} days of recorded history - changes show once two full periods are recorded.</p>
+        """
+
+def checklist_table_start(colors):
+    return f"""
+        <h2 class="section-title">✅ Daily Checklist Status</h2>
+        <table style="width: 100%; border-collapse: collapse; margin: 20px 0;">
+            <tr style="background: {colors['secondary']}; color: white;">
+                <th style="padding: 12px; text-align: left;">Team Leader</th>
+                <th style="padding: 12px; text-align: center;">Day Type</th>
+                <th style="padding: 12px; text-align: center;">Completed</th>
+                <th style="padding: 12px; text-align: center;">Total Tasks</th>
+                <th style="padding: 12px; text-align: center;">Progress</th>
+                <th style="padding: 12px; text-align: center;">Status</th>
+            </tr>
+        """
+
+def checklist_row(display_name, status, status_icon, status_text, status_color):
+    return f"""
+                <tr>
+                    <td style="padding: 12px;"><strong>{display_name}</strong></td>
+                    <td style="padding: 12px; text-align: center;">{status['day_type']}</td>
+                    <td style="padding: 12px; text-align: center; font-weight: 700;">{status['completed']}</td>
+                    <td style="padding: 12px; text-align: center;">{status['total']}</td>
+                    <td style="padding: 12px; text-align: center;">
+                        <div style="background: #e0e0e0; height: 20px; border-radius: 10px; overflow: hidden; display: inline-block; width: 100px;">
+                            <div style="background: {status_color}; height: 100%; width: {status['percentage']}%;"></div>
+                        </div>
+                        <span style="margin-left: 10px;">{status['percentage']}%</span>
+                    </td>
+                    <td style="padding: 12px; text-align: center;">
+                        {status_icon} <span style="color: {status_color}; font-weight: 700;">{status_text}</span>
+                    </td>
+                </tr>
+                """
+
+def checklist_missing_row(display_name):
+    return f"""
+                <tr>
+                    <td style="padding: 12px;"><strong>{display_name}</strong></td>
+                    <td style="padding: 12px; text-align: center;" colspan="5">
+                        <span style="color: #999;">No checklist data</span>
+                    </td>
+                </tr>
+                """
+
+def checklist_unavailable(colors):
+    return f"""
+        <h2 class="section-title">✅ Daily Checklist Status</h2>
+        <div style="background: {colors['accent']}; padding: 20px; margin: 15px 0; border-left: 5px solid {colors['primary']}; border-radius: 5px;">
+            <p style="margin: 0; color: #666;">
+                <strong>ℹ️ Checklist data not available</strong><br/>
+                <small>Please ensure the 'Checklists' worksheet exists and contains data for today's date.</small>
+            </p>
+        </div>
+        """
+
+def notice_box(message):
+    return f"""
+                <div style="background: #fff3cd; padding: 20px; margin: 0 0 20px; border-left: 5px solid #dc3545; border-radius: 5px;">
+                    {message}
+                </div>
+        """
+
+def page(colors, fields):
+    return f"""
+    <html>
+    <head>
+        <style>
+            body {{ font-family: Arial, sans-serif; background: {colors['accent']}; margin: 0; padding: 0; }}
+            .container {{ max-width: 1000px; margin: 20px auto; background: white; border-radius: 10px; box-shadow: 0 4px 12px rgba(0,0,0,0.15); }}
+            .header {{ background: linear-gradient(135deg, {colors['primary']} 0%, {colors['secondary']} 100%); color: white; padding: 40px; text-align: center; }}
+            .header h1 {{ margin: 0; font-size: 2.5rem; letter-spacing: 3px; font-weight: 900; }}
+            .content {{ padding: 40px 30px; }}
+            .section-title {{ color: {colors['secondary']}; font-size: 1.5rem; font-weight: 900; margin: 30px 0 15px; padding-bottom: 10px; border-bottom: 3px solid {colors['primary']}; }}
+            .metric {{ background: {colors['accent']}; padding: 20px; margin: 15px 0; border-left: 5px solid {colors['primary']}; border-radius: 5px; }}
+            table {{ width: 100%; border-collapse: collapse; margin: 20px 0; }}
+            th {{ background: {colors['secondary']}; color: white; padding: 15px; font-weight: 700; }}
+            td {{ padding: 12px; border-bottom: 1px solid #e0e0e0; }}
+            .rm-table {{ margin: 10px 0; font-size: 0.9rem; }}
+            .rm-table td {{ padding: 10px; text-align: center; }}
+            .rm-table td.rm-name {{ text-align: left; }}
+            .highlight {{ background: {colors['primary']}; color: white; padding: 3px 8px; border-radius: 3px; font-weight: 700; }}
+            .footer {{ background: {colors['secondary']}; color: white; text-align: center; padding: 30px; }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1>IRON LADY</h1>
+                <p>Daily Performance Report</p>
+                <p>{fields['report_label']}</p>
+            </div>
+            <div class="content">
+                {fields['notice_html']}
+                <h2 class="section-title">📊 Executive Summary</h2>
+                <div class="metric">
+                    <strong>Total RMs:</strong> {fields['total_rms']}<br/>
+                    <strong>Registration Target:</strong> {fields['total_reg_target']}<br/>
+                    <strong>Registrations Achieved:</strong> {fields['total_reg_achieved']}<br/>
+                    <strong>Achievement Rate:</strong> <span class="highlight">{fields['avg_conversion']}%</span>
+                </div>
+                
+                <h2 class="section-title">🏆 Team Leader Performance</h2>
+                <table>
+                    <tr>
+                        <th>Team Leader</th>
+                        <th style="text-align: center;">RMs</th>
+                        <th style="text-align: center;">Reg Target</th>
+                        <th style="text-align: center;">Reg Achieved</th>
+                        <th style="text-align: center;">Achievement %</th>
+                    </tr>
+                    {fields['team_rows']}
+                </table>
+                
+                {fields['trends_html']}
+                
+                <h2 class="section-title">📋 RM-Level Details</h2>
+                <p style="font-size: 0.9rem; color: #666;"><em>T/A = Target / Achieved</em></p>
+                {fields['rm_details_html']}
+                
+                {fields['checklist_html']}
+                
+                <h2 class="section-title">💡 Key Insights</h2>
+                <div class="metric">
+                    {fields['insight']}
+                </div>
+            </div>
+            <div class="footer">
+                <p style="font-size: 1.3rem; font-weight: 900;">IRON LADY</p>
+                <p>© 2024 Iron Lady. All rights reserved.</p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+
+# ============================================
+# SECTIONS
+# ============================================
+
+def conversion_style(conversion_rate, colors):
+    """(icon, colour) for a team's registration conversion rate"""
+    if conversion_rate >= 15:
+        return '✅', colors['success']
+    elif conversion_rate >= 10:
+        return '⚠️', colors['primary']
+    return '❌', '#dc3545'
+
+def trend_delta(delta, colors):
+    """Coloured change vs the previous period ('-' while there is not enough history)"""
+    if delta is None:
+        return '<span style="color: #999;">-</span>'
+    if delta > 0:
+        return f'<span style="color: {colors["success"]}; font-weight: 700;">▲ +{delta}</span>'
+    if delta < 0:
+        return f'<span style="color: #dc3545; font-weight: 700;">▼ {delta}</span>'
+    return '<span style="color: #999;">0</span>'
+
+def trend_fields(values, colors):
+    """Template fields for one team's or RM's registration trends"""
+    fields = {}
+    for window in (7, 28):
+        fields[f'reg_{window}d'] = f"{values[f'registrations_target_{window}d']}/{values[f'registrations_achieved_{window}d']}"
+        fields[f'reg_{window}d_delta'] = trend_delta(values[f'registrations_achieved_{window}d_delta'], colors)
+    return fields
+
+def render_trends_html(trends, team_leaders, colors):
+    """Week-over-week section from rm_rollups.trend_summary() ('' when there is no history)"""
+    team_names = [team_name for team_name in team_leaders if team_name in trends]
+    if not team_names:
+        return ''
+    
+    days_recorded = trends[team_names[0]]['days_recorded']
+    history_note = trend_history_note(days_recorded) if days_recorded < 56 else ''
+    
+    parts = [trend_table_start(history_note)]
+    for team_name in team_names:
+        parts.append(trend_team_row(team_leaders[team_name], trend_fields(trends[team_name]['totals'], colors)))
+    parts.append("</table>")
+    
+    for team_name in team_names:
+        parts.append(trend_rm_table_start(team_leaders[team_name], colors))
+        for rm in trends[team_name]['rms']:
+            parts.append(trend_rm_row(rm['rm_name'], trend_fields(rm, colors)))
+        parts.append("</table>")
+    
+    return ''.join(parts)
+
+def checklist_style(percentage, colors):
+    """(icon, text, colour) for a checklist completion percentage"""
+    if percentage == 100:
+        return '✅', 'Complete', colors['success']
+    elif percentage >= 50:
+        return '⚠️', 'In Progress', colors['primary']
+    return '❌', 'Not Started', '#dc3545'
+
+# ============================================
+# RENDERING
+# ============================================
+
+def render_report_html(team_summary, team_data, checklist_status, team_leaders, colors, report_label, trends=None, notice=None):
+    """
+    Render the complete daily report email
+    trends: rm_rollups.trend_summary() (optional); notice: HTML shown above the summary (e.g. stale data)
+    """
+    # Calculate overall totals
+    total_rms = sum(t['total_rms'] for t in team_summary.values())
+    total_reg_target = sum(t['registrations_target'] for t in team_summary.values())
+    total_reg_achieved = sum(t['registrations_achieved'] for t in team_summary.values())
+    avg_conversion = round((total_reg_achieved / total_reg_target * 100), 1) if total_reg_target > 0 else 0
+    
+    # Team summary table
+    team_rows = []
+    for data in team_summary.values():
+        conv_icon, conv_color = conversion_style(data['conversion_rate'], colors)
+        team_rows.append(team_row(data, conv_icon, conv_color))
+    
+    # RM-level details for each team
+    rm_details = []
+    for team_info in team_data.values():
+        if not team_info['rms']:
+            continue
+        
+        rm_details.append(rm_table_start(team_info['display_name'], colors))
+        rm_details.extend(map(rm_row, team_info['rms']))
+        rm_details.append("</table>")
+    
+    # Checklist status section
+    if checklist_status:
+        checklist_parts = [checklist_table_start(colors)]
+        
+        for team_name, display_name in team_leaders.items():
+            if team_name in checklist_status:
+                status = checklist_status[team_name]
+                status_icon, status_text, status_color = checklist_style(status['percentage'], colors)
+                checklist_parts.append(checklist_row(display_name, status, status_icon, status_text, status_color))
+            else:
+                checklist_parts.append(checklist_missing_row(display_name))
+        
+        checklist_parts.append("</table>")
+        checklist_html = ''.join(checklist_parts)
+    else:
+        checklist_html = checklist_unavailable(colors)
+    
+    if avg_conversion >= 80:
+        insight = '✅ <strong>Excellent!</strong> Team meeting targets.'
+    else:
+        insight = '⚠️ <strong>Action needed:</strong> Below target achievement.'
+    
+    return page(colors, {
+        'report_label': report_label,
+        'notice_html': notice_box(notice) if notice else '',
+        'total_rms': total_rms,
+        'total_reg_target': total_reg_target,
+        'total_reg_achieved': total_reg_achieved,
+        'avg_conversion': avg_conversion,
+        'team_rows': ''.join(team_rows),
+        'trends_html': render_trends_html(trends, team_leaders, colors) if trends else '',
+        'rm_details_html': ''.join(rm_details),
+        'checklist_html': checklist_html,
+        'insight': insight
+    })
@@ -0,0 +1,418 @@
+"""
+IRON LADY - OCR/NER Engines
+Text extraction (OpenCV preprocessing + Tesseract) and entity recognition (spaCy)
+for uploaded screenshots
+
+The engines are process-wide: ENGINES loads pytesseract, OpenCV and the spaCy model
+once, in a background thread started by warm_up(), and every dashboard session and
+rerun shares them. status() reports availability without waiting for the load;
+the extract_* functions wait for it (only the first upload after a cold start can)
+
+Results are cached by a hash of the file's bytes (OCRResultCache), so showing or
+uploading the same screenshot again costs no OCR or NER
+
+A multi-file upload is OCRed by OCRWorkerPool on a few worker processes; results come back
+(and are shown) as each file finishes rather than after the whole batch
+"""
+
+import hashlib
+import io
+import multiprocessing
+import os
+import re
+import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+NER_MODEL = os.getenv('NER_MODEL', 'en_core_web_sm').strip()
+
+# Bump whenever preprocessing or extraction changes, so cached results are recomputed
+OCR_PIPELINE_VERSION = 1
+
+# Analyzed documents kept in memory per process (least recently used are dropped first)
+OCR_CACHE_MAX_ENTRIES = int(os.getenv('OCR_CACHE_MAX_ENTRIES', '256'))
+
+# Worker processes for batch OCR (1 = OCR in the calling process). 0 = one per CPU this
+# process may run on (its affinity - containers often allow fewer than os.cpu_count()),
+# at most OCR_MAX_DEFAULT_WORKERS, since every worker loads its own OCR engines
+OCR_MAX_DEFAULT_WORKERS = 4
+if hasattr(os, 'sched_getaffinity'):
+    AVAILABLE_CPUS = len(os.sched_getaffinity(0))
+else:
+    AVAILABLE_CPUS = os.cpu_count() or 1
+OCR_WORKERS = int(os.getenv('OCR_WORKERS', '0')) or min(AVAILABLE_CPUS, OCR_MAX_DEFAULT_WORKERS)
+
+# ============================================
+# ENGINES
+# ============================================
+
+class Engines:
+    """
+    Lazily loaded OCR/NER engines shared by the whole process
+    Each of pytesseract, cv2 and nlp is the loaded module/model, or None if unavailable
+    """
+    
+    def __init__(self, ner_model=NER_MODEL):
+        self.ner_model = ner_model
+        self.pytesseract = None
+        self.cv2 = None
+        self.nlp = None
+        self.errors = {}
+        self._loaded = threading.Event()
+        self._lock = threading.Lock()
+        # Separate from _lock, which load() holds until every engine is loaded
+        self._start_lock = threading.Lock()
+        self._thread = None
+    
+    def warm_up(self):
+        """Start loading in a background thread (once per process); returns immediately"""
+        if self._thread is not None or self._loaded.is_set():
+            return
+        
+        with self._start_lock:
+            if self._thread is None and not self._loaded.is_set():
+                self._thread = threading.Thread(target=self.load, name='ocr-warm-up', daemon=True)
+                self._thread.start()
+    
+    def load(self):
+        """Load every engine (blocks; a no-op once loaded)"""
+        if self._loaded.is_set():
+            return self
+        
+        with self._lock:
+            if self._loaded.is_set():
+                return self
+            
+            try:
+                import pytesseract
+                # The Python wrapper is useless without the Tesseract binary
+                if not shutil.which(pytesseract.pytesseract.tesseract_cmd):
+                    raise FileNotFoundError("tesseract binary not found")
+                self.pytesseract = pytesseract
+            except Exception as e:
+                self.errors['ocr'] = str(e)
+            
+            try:
+                import cv2
+                self.cv2 = cv2
+            except Exception as e:
+                self.errors['cv2'] = str(e)
+            
+            try:
+                if not self.ner_model:
+                    raise RuntimeError("NER disabled")
+                import spacy
+                self.nlp = spacy.load(self.ner_model)
+            except Exception as e:
+                self.errors['ner'] = str(e)
+            
+            self._loaded.set()
+        return self
+    
+    @property
+    def loaded(self):
+        return self._loaded.is_set()
+    
+    def status(self):
+        """{'ocr', 'ner', 'cv2': True/False, or None while still loading} - never blocks"""
+        if not self.loaded:
+            return dict.fromkeys(('ocr', 'ner', 'cv2'))
+        return {
+            'ocr': self.pytesseract is not None,
+            'ner': self.nlp is not None,
+            'cv2': self.cv2 is not None,
+        }
+
+ENGINES = Engines()
+
+# ============================================
+# OCR FUNCTIONS
+# ============================================
+
+def preprocess_image(image):
+    """Preprocess image for better OCR results"""
+    cv2 = ENGINES.load().cv2
+    if cv2 is None:
+        return image
+    
+    try:
+        import numpy as np
+        from PIL import Image
+        
+        # Convert PIL to OpenCV format
+        img_array = np.array(image)
+        
+        # Convert to grayscale
+        gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
+        
+        # Apply thresholding
+        thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
+        
+        # Noise removal
+        denoised = cv2.fastNlMeansDenoising(thresh)
+        
+        return Image.fromarray(denoised)
+    except Exception as e:
+        return image
+
+def extract_text_from_image(image):
+    """Extract text from image using OCR"""
+    pytesseract = ENGINES.load().pytesseract
+    if pytesseract is None:
+        return None, "OCR not available. Install pytesseract."
+    
+    try:
+        # Preprocess image
+        processed_image = preprocess_image(image)
+        
+        # Extract text
+        text = pytesseract.image_to_string(processed_image)
+        
+        return text, None
+    except Exception as e:
+        return None, f"OCR Error: {str(e)}"
+
+# ============================================
+# NER FUNCTIONS
+# ============================================
+
+def extract_entities(text):
+    """Extract named entities from text"""
+    nlp = ENGINES.load().nlp
+    if nlp is None:
+        return None, "NER not available"
+    
+    try:
+        doc = nlp(text)
+        
+        entities = {
+            'PERSON': [],
+            'ORG': [],
+            'DATE': [],
+            'MONEY': [],
+            'CARDINAL': [],
+            'PERCENT': [],
+            'PHONE': [],
+            'EMAIL': []
+        }
+        
+        # Extract spaCy entities
+        for ent in doc.ents:
+            if ent.label_ in entities:
+                entities[ent.label_].append(ent.text)
+        
+        # Extract phone numbers (simple regex)
+        phones = re.findall(r'\b\d{10}\b|\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', text)
+        entities['PHONE'] = phones
+        
+        # Extract emails (simple regex)
+        emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+        entities['EMAIL'] = emails
+        
+        # Remove duplicates
+        for key in entities:
+            entities[key] = list(set(entities[key]))
+        
+        return entities, None
+    except Exception as e:
+        return None, f"NER Error: {str(e)}"
+
+def extract_metrics_from_text(text):
+    """Extract sales metrics from text"""
+    metrics = {
+        'pitches': [],
+        'registrations': [],
+        'leads': [],
+        'rms': []
+    }
+    
+    # Look for numbers near keywords
+    patterns = {
+        'pitches': r'(?:pitch|pitches|calls?)\s*[:=]?\s*(\d+)',
+        'registrations': r'(?:registration|registrations|reg|regs)\s*[:=]?\s*(\d+)',
+        'leads': r'(?:lead|leads)\s*[:=]?\s*(\d+)',
+        'rms': r'(?:rm|rms|team\s*member)\s*[:=]?\s*(\d+)'
+    }
+    
+    for key, pattern in patterns.items():
+        matches = re.findall(pattern, text, re.IGNORECASE)
+        metrics[key] = [int(m) for m in matches]
+    
+    return metrics
+
+# ============================================
+# DOCUMENT ANALYSIS
+# ============================================
+
+def document_hash(data):
+    """Content hash of an uploaded file's bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+def ocr_document(data):
+    """(text, error) for an image file's bytes - the part of the analysis run in OCR workers"""
+    from PIL import Image
+    
+    try:
+        image = Image.open(io.BytesIO(data))
+        image.load()
+    except Exception as e:
+        return None, f"OCR Error: {str(e)}"
+    
+    return extract_text_from_image(image)
+
+def analyze_text(text, error=None):
+    """
+    Analysis result for OCR output: {'text', 'error', 'entities', 'metrics'}
+    text is None when OCR failed, entities None when NER is unavailable
+    """
+    result = {'text': text, 'error': error, 'entities': None, 'metrics': None}
+    
+    if text and text.strip():
+        result['entities'], _ = extract_entities(text)
+        result['metrics'] = extract_metrics_from_text(text)
+    
+    return result
+
+def analyze_image(data):
+    """OCR, NER and metric extraction for one image file"""
+    return analyze_text(*ocr_document(data))
+
+class OCRResultCache:
+    """
+    analyze_image() results by content hash, shared by every session of the process
+    Keyed on the hash plus OCR_PIPELINE_VERSION and the NER model, so a pipeline change
+    never serves stale results; failed OCR runs are not cached
+    """
+    
+    def __init__(self, max_entries=OCR_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def key(self, digest):
+        return (digest, OCR_PIPELINE_VERSION, ENGINES.ner_model)
+    
+    def get(self, digest):
+        """Cached result for a content hash, or None"""
+        key = self.key(digest)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+    
+    def put(self, digest, result):
+        if result['text'] is None:
+            return
+        
+        with self._lock:
+            self._entries[self.key(digest)] = result
+            self._entries.move_to_end(self.key(digest))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def analyze(self, data, digest=None):
+        """analyze_image(data), reusing the result for identical bytes"""
+        digest = digest or document_hash(data)
+        result = self.get(digest)
+        if result is None:
+            result = analyze_image(data)
+            self.put(digest, result)
+        return result
+    
+    def analyze_many(self, documents, pool):
+        """
+        Yield (digest, result) for {digest: bytes}: cached results first, then the rest
+        as soon as the pool finishes OCRing each one (NER runs here, on the shared model)
+        """
+        missing = {}
+        for digest, data in documents.items():
+            result = self.get(digest)
+            if result is None:
+                missing[digest] = data
+            else:
+                yield digest, result
+        
+        for digest, (text, error) in pool.ocr(missing):
+            result = analyze_text(text, error)
+            self.put(digest, result)
+            yield digest, result
+
+# ============================================
+# BATCH OCR
+# ============================================
+
+def _init_ocr_worker():
+    # Workers only OCR: no spaCy model, and a single thread each for OpenCV and Tesseract
+    # so that one worker per core doesn't oversubscribe the CPU
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+    ENGINES.ner_model = None
+    if ENGINES.load().cv2 is not None:
+        ENGINES.cv2.setNumThreads(1)
+
+class OCRWorkerPool:
+    """
+    Process pool that OCRs a batch of images concurrently (preprocessing and Tesseract
+    are CPU-bound, so threads would not help); started on first use and kept for the process
+    Workers are spawned rather than forked - the dashboard process runs many threads
+    """
+    
+    def __init__(self, workers=OCR_WORKERS):
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+    
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_ocr_worker
+                )
+            return self._executor
+    
+    def reset(self, executor=None):
+        """Drop a broken pool (e.g. a worker was killed); the next batch starts a new one"""
+        with self._lock:
+            if self._executor is not None and executor in (None, self._executor):
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+    
+    def ocr(self, documents):
+        """Yield (key, (text, error)) for {key: image bytes}, in the order the documents finish"""
+        if self.workers <= 1 or len(documents) <= 1:
+            for key, data in documents.items():
+                yield key, ocr_document(data)
+            return
+        
+        executor = self._get_executor()
+        futures = {executor.submit(ocr_document, data): key for key, data in documents.items()}
+        
+        try:
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result()
+                except BrokenProcessPool as e:
+                    self.reset(executor)
+                    yield futures[future], (None, f"OCR Error: {str(e)}")
+                except Exception as e:
+                    yield futures[future], (None, f"OCR Error: {str(e)}")
+        finally:
+            # The caller stopped early (e.g. a Streamlit rerun) - don't OCR what nobody will read
+            for future in futures:
+                future.cancel()
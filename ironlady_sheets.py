@@ -0,0 +1,837 @@
+"""
+IRON LADY - Shared Google Sheets Access
+Used by both the Streamlit dashboard (app.py) and the daily email job
+(send_ironlady_branded_email.py)
+Fetches every needed worksheet with values_batch_get, concurrently and within quota
+Skips the download entirely when Drive reports the spreadsheet unchanged
+Indexes the daily date blocks of team leader worksheets and can read just one block
+Summarizes whole Target/Achieved grids for the dashboard
+Paces requests with a shared quota limiter; large fetches can opt in to a small thread pool
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+import gspread
+import requests
+from google.oauth2.service_account import Credentials
+from google.auth.transport.requests import AuthorizedSession
+from job_telemetry import TELEMETRY, grid_size
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+CHECKLIST_SHEET = 'Checklists'
+
+SHEETS_SCOPES = [
+    'https://www.googleapis.com/auth/spreadsheets.readonly',
+    'https://www.googleapis.com/auth/drive.readonly'
+]
+
+DRIVE_FILES_URL = 'https://www.googleapis.com/drive/v3/files/'
+
+# Widest column any parser reads (column P = index 15)
+BLOCK_LAST_COLUMN = 'P'
+
+# 'google' talks to the Sheets API; 'local' serves a workbook file (offline runs, benchmarks)
+SHEETS_BACKEND = os.getenv('SHEETS_BACKEND', 'google').strip().lower()
+SHEETS_LOCAL_WORKBOOK = os.getenv('SHEETS_LOCAL_WORKBOOK', 'workbook.json').strip()
+SHEETS_LOCAL_LATENCY = float(os.getenv('SHEETS_LOCAL_LATENCY', '0'))  # seconds per request
+SHEETS_LOCAL_ERROR_RATE = float(os.getenv('SHEETS_LOCAL_ERROR_RATE', '0'))  # share of requests failing with 429
+
+# Sheets API read quota (requests per minute per user), shared by every fetch in the process
+SHEETS_READ_QUOTA_PER_MINUTE = int(os.getenv('SHEETS_READ_QUOTA_PER_MINUTE', '60'))
+SHEETS_READ_BURST = int(os.getenv('SHEETS_READ_BURST', '10'))
+
+# Concurrent fetching: worksheets per values_batch_get request (0 = every range in one
+# request, which uses the least read quota; set e.g. 1 to split very large sheets across
+# concurrent requests), and requests in flight
+SHEETS_RANGES_PER_REQUEST = int(os.getenv('SHEETS_RANGES_PER_REQUEST', '0'))
+SHEETS_FETCH_WORKERS = int(os.getenv('SHEETS_FETCH_WORKERS', '4'))
+
+# Retries for quota (429) and server (5xx) errors
+SHEETS_MAX_RETRIES = 5
+SHEETS_BACKOFF_BASE = 1.0   # seconds
+SHEETS_BACKOFF_MAX = 32.0   # seconds
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Circuit breaker: after this many failed requests in a row, stop calling the API
+# for SHEETS_CIRCUIT_RESET seconds, then let one trial request through
+SHEETS_CIRCUIT_FAILURES = int(os.getenv('SHEETS_CIRCUIT_FAILURES', '5'))
+SHEETS_CIRCUIT_RESET = float(os.getenv('SHEETS_CIRCUIT_RESET', '60'))  # seconds
+
+# ============================================
+# QUOTA-AWARE REQUESTS
+# ============================================
+
+class RateLimiter:
+    """
+    Token bucket shared by every thread making Sheets requests
+    Holds up to `burst` tokens and refills at `per_minute` tokens per minute;
+    acquire() blocks until a token is available
+    """
+    
+    def __init__(self, per_minute, burst=1):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                wait = (1 - self.tokens) / self.rate
+            
+            time.sleep(wait)
+
+SHEETS_READ_LIMITER = RateLimiter(SHEETS_READ_QUOTA_PER_MINUTE, SHEETS_READ_BURST)
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the API while the circuit breaker is open"""
+
+class CircuitBreaker:
+    """
+    Stops requests to a failing API, shared by every thread
+    closed: requests go through; `failure_threshold` failures in a row open it
+    open: requests fail fast with CircuitOpenError for `reset_timeout` seconds
+    half-open: one trial request goes through - success closes, failure re-opens
+    """
+    
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_started = None
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return 'open'
+        return 'half-open'
+    
+    def before_call(self):
+        """Raise CircuitOpenError unless a request may be made now"""
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return
+            # One trial at a time (a trial that never reported back is given up on)
+            now = time.monotonic()
+            if state == 'half-open' and (self.trial_started is None or now - self.trial_started > self.reset_timeout):
+                self.trial_started = now
+                return
+            # Read under the lock - a concurrent record_success() clears opened_at
+            retry_in = max(0.0, self.reset_timeout - (now - self.opened_at))
+            failures = self.failures
+        
+        raise CircuitOpenError(f"Google Sheets circuit open after {failures} failures (retry in {retry_in:.0f}s)")
+    
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_started = None
+    
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.trial_started is not None or self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    print(f"⚠️  Google Sheets circuit opened after {self.failures} failed requests")
+                self.opened_at = time.monotonic()
+            self.trial_started = None
+
+SHEETS_CIRCUIT = CircuitBreaker(SHEETS_CIRCUIT_FAILURES, SHEETS_CIRCUIT_RESET)
+
+def response_status(error):
+    """HTTP status of a gspread APIError or requests HTTPError (None if there is none)"""
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None)
+
+def is_retryable(error):
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    return response_status(error) in RETRYABLE_STATUS_CODES
+
+def call_with_backoff(func, *args, limiter=SHEETS_READ_LIMITER, max_retries=SHEETS_MAX_RETRIES,
+                      breaker=SHEETS_CIRCUIT, **kwargs):
+    """
+    Call a Sheets/Drive request through the quota limiter and the circuit breaker
+    On 429/5xx (or a dropped connection) retries with full-jitter exponential backoff;
+    any other error, or running out of retries, is raised to the caller.
+    While the breaker is open, raises CircuitOpenError without calling the API.
+    """
+    attempt = 0
+    while True:
+        if breaker is not None:
+            breaker.before_call()
+        if limiter is not None:
+            limiter.acquire()
+        
+        TELEMETRY.count_api_call()
+        try:
+            result = func(*args, **kwargs)
+        except (gspread.exceptions.APIError, requests.RequestException) as e:
+            if not is_retryable(e):
+                if breaker is not None:
+                    breaker.record_success()  # the API answered; the request itself was bad
+                raise
+            
+            if breaker is not None:
+                breaker.record_failure()
+            # No point waiting to retry once the breaker has opened
+            if attempt >= max_retries or (breaker is not None and breaker.state == 'open'):
+                raise
+            
+            delay = random.uniform(0, min(SHEETS_BACKOFF_MAX, SHEETS_BACKOFF_BASE * 2 ** attempt))
+            print(f"⚠️  Sheets request failed ({response_status(e) or type(e).__name__}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+            attempt += 1
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return result
+
+# ============================================
+# SHEETS SESSION
+# ============================================
+
+def open_sheets_session(credentials_info, sheet_id, cache_path=None):
+    """
+    Session for the configured backend (SHEETS_BACKEND)
+    The local backend needs no credentials - see local_sheets.py
+    """
+    if SHEETS_BACKEND == 'local':
+        from local_sheets import LocalSheetsSession
+        
+        return LocalSheetsSession(
+            SHEETS_LOCAL_WORKBOOK,
+            sheet_id or 'local',
+            cache_path,
+            latency=SHEETS_LOCAL_LATENCY,
+            error_rate=SHEETS_LOCAL_ERROR_RATE
+        )
+    
+    return SheetsSession(credentials_info, sheet_id, cache_path)
+
+class SheetsSession:
+    """
+    One authorized client and spreadsheet handle shared by every stage of a run
+    Authorizes once, opens the spreadsheet once and caches the worksheet list
+    
+    Downloaded grids are remembered together with the Drive file version, so
+    fetch_grids() only re-downloads after the spreadsheet has been edited.
+    Pass cache_path to keep that cache on disk between runs.
+    """
+    
+    def __init__(self, credentials_info, sheet_id, cache_path=None):
+        self.sheet_id = sheet_id
+        self.credentials = Credentials.from_service_account_info(credentials_info, scopes=SHEETS_SCOPES)
+        self.cache_path = cache_path
+        self.last_fetch_reused = []
+        self._client = None
+        self._drive = None
+        self._spreadsheet = None
+        self._worksheets = None
+        self._grid_cache = load_grid_cache(cache_path, sheet_id)
+    
+    @property
+    def client(self):
+        """Authorized gspread client (created on first use)"""
+        if self._client is None:
+            self._client = gspread.authorize(self.credentials)
+        return self._client
+    
+    @property
+    def spreadsheet(self):
+        """Spreadsheet handle (opened on first use)"""
+        if self._spreadsheet is None:
+            self._spreadsheet = call_with_backoff(self.client.open_by_key, self.sheet_id)
+        return self._spreadsheet
+    
+    @property
+    def title(self):
+        return self.spreadsheet.title
+    
+    def worksheets(self):
+        """Worksheet list, fetched once per session"""
+        if self._worksheets is None:
+            self._worksheets = call_with_backoff(self.spreadsheet.worksheets)
+        return self._worksheets
+    
+    def worksheet_titles(self):
+        return [ws.title for ws in self.worksheets()]
+    
+    def batch_get(self, titles):
+        """Fetch several worksheet grids concurrently (see batch_get_ranges)"""
+        return batch_get_grids(self.spreadsheet, titles)
+    
+    def drive_version(self):
+        """
+        Current Drive version of the spreadsheet file (one small metadata request)
+        Drive tracks edits per file, not per worksheet. Returns None if unavailable.
+        """
+        try:
+            if self._drive is None:
+                self._drive = AuthorizedSession(self.credentials)
+            
+            metadata = call_with_backoff(self._get_drive_metadata)
+            return metadata.get('version') or metadata.get('modifiedTime')
+        except Exception:
+            return None
+    
+    def _get_drive_metadata(self):
+        response = self._drive.get(
+            DRIVE_FILES_URL + self.sheet_id,
+            params={'fields': 'version,modifiedTime', 'supportsAllDrives': 'true'}
+        )
+        response.raise_for_status()
+        return response.json()
+    
+    def fetch_grids(self, titles, version=None):
+        """
+        Fetch worksheet grids, reusing cached grids when the file is unchanged
+        Only worksheets missing from the cache are downloaded (see batch_get_ranges)
+        """
+        titles = list(titles)
+        if version is None:
+            version = self.drive_version()
+        
+        if version is None or self._grid_cache['version'] != version:
+            cached_grids = {}
+        else:
+            cached_grids = self._grid_cache['grids']
+        
+        missing = [title for title in titles if title not in cached_grids]
+        fetched = self.batch_get(missing) if missing else {}
+        self.last_fetch_reused = [title for title in titles if title in cached_grids]
+        
+        if version is not None:
+            grids = dict(cached_grids)
+            grids.update(fetched)
+            ranges = self._grid_cache['ranges'] if self._grid_cache['version'] == version else {}
+            self._grid_cache = {'version': version, 'grids': grids, 'ranges': ranges}
+            if fetched:
+                save_grid_cache(self.cache_path, self.sheet_id, self._grid_cache)
+        
+        return {title: fetched[title] if title in fetched else cached_grids[title] for title in titles}
+    
+    def fetch_ranges(self, ranges, version):
+        """
+        Fetch A1 ranges (see batch_get_ranges), reusing ranges cached under the same
+        Drive version; newly fetched ranges are added to the cache and saved
+        Returns (grids in order, number of ranges downloaded)
+        """
+        ranges = list(ranges)
+        if version is None:
+            return batch_get_ranges(self.spreadsheet, ranges), len(ranges)
+        
+        if self._grid_cache['version'] != version:
+            self._grid_cache = {'version': version, 'grids': {}, 'ranges': {}}
+        cached_ranges = self._grid_cache['ranges']
+        
+        missing = [a1_range for a1_range in dict.fromkeys(ranges) if a1_range not in cached_ranges]
+        if missing:
+            cached_ranges.update(zip(missing, batch_get_ranges(self.spreadsheet, missing)))
+            save_grid_cache(self.cache_path, self.sheet_id, self._grid_cache)
+        
+        return [cached_ranges[a1_range] for a1_range in ranges], len(missing)
+    
+    def fetch_date_blocks(self, titles, target_date, extra_titles=(), version=None):
+        """
+        Read only the target date's block from each worksheet (plus whole extra worksheets)
+        Uses two small rounds of batch requests: a column-A probe of every sheet (together with the
+        extra worksheets) to locate the block, then just the block's rows. Payload stays
+        flat as history grows. Served from the grid cache when Drive reports no change.
+        Returns ({title: block grid starting at the date row}, {extra title: grid});
+        a worksheet without the date gets an empty grid
+        """
+        return self.fetch_date_range(titles, target_date, target_date, extra_titles, version)
+    
+    def fetch_date_range(self, titles, start_date, end_date, extra_titles=(), version=None):
+        """
+        Like fetch_date_blocks(), but reads every block from start_date to end_date
+        (inclusive) in the same two rounds of requests - one contiguous row range per
+        worksheet, so a week of dates costs the same number of requests as one day
+        Probes and blocks are cached under the Drive version (see fetch_ranges), so an
+        unchanged spreadsheet is not downloaded again
+        Returns ({title: grid from the first block's date row to the last block's end},
+        {extra title: grid}); a worksheet without any of the dates gets an empty grid
+        """
+        titles = list(titles)
+        extra_titles = list(extra_titles)
+        start_date = to_date(start_date)
+        end_date = to_date(end_date)
+        
+        if version is None:
+            version = self.drive_version()
+        if version is not None and self._grid_cache['version'] == version:
+            cached_grids = self._grid_cache['grids']
+        else:
+            cached_grids = {}
+        
+        if all(title in cached_grids for title in titles + extra_titles):
+            self.last_fetch_reused = titles + extra_titles
+            blocks = {}
+            for title in titles:
+                grid = cached_grids[title]
+                span = block_span(DateBlockIndex(grid, end_date), start_date, end_date)
+                blocks[title] = grid[span[0]:span[1]] if span else []
+            return blocks, {title: cached_grids[title] for title in extra_titles}
+        
+        # 1. Narrow probe: column A of every team sheet, plus the extra worksheets
+        probe_ranges = [quote_sheet_name(title) + '!A:A' for title in titles]
+        probe_ranges += [quote_sheet_name(title) for title in extra_titles]
+        probed, probes_fetched = self.fetch_ranges(probe_ranges, version)
+        first_columns = dict(zip(titles, probed[:len(titles)]))
+        extra_grids = dict(zip(extra_titles, probed[len(titles):]))
+        
+        # 2. Only the rows of the target blocks
+        block_ranges = {}
+        for title in titles:
+            first_column = first_columns.get(title, [])
+            span = block_span(DateBlockIndex(first_column, end_date), start_date, end_date)
+            if span is None:
+                continue
+            
+            first_row = span[0] + 1
+            if span[1] < len(first_column):
+                # Next date row is known, so the range is bounded
+                block_ranges[title] = f"{quote_sheet_name(title)}!A{first_row}:{BLOCK_LAST_COLUMN}{span[1]}"
+            else:
+                # Last block in the sheet - read to the end
+                block_ranges[title] = f"{quote_sheet_name(title)}!A{first_row}:{BLOCK_LAST_COLUMN}"
+        
+        fetched, blocks_fetched = self.fetch_ranges(block_ranges.values(), version)
+        block_grids = dict(zip(block_ranges, fetched))
+        self.last_fetch_reused = titles + extra_titles if not probes_fetched + blocks_fetched else []
+        
+        return {title: block_grids.get(title, []) for title in titles}, extra_grids
+    
+    def refresh_metadata(self):
+        """Forget cached spreadsheet metadata so the next call re-reads it"""
+        self._spreadsheet = None
+        self._worksheets = None
+
+# ============================================
+# BATCHED FETCHING
+# ============================================
+
+def quote_sheet_name(title):
+    """Quote a worksheet title for use as an A1 range ('Ghazala'!A1:P20)"""
+    return "'{}'".format(title.replace("'", "''"))
+
+def pad_grid(values):
+    """Pad ragged rows so the grid matches worksheet.get_all_values()"""
+    if not values:
+        return []
+    
+    width = max(len(row) for row in values)
+    return [list(row) + [''] * (width - len(row)) for row in values]
+
+def batch_get_ranges(spreadsheet, ranges, ranges_per_request=None, max_workers=None):
+    """
+    Fetch several A1 ranges with values_batch_get, returned in order
+    Ranges are split into requests of ranges_per_request each (0 = all in one request);
+    the requests run concurrently on up to max_workers threads, paced by the shared
+    quota limiter, so wall time tracks the slowest request rather than their sum
+    """
+    ranges = list(ranges)
+    if not ranges:
+        return []
+    
+    if ranges_per_request is None:
+        ranges_per_request = SHEETS_RANGES_PER_REQUEST
+    if max_workers is None:
+        max_workers = SHEETS_FETCH_WORKERS
+    
+    chunk_size = ranges_per_request if ranges_per_request > 0 else len(ranges)
+    chunks = [ranges[i:i + chunk_size] for i in range(0, len(ranges), chunk_size)]
+    
+    def fetch_chunk(chunk):
+        with TELEMETRY.span('fetch', ', '.join(chunk), thread_scoped=True) as span:
+            response = call_with_backoff(spreadsheet.values_batch_get, chunk)
+            grids = [pad_grid(value_range.get('values', [])) for value_range in response.get('valueRanges', [])]
+            if TELEMETRY.enabled:
+                # Per range too: the ranges share one request, so their sizes tell them apart
+                span.fields['ranges'] = {}
+                for a1_range, grid in zip(chunk, grids):
+                    rows, size = grid_size(grid)
+                    span.add(rows, size)
+                    span.fields['ranges'][a1_range] = {'rows': rows, 'bytes': size}
+            return grids
+    
+    if len(chunks) == 1 or max_workers <= 1:
+        results = [fetch_chunk(chunk) for chunk in chunks]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+            results = list(pool.map(fetch_chunk, chunks))
+    
+    return [grid for chunk_grids in results for grid in chunk_grids]
+
+def batch_get_grids(spreadsheet, titles):
+    """
+    Fetch several worksheets with one values_batch_get request
+    Returns {title: grid} where grid is a list of rows like get_all_values()
+    """
+    titles = list(titles)
+    grids = batch_get_ranges(spreadsheet, [quote_sheet_name(title) for title in titles])
+    
+    return dict(zip(titles, grids))
+
+def grid_fingerprint(grid):
+    """Content hash of a worksheet grid"""
+    return hashlib.sha1(json.dumps(grid, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+def find_checklist_title(titles):
+    """Find the checklist worksheet title, preferring an exact 'Checklists' match"""
+    if CHECKLIST_SHEET in titles:
+        return CHECKLIST_SHEET
+    
+    for title in titles:
+        if 'checklist' in title.lower():
+            return title
+    
+    return None
+
+# ============================================
+# CHANGE DETECTION
+# ============================================
+
+def load_grid_cache(cache_path, sheet_id):
+    """Load the on-disk grid cache for this spreadsheet (empty cache if none)"""
+    empty = {'version': None, 'grids': {}, 'ranges': {}}
+    if not cache_path or not os.path.exists(cache_path):
+        return empty
+    
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return empty
+    
+    if cached.get('sheet_id') != sheet_id:
+        return empty
+    
+    return {'version': cached.get('version'), 'grids': cached.get('grids', {}), 'ranges': cached.get('ranges', {})}
+
+def save_grid_cache(cache_path, sheet_id, grid_cache):
+    """Write the grid cache atomically so an interrupted run never leaves a torn file"""
+    if not cache_path:
+        return
+    
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'sheet_id': sheet_id, **grid_cache}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"⚠️  Could not write sheets cache: {e}")
+
+class ParsedSheetCache:
+    """Reuse parse results for worksheets whose content has not changed"""
+    
+    def __init__(self):
+        self._entries = {}
+    
+    def parse(self, title, grid, parser):
+        """Return parser(grid), reusing the previous result if the grid is identical"""
+        fingerprint = grid_fingerprint(grid)
+        cached = self._entries.get(title)
+        if cached and cached[0] == fingerprint:
+            return cached[1]
+        
+        result = parser(grid)
+        self._entries[title] = (fingerprint, result)
+        return result
+
+# ============================================
+# DATE BLOCK INDEX
+# ============================================
+
+# One daily block in a team leader worksheet:
+#   date_row   - row with the date in column A (and team name in column B)
+#   header_row - "RM Name | Target | Achieved | ..." row right after it
+#   data_start / data_end - RM rows, up to (not including) the next date row
+DateBlock = namedtuple('DateBlock', ['date', 'date_row', 'header_row', 'data_start', 'data_end'])
+
+MONTH_NUMBERS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'sept': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+    'january': 1, 'february': 2, 'march': 3, 'april': 4, 'june': 6, 'july': 7,
+    'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12
+}
+
+ISO_DATE_PATTERN = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+MONTH_DAY_PATTERN = re.compile(r'\b([A-Za-z]{3,9})\.?\s+(\d{1,2})(?:st|nd|rd|th)?\b(?:,?\s+(\d{4}))?')
+
+def parse_sheet_date(cell, reference_date=None):
+    """
+    Parse a date cell such as 'Nov 13', 'November 13, 2025' or '2025-11-13'
+    Dates without a year get the latest year that does not put them more than
+    a week after reference_date (default today). Returns a date or None.
+    """
+    text = str(cell).strip()
+    if not text:
+        return None
+    
+    try:
+        match = ISO_DATE_PATTERN.search(text)
+        if match:
+            return date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+        
+        match = MONTH_DAY_PATTERN.search(text)
+        if not match:
+            return None
+        
+        month = MONTH_NUMBERS.get(match.group(1).lower())
+        if not month:
+            return None
+        day = int(match.group(2))
+        
+        if match.group(3):
+            return date(int(match.group(3)), month, day)
+        
+        reference_date = reference_date or date.today()
+        latest_allowed = reference_date + timedelta(days=7)
+        year = latest_allowed.year
+        if (month, day) > (latest_allowed.month, latest_allowed.day):
+            year -= 1
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+def to_date(value):
+    """Accept a date, datetime or 'YYYY-MM-DD' string"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+class DateBlockIndex:
+    """
+    Index of the daily blocks in a team leader worksheet, built in one pass
+    get() finds a date's block in O(1); between() returns every block in a date range
+    """
+    
+    def __init__(self, grid, reference_date=None):
+        date_rows = []
+        for idx, row in enumerate(grid):
+            if row:
+                block_date = parse_sheet_date(row[0], reference_date)
+                if block_date:
+                    date_rows.append((idx, block_date))
+        
+        self.blocks = {}
+        for position, (idx, block_date) in enumerate(date_rows):
+            data_end = date_rows[position + 1][0] if position + 1 < len(date_rows) else len(grid)
+            
+            # First occurrence wins, like the original top-down scan
+            if block_date not in self.blocks:
+                self.blocks[block_date] = DateBlock(block_date, idx, idx + 1, idx + 2, data_end)
+        
+        self.dates = sorted(self.blocks)
+    
+    def __len__(self):
+        return len(self.blocks)
+    
+    def get(self, target_date):
+        """Block for an exact date, or None"""
+        return self.blocks.get(to_date(target_date))
+    
+    def between(self, start_date, end_date):
+        """All blocks from start_date to end_date (inclusive), oldest first"""
+        lo = bisect.bisect_left(self.dates, to_date(start_date))
+        hi = bisect.bisect_right(self.dates, to_date(end_date))
+        return [self.blocks[block_date] for block_date in self.dates[lo:hi]]
+
+def block_span(date_index, start_date, end_date):
+    """(first row, end row) covering every block from start_date to end_date, or None"""
+    blocks = date_index.between(start_date, end_date)
+    if not blocks:
+        return None
+    
+    return min(block.date_row for block in blocks), max(block.data_end for block in blocks)
+
+# ============================================
+# RM BLOCK PARSING
+# ============================================
+
+RM_METRIC_COLUMNS = [
+    # (metric, target column, achieved column)
+    ('wa_audit', 2, 3),
+    ('call_audit', 4, 5),
+    ('mocks', 6, 7),
+    ('sl_calls', 8, 9),
+    ('registrations', 10, 11),
+]
+
+def safe_int(val):
+    try:
+        return int(float(str(val).strip())) if val and str(val).strip() else 0
+    except:
+        return 0
+
+def parse_rm_block(all_values, block):
+    """Parse the RM rows of one date block into a list of per-RM metric dicts"""
+    # Read until we hit another date or empty rows
+    rm_data = []
+    seen_rms = set()  # Track RMs we've already added to prevent duplicates
+    
+    for idx in range(block.data_start, block.data_end):
+        row = all_values[idx]
+        
+        # Stop if we hit an empty row
+        if not row or len(row) < 2:
+            break
+        
+        rm_name = str(row[1]).strip() if len(row) > 1 else ''
+        
+        # Stop conditions:
+        # 1. Empty RM name
+        # 2. RM name contains date indicators
+        # 3. RM name is same as team name (indicates section header)
+        # 4. RM name is "RM Name" (indicates header row)
+        # 5. We've already seen this RM (duplicate)
+        if (not rm_name or 
+            rm_name == '' or 
+            'Nov' in rm_name or 
+            'Jan' in rm_name or
+            'Dec' in rm_name or
+            rm_name == 'RM Name' or
+            'Rising Stars' in rm_name or
+            'High Flyers' in rm_name or
+            'Goal Getters' in rm_name or
+            rm_name in seen_rms):
+            break
+        
+        seen_rms.add(rm_name)
+        
+        # Parse the metrics (columns: RM Name, Target, Achieved, Target, Achieved, ...)
+        rm = {'rm_name': rm_name}
+        for metric, target_col, achieved_col in RM_METRIC_COLUMNS:
+            rm[f'{metric}_target'] = safe_int(row[target_col]) if len(row) > target_col else 0
+            rm[f'{metric}_achieved'] = safe_int(row[achieved_col]) if len(row) > achieved_col else 0
+        
+        rm_data.append(rm)
+    
+    return rm_data
+
+# ============================================
+# TEAM GRID SUMMARY (DASHBOARD)
+# ============================================
+
+def find_team_name(all_data):
+    """Find the team leader name from the first rows of the sheet"""
+    for row in all_data[:10]:
+        if row[1] and ('-' in row[1] or 'Rising' in row[1] or 'Winners' in row[1] or 'Flyers' in row[1] or 'Getters' in row[1]):
+            return row[1]
+    return None
+
+def summarize_team_grid(all_data):
+    """Total the Achieved columns of a whole team leader worksheet (dashboard summary)"""
+    team_name = find_team_name(all_data)
+    
+    # Initialize aggregates
+    total_wa_audit = 0
+    total_call_audit = 0
+    total_mocks = 0
+    total_sl_calls = 0
+    total_registrations = 0
+    total_pitches = 0
+    total_current_mc = 0
+    rm_count = 0
+    
+    # Parse each row looking for achieved values
+    for row in all_data:
+        if len(row) < 15:
+            continue
+        
+        # Check if this is a data row (has RM name and numbers)
+        rm_name = row[1] if len(row) > 1 else ''
+        
+        # Skip header rows and team name rows
+        if not rm_name or 'RM Name' in rm_name or 'Target' in rm_name or 'Achieved' in rm_name:
+            continue
+        if team_name and team_name in rm_name:
+            continue
+        
+        # Try to extract achieved values from various columns
+        try:
+            # WA Audit Achieved (column D, index 3)
+            if len(row) > 3 and row[3] and row[3].strip() and row[3].strip().isdigit():
+                total_wa_audit += int(row[3])
+            
+            # Call Audit Achieved (column F, index 5)
+            if len(row) > 5 and row[5] and row[5].strip() and row[5].strip().isdigit():
+                total_call_audit += int(row[5])
+            
+            # Mocks Achieved (column H, index 7)
+            if len(row) > 7 and row[7] and row[7].strip() and row[7].strip().isdigit():
+                total_mocks += int(row[7])
+            
+            # SL Calls Achieved (column J, index 9)
+            if len(row) > 9 and row[9] and row[9].strip() and row[9].strip().isdigit():
+                total_sl_calls += int(row[9])
+            
+            # Follow ups Registrations Achieved (column L, index 11)
+            if len(row) > 11 and row[11] and row[11].strip():
+                val = row[11].strip()
+                # Extract number even if it has text (like "1-Shwetha")
+                num = re.findall(r'\d+', val)
+                if num:
+                    total_registrations += int(num[0])
+            
+            # Pitches Achieved (column N, index 13)
+            if len(row) > 13 and row[13] and row[13].strip() and row[13].strip().isdigit():
+                total_pitches += int(row[13])
+            
+            # Current MC Registrations Achieved (column P, index 15)
+            if len(row) > 15 and row[15] and row[15].strip() and row[15].strip().isdigit():
+                total_current_mc += int(row[15])
+            
+            # Count this RM if they have any data
+            if any([row[3], row[5], row[7], row[9], row[11], row[13], row[15]]):
+                rm_count += 1
+        except:
+            continue
+    
+    # Calculate conversion rate
+    conversion_rate = round((total_registrations / total_pitches * 100), 1) if total_pitches > 0 else 0.0
+    
+    return {
+        'team_name': team_name,
+        'total_rms': rm_count,
+        'total_wa_audit': total_wa_audit,
+        'total_call_audit': total_call_audit,
+        'total_mocks': total_mocks,
+        'total_sl_calls': total_sl_calls,
+        'total_pitches': total_pitches,
+        'total_registrations': total_registrations,
+        'total_current_mc': total_current_mc,
+        'conversion_rate': conversion_rate
+    }
@@ -0,0 +1,242 @@
+"""
+IRON LADY - Job Telemetry
+Per-stage spans for the daily email job (auth, spreadsheet open, fetch per request -
+with rows/bytes per worksheet range in its 'ranges' field - parse, aggregate, checklist,
+render, SMTP)
+Each span records its duration, rows and bytes handled, Sheets API calls and the
+peak traced Python memory (tracemalloc) while it was open
+
+Spans are written as JSON lines to JOB_TELEMETRY_PATH and summarized per stage in a
+table at the end of the run (and in the Actions job summary when GITHUB_STEP_SUMMARY is set)
+Nothing is recorded until start() is called, so the dashboard pays no cost
+"""
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+JOB_TELEMETRY_PATH = os.getenv('JOB_TELEMETRY_PATH', 'job_telemetry.jsonl').strip()
+
+# tracemalloc slows allocation-heavy code; set to false to keep only timings and counts
+JOB_TRACE_MEMORY = os.getenv('JOB_TRACE_MEMORY', 'true').strip().lower() not in ('0', 'false', 'no')
+
+MB = 1024 * 1024
+
+# ============================================
+# SPANS
+# ============================================
+
+class Span:
+    """
+    One timed stage; set rows/bytes (or other fields) on it while it is open
+    api_calls counts Sheets requests made while the span was open - by any thread,
+    or only by the span's own thread for thread_scoped spans (one per worker fetch)
+    """
+    
+    def __init__(self, stage, detail=None, thread_scoped=False, **fields):
+        self.stage = stage
+        self.detail = detail
+        self.thread_scoped = thread_scoped
+        self.fields = fields
+        self.rows = None
+        self.bytes = None
+        self.api_calls = 0
+        self.peak_bytes = 0
+        self.status = 'ok'
+        self.started_at = datetime.now()
+        self.duration = 0.0
+        self._start = time.perf_counter()
+        self._start_calls = 0
+    
+    def add(self, rows=0, size=0):
+        """Count rows and bytes handled by the stage"""
+        self.rows = (self.rows or 0) + rows
+        self.bytes = (self.bytes or 0) + size
+    
+    def to_record(self, run_id):
+        record = {
+            'run': run_id,
+            'stage': self.stage,
+            'detail': self.detail,
+            'started_at': self.started_at.isoformat(timespec='milliseconds'),
+            'duration_ms': round(self.duration * 1000, 1),
+            'rows': self.rows,
+            'bytes': self.bytes,
+            'api_calls': self.api_calls,
+            'peak_mb': round(self.peak_bytes / MB, 2) if tracemalloc.is_tracing() else None,
+            'status': self.status,
+        }
+        record.update(self.fields)
+        return record
+
+def grid_size(grid):
+    """(rows, bytes of cell text) of a worksheet grid"""
+    if not grid:
+        return 0, 0
+    return len(grid), sum(len(str(cell).encode('utf-8')) for row in grid for cell in row)
+
+class Telemetry:
+    """Collects the spans of one run; thread-safe, a no-op until start()"""
+    
+    def __init__(self):
+        self.enabled = False
+        self.run_id = None
+        self.spans = []
+        self.api_calls = 0
+        self._open = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+    
+    def start(self, trace_memory=JOB_TRACE_MEMORY):
+        self.enabled = True
+        self.run_id = datetime.now().strftime('%Y%m%dT%H%M%S')
+        self.spans = []
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+    
+    def count_api_call(self):
+        """Called for every Sheets/Drive request (including retries)"""
+        if not self.enabled:
+            return
+        
+        with self._lock:
+            self.api_calls += 1
+        self._local.api_calls = getattr(self._local, 'api_calls', 0) + 1
+    
+    def _calls(self, thread_scoped):
+        return getattr(self._local, 'api_calls', 0) if thread_scoped else self.api_calls
+    
+    def _fold_peak(self):
+        # tracemalloc keeps a single process-wide peak: credit it to every open span
+        # before resetting, so overlapping spans each see the highest point in their lifetime
+        if not tracemalloc.is_tracing():
+            return
+        _, peak = tracemalloc.get_traced_memory()
+        for span in self._open:
+            span.peak_bytes = max(span.peak_bytes, peak)
+        tracemalloc.reset_peak()
+    
+    @contextmanager
+    def span(self, stage, detail=None, thread_scoped=False, **fields):
+        """Time a stage: `with TELEMETRY.span('parse', 'Ghazala') as span: span.add(rows=...)`"""
+        span = Span(stage, detail, thread_scoped, **fields)
+        if not self.enabled:
+            yield span
+            return
+        
+        with self._lock:
+            self._fold_peak()
+            self._open.append(span)
+            span._start_calls = self._calls(thread_scoped)
+        span._start = time.perf_counter()
+        
+        try:
+            yield span
+        except BaseException:
+            span.status = 'error'
+            raise
+        finally:
+            span.duration = time.perf_counter() - span._start
+            with self._lock:
+                self._fold_peak()
+                self._open.remove(span)
+                span.api_calls = self._calls(thread_scoped) - span._start_calls
+                self.spans.append(span)
+    
+    # ============================================
+    # OUTPUT
+    # ============================================
+    
+    def records(self):
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.started_at)
+        return [span.to_record(self.run_id) for span in spans]
+    
+    def summary(self):
+        """Per-stage totals in first-seen order: {stage: {count, total_ms, max_ms, rows, bytes, api_calls, peak_mb}}"""
+        stages = {}
+        for record in self.records():
+            stage = stages.setdefault(record['stage'], {
+                'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rows': 0, 'bytes': 0, 'api_calls': 0, 'peak_mb': None
+            })
+            stage['count'] += 1
+            stage['total_ms'] += record['duration_ms']
+            stage['max_ms'] = max(stage['max_ms'], record['duration_ms'])
+            stage['rows'] += record['rows'] or 0
+            stage['bytes'] += record['bytes'] or 0
+            stage['api_calls'] += record['api_calls']
+            if record['peak_mb'] is not None:
+                stage['peak_mb'] = max(stage['peak_mb'] or 0, record['peak_mb'])
+        return stages
+    
+    def summary_table(self):
+        """Plain-text summary table for the log"""
+        header = f"{'stage':<12} {'spans':>5} {'total':>10} {'max':>10} {'rows':>8} {'bytes':>10} {'API':>4} {'peak':>9}"
+        lines = [header, '-' * len(header)]
+        for name, stage in self.summary().items():
+            peak = f"{stage['peak_mb']:.1f} MB" if stage['peak_mb'] is not None else '-'
+            lines.append(
+                f"{name:<12} {stage['count']:>5} {stage['total_ms']:>8.0f}ms {stage['max_ms']:>8.0f}ms "
+                f"{stage['rows']:>8} {stage['bytes']:>10} {stage['api_calls']:>4} {peak:>9}"
+            )
+        return '\n'.join(lines)
+    
+    def summary_markdown(self):
+        """Summary table as Markdown (GitHub Actions job summary)"""
+        lines = [
+            '| Stage | Spans | Total (ms) | Max (ms) | Rows | Bytes | API calls | Peak (MB) |',
+            '|---|---:|---:|---:|---:|---:|---:|---:|',
+        ]
+        for name, stage in self.summary().items():
+            peak = f"{stage['peak_mb']:.1f}" if stage['peak_mb'] is not None else '-'
+            lines.append(
+                f"| {name} | {stage['count']} | {stage['total_ms']:.0f} | {stage['max_ms']:.0f} | "
+                f"{stage['rows']} | {stage['bytes']} | {stage['api_calls']} | {peak} |"
+            )
+        return '\n'.join(lines)
+    
+    def emit(self, path=JOB_TELEMETRY_PATH):
+        """Append the run's spans to the JSON lines file and print the summary table"""
+        if not self.enabled:
+            return
+        
+        records = self.records()
+        
+        if path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                with open(path, 'a', encoding='utf-8') as f:
+                    for record in records:
+                        f.write(json.dumps(record) + '\n')
+            except OSError as e:
+                print(f"⚠️  Could not write telemetry to {path}: {e}")
+        
+        # Raw spans in the Actions log too, folded away by default
+        if os.getenv('GITHUB_ACTIONS'):
+            print("::group::Telemetry spans (JSON lines)")
+            for record in records:
+                print(json.dumps(record))
+            print("::endgroup::")
+        
+        print("\n" + "="*60)
+        print(f"STAGE TIMINGS ({len(records)} spans{', ' + path if path else ''})")
+        print("="*60)
+        print(self.summary_table())
+        
+        step_summary = os.getenv('GITHUB_STEP_SUMMARY', '').strip()
+        if step_summary:
+            try:
+                with open(step_summary, 'a', encoding='utf-8') as f:
+                    f.write(f"### Email job stage timings ({self.run_id})\n\n{self.summary_markdown()}\n")
+            except OSError as e:
+                print(f"⚠️  Could not write job summary: {e}")
+
+TELEMETRY = Telemetry()
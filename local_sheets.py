@@ -0,0 +1,235 @@
+"""
+IRON LADY - Local Sheets Backend
+Offline stand-in for Google Sheets: serves worksheet grids from a local workbook file
+with optional simulated latency and quota (429) errors
+Selected with SHEETS_BACKEND=local (see ironlady_sheets.open_sheets_session), so the
+email job and the dashboard run unchanged without Google credentials
+
+Workbook formats:
+- a .json file holding {worksheet title: [[cell, ...], ...]}
+- a directory of .csv files, one per worksheet (file name = worksheet title)
+"""
+
+import csv
+import json
+import os
+import random
+import re
+import threading
+import time
+import gspread
+import requests
+from ironlady_sheets import SheetsSession, call_with_backoff, load_grid_cache
+
+# ============================================
+# WORKBOOK FILES
+# ============================================
+
+def load_workbook(path):
+    """Read a workbook file or directory into {title: grid}"""
+    if os.path.isdir(path):
+        grids = {}
+        for filename in sorted(os.listdir(path)):
+            if filename.lower().endswith('.csv'):
+                with open(os.path.join(path, filename), newline='', encoding='utf-8') as f:
+                    grids[filename[:-4]] = [list(row) for row in csv.reader(f)]
+        return grids
+    
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_workbook(path, grids):
+    """Write {title: grid} as a JSON workbook (written atomically)"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(grids, f)
+    os.replace(tmp_path, path)
+
+def workbook_version(path):
+    """Stands in for the Drive file version: changes whenever the workbook file changes"""
+    if os.path.isdir(path):
+        return str(max([os.stat(path).st_mtime_ns] + [
+            os.stat(os.path.join(path, filename)).st_mtime_ns for filename in os.listdir(path)
+        ]))
+    return str(os.stat(path).st_mtime_ns)
+
+# ============================================
+# A1 RANGES
+# ============================================
+
+A1_RANGE_PATTERN = re.compile(
+    r"^(?:'((?:[^']|'')*)'|([^!]+))"              # 'Quoted title' or Title
+    r"(?:!([A-Z]*)(\d*)(?::([A-Z]*)(\d*))?)?$"     # optional !A1:P20, !A:A, !A5:P
+)
+
+def column_index(letters):
+    """Zero-based column index for column letters (A = 0)"""
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - ord('A') + 1
+    return index - 1
+
+def parse_a1_range(a1_range):
+    """
+    Split an A1 range into (title, first row, end row, first column, end column)
+    Rows and columns are zero-based and end-exclusive; None means 'to the edge of the sheet'
+    """
+    match = A1_RANGE_PATTERN.match(a1_range.strip())
+    if not match:
+        raise ValueError(f"Unsupported A1 range: {a1_range}")
+    
+    quoted_title, plain_title, start_col, start_row, end_col, end_row = match.groups()
+    title = quoted_title.replace("''", "'") if quoted_title is not None else plain_title
+    
+    first_row = int(start_row) - 1 if start_row else 0
+    first_col = column_index(start_col) if start_col else 0
+    
+    if end_col is None and end_row is None:
+        # Single cell (A1) or whole sheet
+        end_row_index = first_row + 1 if start_row else None
+        end_col_index = first_col + 1 if start_col else None
+    else:
+        end_row_index = int(end_row) if end_row else None
+        end_col_index = column_index(end_col) + 1 if end_col else None
+    
+    return title, first_row, end_row_index, first_col, end_col_index
+
+def read_range(grid, first_row, end_row, first_col, end_col):
+    """Cells of a range, trimmed like the Sheets API (no trailing empty cells or rows)"""
+    values = []
+    for row in grid[first_row:end_row]:
+        cells = [str(cell) for cell in row[first_col:end_col]]
+        while cells and cells[-1] == '':
+            cells.pop()
+        values.append(cells)
+    
+    while values and not values[-1]:
+        values.pop()
+    
+    return values
+
+# ============================================
+# LOCAL SPREADSHEET
+# ============================================
+
+def quota_exceeded_error():
+    """The APIError gspread raises for a 429 from the Sheets API"""
+    response = requests.Response()
+    response.status_code = 429
+    response._content = json.dumps({
+        'error': {
+            'code': 429,
+            'message': "Quota exceeded for quota metric 'Read requests' (simulated)",
+            'status': 'RESOURCE_EXHAUSTED'
+        }
+    }).encode('utf-8')
+    return gspread.exceptions.APIError(response)
+
+class LocalWorksheet:
+    """Just enough of gspread.Worksheet for the dashboard and the email job"""
+    
+    def __init__(self, spreadsheet, title, sheet_id):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.id = sheet_id
+    
+    def get_all_values(self):
+        return self.spreadsheet.values_batch_get([self.title])['valueRanges'][0].get('values', [])
+
+class LocalSpreadsheet:
+    """
+    Stand-in for gspread.Spreadsheet, served from a workbook file
+    Every request waits `latency` seconds and fails with a 429 at `error_rate`;
+    request_count and error_count record what callers did
+    """
+    
+    def __init__(self, workbook_path, latency=0.0, error_rate=0.0, seed=None):
+        self.workbook_path = workbook_path
+        self.grids = load_workbook(workbook_path)
+        self.title = os.path.splitext(os.path.basename(os.path.normpath(workbook_path)))[0]
+        self.latency = latency
+        self.error_rate = error_rate
+        self.request_count = 0
+        self.error_count = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+    
+    def _simulate_request(self):
+        with self._lock:
+            self.request_count += 1
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.error_count += 1
+        
+        if self.latency:
+            time.sleep(self.latency)
+        if failed:
+            raise quota_exceeded_error()
+    
+    def worksheets(self):
+        self._simulate_request()
+        return [LocalWorksheet(self, title, sheet_id) for sheet_id, title in enumerate(self.grids)]
+    
+    def values_batch_get(self, ranges):
+        self._simulate_request()
+        
+        value_ranges = []
+        for a1_range in ranges:
+            title, first_row, end_row, first_col, end_col = parse_a1_range(a1_range)
+            if title not in self.grids:
+                raise ValueError(f"Unable to parse range: {a1_range}")
+            
+            values = read_range(self.grids[title], first_row, end_row, first_col, end_col)
+            value_range = {'range': a1_range, 'majorDimension': 'ROWS'}
+            if values:
+                value_range['values'] = values
+            value_ranges.append(value_range)
+        
+        return {'spreadsheetId': self.title, 'valueRanges': value_ranges}
+    
+    def file_version(self):
+        """Drive metadata request stand-in"""
+        self._simulate_request()
+        return workbook_version(self.workbook_path)
+
+# ============================================
+# LOCAL SESSION
+# ============================================
+
+class LocalSheetsSession(SheetsSession):
+    """
+    SheetsSession backed by a LocalSpreadsheet - same fetching, caching, quota
+    limiting and retries as the Google backend, without credentials or network
+    """
+    
+    def __init__(self, workbook_path, sheet_id='local', cache_path=None, latency=0.0, error_rate=0.0, seed=None):
+        self.workbook_path = workbook_path
+        self.sheet_id = sheet_id
+        self.credentials = None
+        self.cache_path = cache_path
+        self.latency = latency
+        self.error_rate = error_rate
+        self.seed = seed
+        self.last_fetch_reused = []
+        self._client = None
+        self._drive = None
+        self._spreadsheet = None
+        self._worksheets = None
+        self._grid_cache = load_grid_cache(cache_path, sheet_id)
+    
+    @property
+    def client(self):
+        return None
+    
+    @property
+    def spreadsheet(self):
+        if self._spreadsheet is None:
+            self._spreadsheet = LocalSpreadsheet(self.workbook_path, self.latency, self.error_rate, self.seed)
+        return self._spreadsheet
+    
+    def drive_version(self):
+        try:
+            return call_with_backoff(self.spreadsheet.file_version)
+        except Exception:
+            return None
@@ -0,0 +1,120 @@
+"""
+IRON LADY - SMTP Mailer
+One authenticated SMTP connection reused for every message of a run
+(CEO roll-up plus one personalized report per team leader)
+Transient failures (4xx replies, dropped connections) are retried with backoff;
+the connection is re-opened when the server drops it
+
+Works against any SMTP server, e.g. a local stand-in for testing:
+    python -m aiosmtpd -n -l localhost:8025
+    SMTP_HOST=localhost SMTP_PORT=8025 SMTP_STARTTLS=false python send_ironlady_branded_email.py
+"""
+
+import smtplib
+import socket
+import time
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+
+# Errors worth retrying: the connection went away, or the server asked us to try later
+DISCONNECT_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, socket.timeout, ConnectionError)
+
+def is_transient(error):
+    """True for dropped connections and 4xx (temporary) SMTP replies"""
+    if isinstance(error, DISCONNECT_ERRORS):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return False
+
+def build_message(sender, recipients, subject, html_body):
+    """HTML email message"""
+    msg = MIMEMultipart('alternative')
+    msg['From'] = sender
+    msg['To'] = ', '.join(recipients)
+    msg['Subject'] = subject
+    
+    msg.attach(MIMEText(html_body, 'html'))
+    return msg
+
+class SMTPMailer:
+    """
+    Persistent SMTP connection, opened on the first send and kept for the run
+    Use as a context manager, or call close() when done
+    Login is skipped when no password is configured (local test servers)
+    """
+    
+    def __init__(self, host, port, username='', password='', starttls=True, timeout=30,
+                 max_retries=3, backoff=2.0):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.sent_count = 0
+        self.connect_count = 0
+        self._server = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def connect(self):
+        """Open the connection, upgrade to TLS and log in (once per connection)"""
+        self.close()
+        
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                server.starttls()
+            if self.password:
+                server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        
+        self._server = server
+        self.connect_count += 1
+        return server
+    
+    def close(self):
+        if self._server is None:
+            return
+        
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            self._server.close()
+        self._server = None
+    
+    def send(self, recipients, subject, html_body, sender=None):
+        """
+        Send one HTML message over the shared connection
+        Returns (True, "Success") or (False, error message)
+        """
+        msg = build_message(sender or self.username, recipients, subject, html_body)
+        
+        attempt = 0
+        while True:
+            try:
+                server = self._server or self.connect()
+                server.send_message(msg)
+                self.sent_count += 1
+                return True, "Success"
+            
+            except (smtplib.SMTPException, OSError) as e:
+                if isinstance(e, DISCONNECT_ERRORS):
+                    self._server = None
+                
+                if attempt >= self.max_retries or not is_transient(e):
+                    return False, str(e)
+                
+                delay = self.backoff * 2 ** attempt
+                print(f"⚠️  SMTP error ({e}), retrying in {delay:.0f}s")
+                time.sleep(delay)
+                attempt += 1
@@ -0,0 +1,198 @@
+"""
+IRON LADY - Local RM History Store
+Columnar (Parquet) store of per-RM, per-date Target/Achieved records
+Written by the daily email job and the dashboard, read by historical views
+Partitioned by month: <RM_HISTORY_DIR>/month=2025-11/records.parquet
+Records are only ever added; re-recording a date/team/RM keeps the newest values
+"""
+
+import os
+import pandas as pd
+from ironlady_sheets import DateBlockIndex, RM_METRIC_COLUMNS, parse_rm_block
+
+# Parquet needs pyarrow
+try:
+    import pyarrow
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+HISTORY_DIR = os.getenv('RM_HISTORY_DIR', '.rm_history').strip()
+
+RECORD_KEY = ['date', 'team', 'rm_name']
+
+METRIC_FIELDS = [
+    f'{metric}_{kind}'
+    for metric, _, _ in RM_METRIC_COLUMNS
+    for kind in ('target', 'achieved')
+]
+
+RECORD_COLUMNS = RECORD_KEY + METRIC_FIELDS
+
+# ============================================
+# RECORDS
+# ============================================
+
+def build_records(team, record_date, rms):
+    """Turn parsed RM rows for one team and date into history records"""
+    record_date = pd.Timestamp(record_date).normalize()
+    
+    records = []
+    for rm in rms:
+        record = {'date': record_date, 'team': team, 'rm_name': rm['rm_name']}
+        for field in METRIC_FIELDS:
+            record[field] = int(rm.get(field, 0))
+        records.append(record)
+    
+    return records
+
+def block_fingerprint(grid, block):
+    """Hash of a date block's cells, to tell whether it changed since it was recorded"""
+    return hash(tuple(tuple(row) for row in grid[block.date_row:block.data_end]))
+
+def records_from_grid(team, grid, reference_date=None, since=None, recorded=None):
+    """
+    History records for the date blocks in a team leader worksheet grid
+    since: only blocks dated on or after it
+    recorded: {date: fingerprint} of blocks already recorded - unchanged blocks are
+    skipped, and the fingerprints of the others are added to it
+    """
+    date_index = DateBlockIndex(grid, reference_date)
+    since = pd.Timestamp(since).date() if since is not None else None
+    
+    records = []
+    for block_date in date_index.dates:
+        block = date_index.blocks[block_date]
+        
+        if recorded is not None:
+            fingerprint = block_fingerprint(grid, block)
+            if recorded.get(block_date) == fingerprint:
+                continue
+            recorded[block_date] = fingerprint
+        
+        if since is not None and block_date < since:
+            continue
+        
+        records.extend(build_records(team, block_date, parse_rm_block(grid, block)))
+    
+    return records
+
+# ============================================
+# STORE
+# ============================================
+
+def partition_path(month, history_dir=HISTORY_DIR):
+    return os.path.join(history_dir, f'month={month}', 'records.parquet')
+
+def append_records(records, history_dir=HISTORY_DIR):
+    """
+    Add records to their month partitions
+    A record for an existing date/team/RM replaces the older one
+    Returns the number of records written
+    """
+    if not records:
+        return 0
+    
+    if not PARQUET_AVAILABLE:
+        print("⚠️  pyarrow not installed - RM history not recorded")
+        return 0
+    
+    new_frame = pd.DataFrame(records, columns=RECORD_COLUMNS)
+    new_frame['date'] = pd.to_datetime(new_frame['date']).dt.normalize()
+    
+    for month, month_frame in new_frame.groupby(new_frame['date'].dt.strftime('%Y-%m')):
+        path = partition_path(month, history_dir)
+        
+        if os.path.exists(path):
+            month_frame = pd.concat([pd.read_parquet(path), month_frame], ignore_index=True)
+        
+        month_frame = (
+            month_frame
+            .drop_duplicates(subset=RECORD_KEY, keep='last')
+            .sort_values(RECORD_KEY)
+            .reset_index(drop=True)
+        )
+        
+        # Write to a temp file first so readers never see a half-written partition
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        month_frame.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    
+    return len(new_frame)
+
+def read_history(start_date=None, end_date=None, teams=None, columns=None, history_dir=HISTORY_DIR):
+    """
+    Read history records between two dates (inclusive), touching only the
+    month partitions in range. Returns an empty DataFrame if nothing is stored.
+    """
+    wanted_columns = RECORD_COLUMNS if columns is None else list(dict.fromkeys(RECORD_KEY + list(columns)))
+    empty = pd.DataFrame(columns=wanted_columns)
+    
+    if not PARQUET_AVAILABLE or not os.path.isdir(history_dir):
+        return empty
+    
+    start_month = pd.Timestamp(start_date).strftime('%Y-%m') if start_date is not None else None
+    end_month = pd.Timestamp(end_date).strftime('%Y-%m') if end_date is not None else None
+    
+    frames = []
+    for entry in sorted(os.listdir(history_dir)):
+        if not entry.startswith('month='):
+            continue
+        
+        month = entry[len('month='):]
+        if (start_month and month < start_month) or (end_month and month > end_month):
+            continue
+        
+        path = partition_path(month, history_dir)
+        if os.path.exists(path):
+            frames.append(pd.read_parquet(path, columns=wanted_columns))
+    
+    if not frames:
+        return empty
+    
+    history = pd.concat(frames, ignore_index=True)
+    
+    if start_date is not None:
+        history = history[history['date'] >= pd.Timestamp(start_date)]
+    if end_date is not None:
+        history = history[history['date'] <= pd.Timestamp(end_date)]
+    if teams is not None:
+        history = history[history['team'].isin(list(teams))]
+    
+    return history.reset_index(drop=True)
+
+def latest_recorded_date(team, history_dir=HISTORY_DIR):
+    """Newest date recorded for a team (None if none), reading month partitions newest first"""
+    if not PARQUET_AVAILABLE or not os.path.isdir(history_dir):
+        return None
+    
+    months = sorted((entry for entry in os.listdir(history_dir) if entry.startswith('month=')), reverse=True)
+    for entry in months:
+        path = partition_path(entry[len('month='):], history_dir)
+        if not os.path.exists(path):
+            continue
+        
+        dates = pd.read_parquet(path, columns=['date', 'team'])
+        dates = dates.loc[dates['team'] == team, 'date']
+        if len(dates):
+            return dates.max()
+    
+    return None
+
+def read_latest_records(end_date, max_age_days=7, history_dir=HISTORY_DIR):
+    """
+    Each team's records for its most recent recorded date on or before end_date
+    (going back at most max_age_days) - the last parsed data, for stale fallbacks
+    """
+    end_date = pd.Timestamp(end_date).normalize()
+    history = read_history(end_date - pd.Timedelta(days=max_age_days), end_date, history_dir=history_dir)
+    if history.empty:
+        return history
+    
+    latest = history.groupby('team')['date'].transform('max')
+    return history[history['date'] == latest].reset_index(drop=True)
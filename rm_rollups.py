@@ -0,0 +1,169 @@
+"""
+IRON LADY - RM Rollups
+Running per-RM totals by date, kept next to the RM history store (rm_history.py)
+Each row holds an RM's totals of every metric from their first recorded date up to
+that date, so any N-day total is the difference of two rows - trends never re-read
+or re-parse older dates
+Updated incrementally after each append_records(): a new date only needs that day's
+records; a re-recorded (or backfilled) date re-totals its team from that date on
+Stored as one Parquet file: <RM_HISTORY_DIR>/rollups.parquet
+"""
+
+import os
+import pandas as pd
+from rm_history import HISTORY_DIR, METRIC_FIELDS, PARQUET_AVAILABLE, RECORD_COLUMNS, read_history
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+ROLLUP_KEY = ['team', 'rm_name']
+
+# Rolling windows (days) reported by the daily email, each compared with the window before it
+TREND_WINDOWS = (7, 28)
+
+# ============================================
+# ROLLUP TABLE
+# ============================================
+
+def rollups_path(history_dir=HISTORY_DIR):
+    return os.path.join(history_dir, 'rollups.parquet')
+
+def read_rollups(history_dir=HISTORY_DIR):
+    """The rollup table sorted by date (empty if nothing is stored)"""
+    path = rollups_path(history_dir)
+    if not PARQUET_AVAILABLE or not os.path.exists(path):
+        return pd.DataFrame(columns=RECORD_COLUMNS)
+    return pd.read_parquet(path)
+
+def totals_as_of(rollups, day):
+    """Each RM's running totals on `day` (their latest row on or before it)"""
+    return rollups[rollups['date'] <= day].groupby(ROLLUP_KEY)[METRIC_FIELDS].last()
+
+def update_rollups(records, history_dir=HISTORY_DIR):
+    """
+    Fold history records (as passed to append_records, which must run first) into the rollups
+    Pass only new or changed dates (records_from_grid's since/recorded): the team is
+    re-totalled from the earliest date passed
+    Returns the number of rollup rows written
+    """
+    if not records or not PARQUET_AVAILABLE:
+        return 0
+    
+    new_frame = pd.DataFrame(records, columns=RECORD_COLUMNS)
+    new_frame['date'] = pd.to_datetime(new_frame['date']).dt.normalize()
+    
+    rollups = read_rollups(history_dir)
+    frames = [rollups[~rollups['team'].isin(set(new_frame['team']))]]
+    written = 0
+    
+    for team, team_records in new_frame.groupby('team'):
+        from_date = team_records['date'].min()
+        team_rollups = rollups[rollups['team'] == team]
+        
+        if len(team_rollups) and from_date <= team_rollups['date'].max():
+            # Re-recorded or backfilled dates - re-total the team from the earliest one
+            team_records = read_history(start_date=from_date, teams=[team], history_dir=history_dir)
+        else:
+            team_records = team_records.drop_duplicates(subset=['date', 'rm_name'], keep='last')
+        
+        kept = team_rollups[team_rollups['date'] < from_date]
+        base = kept.groupby('rm_name')[METRIC_FIELDS].last()
+        
+        team_records = team_records.sort_values(['rm_name', 'date'])
+        running = team_records.groupby('rm_name')[METRIC_FIELDS].cumsum()
+        running = running.add(base.reindex(team_records['rm_name']).fillna(0).to_numpy())
+        
+        frames.append(kept)
+        frames.append(pd.concat([team_records[['date'] + ROLLUP_KEY], running.astype('int64')], axis=1))
+        written += len(team_records)
+    
+    rollups = (
+        pd.concat([frame for frame in frames if len(frame)], ignore_index=True)
+        .sort_values(['date'] + ROLLUP_KEY)
+        .reset_index(drop=True)
+    )
+    
+    # Write to a temp file first so readers never see a half-written table
+    path = rollups_path(history_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    rollups.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    
+    return written
+
+# ============================================
+# TRENDS
+# ============================================
+
+def rm_trends(as_of, windows=TREND_WINDOWS, rollups=None, history_dir=HISTORY_DIR):
+    """
+    Rolling totals per RM: for each window w, <metric>_<w>d is the total over the w days
+    ending on as_of and <metric>_<w>d_delta its change from the w days before
+    Covers RMs recorded within the longest window; indexed by (team, rm_name)
+    """
+    if rollups is None:
+        rollups = read_rollups(history_dir)
+    
+    as_of = pd.Timestamp(as_of).normalize()
+    active = rollups[(rollups['date'] > as_of - pd.Timedelta(days=max(windows))) & (rollups['date'] <= as_of)]
+    if active.empty:
+        return pd.DataFrame()
+    
+    keys = pd.MultiIndex.from_frame(active[ROLLUP_KEY].drop_duplicates())
+    
+    def totals_days_before(days):
+        return totals_as_of(rollups, as_of - pd.Timedelta(days=days)).reindex(keys, fill_value=0)
+    
+    now = totals_days_before(0)
+    columns = {}
+    for window in windows:
+        window_start = totals_days_before(window)
+        current = now - window_start
+        previous = window_start - totals_days_before(2 * window)
+        for field in METRIC_FIELDS:
+            columns[f'{field}_{window}d'] = current[field]
+            columns[f'{field}_{window}d_delta'] = current[field] - previous[field]
+    
+    return pd.DataFrame(columns).sort_index()
+
+def trend_summary(as_of, teams=None, windows=TREND_WINDOWS, history_dir=HISTORY_DIR):
+    """
+    Rolling totals for the report email:
+    {team: {'totals': {field: value}, 'rms': [{'rm_name': ..., field: value}]}}
+    A window's deltas are None until two full windows of history are stored;
+    'days_recorded' tells how much history the totals cover
+    """
+    rollups = read_rollups(history_dir)
+    if teams is not None:
+        rollups = rollups[rollups['team'].isin(list(teams))]
+    
+    trends = rm_trends(as_of, windows, rollups)
+    if trends.empty:
+        return {}
+    
+    as_of = pd.Timestamp(as_of).normalize()
+    days_recorded = (as_of - rollups['date'].min()).days + 1
+    incomplete = [
+        column for window in windows if days_recorded < 2 * window
+        for column in trends.columns if column.endswith(f'_{window}d_delta')
+    ]
+    
+    def with_gaps(values):
+        values = {field: int(value) for field, value in values.items()}
+        values.update(dict.fromkeys(incomplete))
+        return values
+    
+    summary = {}
+    for team, team_trends in trends.groupby(level='team', sort=False):
+        summary[team] = {
+            'days_recorded': days_recorded,
+            'totals': with_gaps(team_trends.sum()),
+            'rms': [
+                {'rm_name': rm_name, **with_gaps(values)}
+                for (_, rm_name), values in team_trends.iterrows()
+            ]
+        }
+    
+    return summary
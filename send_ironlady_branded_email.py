@@ -7,15 +7,20 @@ Shows targets even when achieved values are empty
 """
 
 import pandas as pd
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from datetime import datetime
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import argparse
+import asyncio
 import os
 import sys
 import json
-import gspread
-from google.oauth2.service_account import Credentials
+from ironlady_sheets import SHEETS_BACKEND, DateBlockIndex, find_checklist_title, open_sheets_session, parse_rm_block, to_date
+from rm_history import append_records, build_records, read_latest_records
+from rm_rollups import trend_summary, update_rollups
+from email_templates import render_report_html
+from mailer import SMTPMailer
+from job_telemetry import TELEMETRY, grid_size
 
 # ============================================
 # CONFIGURATION
@@ -24,8 +29,9 @@ from google.oauth2.service_account import Credentials
 # Email config
 EMAIL_SENDER = os.getenv('GMAIL_USER', '').strip()
 EMAIL_PASSWORD = os.getenv('GMAIL_APP_PASSWORD', '').strip()
-EMAIL_SMTP_SERVER = 'smtp.gmail.com'
-EMAIL_SMTP_PORT = 587
+EMAIL_SMTP_SERVER = os.getenv('SMTP_HOST', 'smtp.gmail.com').strip()
+EMAIL_SMTP_PORT = int(os.getenv('SMTP_PORT', '587'))
+EMAIL_SMTP_STARTTLS = os.getenv('SMTP_STARTTLS', 'true').strip().lower() not in ('0', 'false', 'no')
 
 # Recipients - IMPROVED HANDLING
 CEO_EMAIL = os.getenv('CEO_EMAIL', '').strip()
@@ -62,10 +68,50 @@ def parse_email_recipients():
 
 RECIPIENT_EMAILS = parse_email_recipients()
 
+# Personalized reports - TEAM_LEADER_EMAILS="Ghazala: ghazala@example.com, Afreen: afreen@example.com"
+TEAM_LEADER_EMAILS_RAW = os.getenv('TEAM_LEADER_EMAILS', '').strip()
+
+def parse_team_leader_emails():
+    """Parse 'Worksheet: email' pairs into {worksheet name: [emails]}"""
+    leader_emails = {}
+    
+    entries = TEAM_LEADER_EMAILS_RAW.replace('\r\n', '\n').replace('\r', '\n')
+    entries = entries.replace(';', ',').replace('\n', ',')
+    
+    for entry in entries.split(','):
+        if ':' not in entry:
+            continue
+        
+        sheet_name, email = (part.strip() for part in entry.split(':', 1))
+        if sheet_name and '@' in email and '.' in email.split('@')[1]:
+            emails = leader_emails.setdefault(sheet_name, [])
+            if email.lower() not in (e.lower() for e in emails):
+                emails.append(email)
+    
+    return leader_emails
+
+TEAM_LEADER_EMAILS = parse_team_leader_emails()
+
 # Google Sheets config
 SHEET_ID = os.getenv('GOOGLE_SHEET_ID', '').strip()
 CREDENTIALS_JSON = os.getenv('GOOGLE_SHEETS_CREDENTIALS', '').strip()
 
+# Local copy of the last download - reused while Drive reports the file unchanged
+SHEETS_CACHE_PATH = os.getenv('SHEETS_CACHE_PATH', '.sheets_cache/grids.json').strip()
+
+# 'block' reads only the report date's rows from each team sheet, 'full' reads whole sheets
+SHEETS_FETCH_MODE = os.getenv('SHEETS_FETCH_MODE', 'block').strip().lower()
+
+# The whole run (fetch, aggregate, render, send) must finish within this many seconds
+REPORT_DEADLINE_SECONDS = int(os.getenv('REPORT_DEADLINE_SECONDS', '600'))
+
+# Worker threads for the blocking Sheets/SMTP calls of the pipeline
+PIPELINE_WORKERS = 4
+
+# When Google Sheets is unavailable, the daily report falls back to the last recorded
+# data (local RM history) if it is at most this many days old
+STALE_FALLBACK_MAX_AGE_DAYS = int(os.getenv('STALE_FALLBACK_MAX_AGE_DAYS', '7'))
+
 # Colors
 IRONLADY_COLORS = {
     'primary': '#E63946',
@@ -86,158 +132,49 @@ TEAM_LEADERS = {
 # GOOGLE SHEETS FUNCTIONS
 # ============================================
 
-def get_sheets_client():
-    """Get authenticated Google Sheets client"""
-    if not CREDENTIALS_JSON or not SHEET_ID:
+def get_sheets_session():
+    """Get one authorized Google Sheets session to share across the whole job"""
+    if SHEETS_BACKEND != 'local' and (not CREDENTIALS_JSON or not SHEET_ID):
         print("❌ Missing GOOGLE_SHEETS_CREDENTIALS or GOOGLE_SHEET_ID")
         return None
     
     try:
-        credentials_dict = json.loads(CREDENTIALS_JSON)
-        credentials = Credentials.from_service_account_info(
-            credentials_dict,
-            scopes=[
-                'https://www.googleapis.com/auth/spreadsheets.readonly',
-                'https://www.googleapis.com/auth/drive.readonly'
-            ]
-        )
-        
-        client = gspread.authorize(credentials)
+        credentials_dict = json.loads(CREDENTIALS_JSON) if CREDENTIALS_JSON else {}
+        session = open_sheets_session(credentials_dict, SHEET_ID, cache_path=SHEETS_CACHE_PATH or None)
+        session.client  # authorize up front so credential errors surface here
         print("✅ Google Sheets client authorized")
-        return client
+        return session
     except Exception as e:
         print(f"❌ Error creating client: {e}")
         return None
 
-def find_date_row(worksheet, target_date):
-    """Find the row that starts with the target date"""
-    try:
-        all_values = worksheet.get_all_values()
-        
-        # Look for date in first column
-        for idx, row in enumerate(all_values):
-            if row and len(row) > 0:
-                cell_value = str(row[0]).strip()
-                # Check if it matches the date format (Nov 13, Nov 12, etc.)
-                if target_date in cell_value or cell_value == target_date:
-                    return idx
-        
-        return None
-    except Exception as e:
-        print(f"⚠️  Error finding date row: {e}")
-        return None
-
-def parse_team_leader_sheet(worksheet, date_str):
+def parse_team_leader_sheet(all_values, date_str, date_index=None):
     """
-    Parse a team leader worksheet with structure:
+    Parse a team leader worksheet grid (rows as returned by get_all_values) with structure:
     Date | Team Name | WA Audit (Target/Achieved) | Call Audit | Mocks | SL calls | Follow ups Registrations
            RM Name   | Target | Achieved | Target | Achieved | ...
+    Pass a prebuilt DateBlockIndex to look up several dates without re-scanning
     """
     try:
-        all_values = worksheet.get_all_values()
+        if not all_values:
+            print(f"   ❌ Date {date_str} not found in sheet")
+            return []
         
         if len(all_values) < 3:
             print(f"⚠️  Sheet too small: {len(all_values)} rows")
             return []
         
+        if date_index is None:
+            date_index = DateBlockIndex(all_values, reference_date=to_date(date_str))
+        
         # Find the date
-        date_simple = datetime.strptime(date_str, '%Y-%m-%d').strftime('%b %d').lstrip('0')
-        print(f"   Looking for date: {date_simple} or {date_str}")
-        
-        date_row_idx = None
-        for idx, row in enumerate(all_values):
-            if row and len(row) > 0:
-                cell = str(row[0]).strip()
-                if date_simple in cell or date_str in cell:
-                    date_row_idx = idx
-                    print(f"   Found date at row {idx}")
-                    break
-        
-        if date_row_idx is None:
-            print(f"   ❌ Date not found in sheet")
+        block = date_index.get(date_str)
+        if block is None:
+            print(f"   ❌ Date {date_str} not found in sheet")
             return []
+        print(f"   Found {date_str} at row {block.date_row}")
         
-        # The header row should be right after the date
-        # Usually: row with "RM Name", "Target", "Achieved", etc.
-        header_row_idx = date_row_idx + 1
-        
-        # Data rows start after header
-        data_start_idx = header_row_idx + 1
-        
-        # Read until we hit another date or empty rows
-        rm_data = []
-        seen_rms = set()  # Track RMs we've already added to prevent duplicates
-        
-        for idx in range(data_start_idx, len(all_values)):
-            row = all_values[idx]
-            
-            # Stop if we hit an empty row
-            if not row or len(row) < 2:
-                break
-            
-            rm_name = str(row[1]).strip() if len(row) > 1 else ''
-            
-            # Stop conditions:
-            # 1. Empty RM name
-            # 2. RM name contains date indicators
-            # 3. RM name is same as team name (indicates section header)
-            # 4. RM name is "RM Name" (indicates header row)
-            # 5. We've already seen this RM (duplicate)
-            if (not rm_name or 
-                rm_name == '' or 
-                'Nov' in rm_name or 
-                'Jan' in rm_name or
-                'Dec' in rm_name or
-                rm_name == 'RM Name' or
-                'Rising Stars' in rm_name or
-                'High Flyers' in rm_name or
-                'Goal Getters' in rm_name or
-                rm_name in seen_rms):
-                break
-            
-            seen_rms.add(rm_name)
-            
-            # Parse the metrics (columns: RM Name, Target, Achieved, Target, Achieved, ...)
-            # WA Audit: cols 2,3
-            # Call Audit: cols 4,5
-            # Mocks: cols 6,7
-            # SL Calls: cols 8,9
-            # Follow ups Registrations: cols 10,11
-            
-            def safe_int(val):
-                try:
-                    return int(float(str(val).strip())) if val and str(val).strip() else 0
-                except:
-                    return 0
-            
-            wa_audit_target = safe_int(row[2]) if len(row) > 2 else 0
-            wa_audit_achieved = safe_int(row[3]) if len(row) > 3 else 0
-            
-            call_audit_target = safe_int(row[4]) if len(row) > 4 else 0
-            call_audit_achieved = safe_int(row[5]) if len(row) > 5 else 0
-            
-            mocks_target = safe_int(row[6]) if len(row) > 6 else 0
-            mocks_achieved = safe_int(row[7]) if len(row) > 7 else 0
-            
-            sl_calls_target = safe_int(row[8]) if len(row) > 8 else 0
-            sl_calls_achieved = safe_int(row[9]) if len(row) > 9 else 0
-            
-            registrations_target = safe_int(row[10]) if len(row) > 10 else 0
-            registrations_achieved = safe_int(row[11]) if len(row) > 11 else 0
-            
-            rm_data.append({
-                'rm_name': rm_name,
-                'wa_audit_target': wa_audit_target,
-                'wa_audit_achieved': wa_audit_achieved,
-                'call_audit_target': call_audit_target,
-                'call_audit_achieved': call_audit_achieved,
-                'mocks_target': mocks_target,
-                'mocks_achieved': mocks_achieved,
-                'sl_calls_target': sl_calls_target,
-                'sl_calls_achieved': sl_calls_achieved,
-                'registrations_target': registrations_target,
-                'registrations_achieved': registrations_achieved
-            })
+        rm_data = parse_rm_block(all_values, block)
         
         print(f"   Found {len(rm_data)} RMs")
         return rm_data
@@ -248,29 +185,106 @@ def parse_team_leader_sheet(worksheet, date_str):
         traceback.print_exc()
         return []
 
-def get_all_team_data(date_str):
-    """Get data from all team leader worksheets"""
+def fetch_report_grids(session, date_str=None, end_date_str=None, version=None):
+    """
+    Fetch every team worksheet plus the Checklists worksheet in batched requests
+    With a date in 'block' mode, team grids hold only that date's block
+    (or every block from date_str to end_date_str, for a backfill)
+    Returns {'teams': {sheet_name: grid}, 'checklist': grid or None}
+    """
+    # Worksheet list is cached on the session
+    available_sheets = session.worksheet_titles()
+    print(f"✅ Available worksheets: {available_sheets}")
+    
+    team_sheets = []
+    for sheet_name in TEAM_LEADERS.keys():
+        if sheet_name in available_sheets:
+            team_sheets.append(sheet_name)
+        else:
+            print(f"   ❌ Worksheet '{sheet_name}' not found")
+    
+    checklist_sheet = find_checklist_title(available_sheets)
+    if checklist_sheet:
+        print(f"✅ Found checklist worksheet: {checklist_sheet}")
+    else:
+        print("⚠️  No checklist worksheet found")
+    
+    checklist_titles = [checklist_sheet] if checklist_sheet else []
+    
+    if date_str and SHEETS_FETCH_MODE == 'block':
+        end_date_str = end_date_str or date_str
+        period = date_str if end_date_str == date_str else f"{date_str} to {end_date_str}"
+        
+        team_grids, extra_grids = session.fetch_date_range(team_sheets, date_str, end_date_str, checklist_titles, version)
+        if session.last_fetch_reused:
+            print(f"♻️  Unchanged since last download, sliced {period} blocks from cache")
+        else:
+            fetched_rows = sum(len(grid) for grid in team_grids.values())
+            print(f"✅ Fetched only the {period} blocks ({fetched_rows} rows) from {len(team_grids)} team sheets")
+        
+        return {
+            'teams': team_grids,
+            'checklist': extra_grids.get(checklist_sheet) if checklist_sheet else None
+        }
+    
+    grids = session.fetch_grids(team_sheets + checklist_titles, version=version)
+    reused = session.last_fetch_reused
+    if reused:
+        print(f"♻️  Unchanged since last download, reused: {reused}")
+    if len(reused) < len(grids):
+        print(f"✅ Fetched {len(grids) - len(reused)} worksheets concurrently")
+    
+    return {
+        'teams': {sheet_name: grids[sheet_name] for sheet_name in team_sheets},
+        'checklist': grids.get(checklist_sheet) if checklist_sheet else None
+    }
+
+def open_report_grids(session=None, date_str=None, end_date_str=None, version=None):
+    """Open the spreadsheet through the shared session and fetch all report grids"""
     try:
-        client = get_sheets_client()
-        if not client:
-            return {}
+        if session is None:
+            session = get_sheets_session()
+            if not session:
+                return None
         
-        spreadsheet = client.open_by_key(SHEET_ID)
-        print(f"✅ Opened spreadsheet: {spreadsheet.title}")
+        print(f"✅ Opened spreadsheet: {session.title}")
         
-        # Get all worksheets
-        all_worksheets = spreadsheet.worksheets()
-        available_sheets = [ws.title for ws in all_worksheets]
-        print(f"✅ Available worksheets: {available_sheets}")
+        return fetch_report_grids(session, date_str, end_date_str, version)
+    except Exception as e:
+        print(f"❌ Error fetching sheets data: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
+
+def index_report_grids(grids, reference_date_str):
+    """Build each team grid's date index once, to extract several dates from one fetch"""
+    reference_date = to_date(reference_date_str)
+    return {
+        sheet_name: DateBlockIndex(grid, reference_date=reference_date)
+        for sheet_name, grid in grids['teams'].items()
+    }
+
+def get_all_team_data(date_str, grids=None, session=None, date_indexes=None):
+    """Get data from all team leader worksheets"""
+    try:
+        if grids is None:
+            grids = open_report_grids(session, date_str)
+            if not grids:
+                return {}
         
         team_data = {}
         
         for sheet_name, display_name in TEAM_LEADERS.items():
+            if sheet_name not in grids['teams']:
+                continue
+            
             print(f"\n📋 Processing: {sheet_name}")
             
             try:
-                worksheet = spreadsheet.worksheet(sheet_name)
-                rm_data = parse_team_leader_sheet(worksheet, date_str)
+                with TELEMETRY.span('parse', f"{sheet_name} {date_str}") as span:
+                    date_index = date_indexes.get(sheet_name) if date_indexes else None
+                    rm_data = parse_team_leader_sheet(grids['teams'][sheet_name], date_str, date_index)
+                    span.add(rows=len(rm_data))
                 
                 if rm_data:
                     team_data[sheet_name] = {
@@ -286,11 +300,11 @@ def get_all_team_data(date_str):
                         'rms': []
                     }
                     
-            except gspread.exceptions.WorksheetNotFound:
-                print(f"   ❌ Worksheet '{sheet_name}' not found")
             except Exception as e:
                 print(f"   ❌ Error: {e}")
         
+        record_rm_history(date_str, team_data)
+        
         return team_data
         
     except Exception as e:
@@ -299,6 +313,62 @@ def get_all_team_data(date_str):
         traceback.print_exc()
         return {}
 
+def record_rm_history(date_str, team_data):
+    """Append the day's per-RM rows to the local history store"""
+    try:
+        with TELEMETRY.span('history', date_str) as span:
+            records = []
+            for team_name, team_info in team_data.items():
+                records.extend(build_records(team_name, date_str, team_info['rms']))
+            
+            written = append_records(records)
+            span.add(rows=written or 0)
+            # Fold just these rows into the running totals behind the trends section
+            update_rollups(records)
+        
+        if written:
+            print(f"🗄️  Recorded {written} RM rows for {date_str} in local history")
+    except Exception as e:
+        print(f"⚠️  Could not record RM history: {e}")
+
+def get_trends(date_str, team_names):
+    """7- and 28-day totals per team and RM from the local rollups ({} without history)"""
+    try:
+        with TELEMETRY.span('trends', date_str) as span:
+            trends = trend_summary(date_str, teams=team_names)
+            span.add(rows=sum(len(team['rms']) for team in trends.values()))
+        
+        if trends:
+            days_recorded = next(iter(trends.values()))['days_recorded']
+            print(f"📈 Trends from {days_recorded} days of local history")
+        return trends
+    except Exception as e:
+        print(f"⚠️  Could not compute trends: {e}")
+        return {}
+
+def merge_team_data(daily_team_data):
+    """Sum several days of team data into one period, RM by RM"""
+    merged = {}
+    
+    for team_data in daily_team_data:
+        for team_name, team_info in team_data.items():
+            team = merged.setdefault(team_name, {'display_name': team_info['display_name'], 'rms': {}})
+            
+            for rm in team_info['rms']:
+                if rm['rm_name'] not in team['rms']:
+                    team['rms'][rm['rm_name']] = dict(rm)
+                    continue
+                
+                totals = team['rms'][rm['rm_name']]
+                for key, value in rm.items():
+                    if key != 'rm_name':
+                        totals[key] = totals.get(key, 0) + value
+    
+    return {
+        team_name: {'display_name': team['display_name'], 'rms': list(team['rms'].values())}
+        for team_name, team in merged.items()
+    }
+
 def aggregate_team_summary(team_data):
     """Aggregate data across all teams"""
     summary = {}
@@ -348,46 +418,73 @@ def aggregate_team_summary(team_data):
     
     return summary
 
-def get_checklist_status(date_str):
+# Checklist 'Completed' values (upper-cased) that count as done
+COMPLETED_VALUES = ['TRUE', 'YES', 'Y', '1', 'COMPLETE', 'DONE']
+
+# Date spellings in the Checklists sheet (a cell matches if any of them reads it as the report date)
+CHECKLIST_DATE_FORMATS = ['%Y-%m-%d', '%B %d, %Y', '%b %d, %Y', '%m/%d/%Y', '%d/%m/%Y']
+
+def match_checklist_dates(values, target_date):
+    """
+    Boolean mask of the Checklists date cells that fall on target_date
+    Ambiguous slash dates match both readings (05/11/2025 is 5 Nov and 11 May);
+    each distinct cell is parsed once, form timestamps lose their time of day
+    and 'Nov 13' style dates take the report's year
+    """
+    codes, cells = pd.factorize(values, use_na_sentinel=False)
+    text = pd.Series(cells).astype(str).str.strip().str.replace(r'[ T]\d{1,2}:\d{2}.*$', '', regex=True)
+    target = pd.Timestamp(target_date)
+    
+    matches = pd.Series(False, index=text.index)
+    for date_format in CHECKLIST_DATE_FORMATS:
+        matches |= pd.to_datetime(text, format=date_format, errors='coerce') == target
+    matches |= pd.to_datetime(f"{target.year} " + text, format='%Y %b %d', errors='coerce') == target
+    
+    return pd.Series(matches.to_numpy()[codes], index=values.index)
+
+def match_team_leaders(usernames):
+    """
+    Map lower-cased checklist usernames to TEAM_LEADERS keys
+    Exact (case insensitive) matches first, then usernames containing the leader's name
+    """
+    leader_of = {}
+    
+    for team_name in TEAM_LEADERS.keys():
+        team_lower = team_name.lower()
+        if team_lower in usernames:
+            leader_of.setdefault(team_lower, team_name)
+            continue
+        
+        for user in usernames:
+            if team_lower in user and user not in leader_of:
+                leader_of[user] = team_name
+                print(f"   Matched '{team_name}' to user '{user}'")
+    
+    return leader_of
+
+def get_checklist_status(date_str, grids=None, session=None):
     """Get checklist completion status for each team leader - IMPROVED VERSION"""
+    with TELEMETRY.span('checklist', date_str) as span:
+        checklist_status = compile_checklist_status(date_str, grids, session, span)
+    return checklist_status
+
+def compile_checklist_status(date_str, grids, session, span):
+    """get_checklist_status() body; the checklist rows read are counted on span"""
     try:
-        client = get_sheets_client()
-        if not client:
-            print("⚠️  Could not get sheets client for checklist")
-            return {}
-        
-        spreadsheet = client.open_by_key(SHEET_ID)
-        
-        # Try to find the Checklists worksheet
-        try:
-            worksheet = spreadsheet.worksheet('Checklists')
-            print("✅ Found Checklists worksheet")
-        except gspread.exceptions.WorksheetNotFound:
-            print("⚠️  'Checklists' worksheet not found")
-            
-            # Try alternative names
-            all_sheets = [ws.title for ws in spreadsheet.worksheets()]
-            print(f"   Available worksheets: {all_sheets}")
-            
-            # Look for worksheet with 'checklist' in name (case insensitive)
-            checklist_sheet = None
-            for sheet_name in all_sheets:
-                if 'checklist' in sheet_name.lower():
-                    try:
-                        worksheet = spreadsheet.worksheet(sheet_name)
-                        print(f"✅ Found alternative checklist worksheet: {sheet_name}")
-                        checklist_sheet = worksheet
-                        break
-                    except:
-                        continue
-            
-            if not checklist_sheet:
-                print("❌ No checklist worksheet found")
+        if grids is None:
+            grids = open_report_grids(session, date_str)
+            if not grids:
+                print("⚠️  Could not get sheets data for checklist")
                 return {}
         
+        if grids['checklist'] is None:
+            print("❌ No checklist worksheet found")
+            return {}
+        
         # Get all data
-        all_data = worksheet.get_all_values()
+        all_data = grids['checklist']
         print(f"   Retrieved {len(all_data)} rows from Checklists")
+        span.add(*grid_size(all_data))
         
         if len(all_data) <= 1:
             print("⚠️  No data rows in Checklists worksheet")
@@ -428,18 +525,6 @@ def get_checklist_status(date_str):
         unique_users = df[username_col].unique()
         print(f"   Users in checklist: {unique_users}")
         
-        # Try different date matching strategies
-        date_formats = [
-            date_str,  # 2025-11-13
-            datetime.strptime(date_str, '%Y-%m-%d').strftime('%b %d'),  # Nov 13
-            datetime.strptime(date_str, '%Y-%m-%d').strftime('%B %d, %Y'),  # November 13, 2025
-            datetime.strptime(date_str, '%Y-%m-%d').strftime('%m/%d/%Y'),  # 11/13/2025
-            datetime.strptime(date_str, '%Y-%m-%d').strftime('%d/%m/%Y'),  # 13/11/2025
-        ]
-        
-        filtered_df = pd.DataFrame()
-        matched_date_format = None
-        
         # Try to filter by date if Date column exists
         date_col = None
         for col in ['Date', 'date', 'Timestamp', 'timestamp', 'Day', 'day']:
@@ -448,75 +533,52 @@ def get_checklist_status(date_str):
                 print(f"   Using '{date_col}' as date column")
                 break
         
+        filtered_df = pd.DataFrame()
         if date_col:
-            for date_format in date_formats:
-                filtered_df = df[df[date_col].str.contains(date_format, na=False, case=False)].copy()
-                if len(filtered_df) > 0:
-                    matched_date_format = date_format
-                    print(f"   ✅ Found {len(filtered_df)} entries matching date: {date_format}")
-                    break
+            target_date = datetime.strptime(date_str, '%Y-%m-%d').date()
+            filtered_df = df[match_checklist_dates(df[date_col], target_date)]
+            if len(filtered_df) > 0:
+                print(f"   ✅ Found {len(filtered_df)} entries matching date: {date_str}")
         
         # If no matches, use all data (assume it's today's data)
         if len(filtered_df) == 0:
             print(f"   ⚠️ No date-specific data found, using all checklist data")
-            filtered_df = df.copy()
+            filtered_df = df
         
         if len(filtered_df) == 0:
             print(f"   ❌ No checklist data after filtering")
             return {}
         
-        # Aggregate by team leader with improved matching
+        # Normalize the username and completed columns once, then aggregate per team leader
+        usernames = filtered_df[username_col].astype(str).str.lower()
+        leaders = usernames.map(match_team_leaders(usernames.unique().tolist()))
+        
+        if completed_col:
+            completed = filtered_df[completed_col].astype(str).str.upper().isin(COMPLETED_VALUES)
+        else:
+            print(f"   ⚠️ No completed column found, assuming 0 completed")
+            completed = pd.Series(False, index=filtered_df.index)
+        
+        day_type_col = next((col for col in ['Day_Type', 'day_type', 'DayType', 'Type'] if col in filtered_df.columns), None)
+        day_types = filtered_df[day_type_col] if day_type_col else 'Unknown'
+        
+        per_leader = pd.DataFrame({
+            'leader': leaders,
+            'completed': completed,
+            'day_type': day_types
+        }).groupby('leader', sort=False).agg(
+            completed=('completed', 'sum'),
+            total=('completed', 'size'),
+            day_type=('day_type', 'first')
+        )
+        
         checklist_status = {}
         
         for team_name in TEAM_LEADERS.keys():
-            team_lower = team_name.lower()
-            
-            # Try multiple matching strategies
-            team_data = pd.DataFrame()
-            
-            # Strategy 1: Exact match (case insensitive)
-            team_data = filtered_df[filtered_df[username_col].str.lower() == team_lower]
-            
-            # Strategy 2: Partial match (contains)
-            if len(team_data) == 0:
-                team_data = filtered_df[filtered_df[username_col].str.lower().str.contains(team_lower, na=False)]
-            
-            # Strategy 3: Match first name only
-            if len(team_data) == 0:
-                for user in unique_users:
-                    if team_lower in str(user).lower():
-                        team_data = filtered_df[filtered_df[username_col] == user]
-                        print(f"   Matched '{team_name}' to user '{user}'")
-                        break
-            
-            if len(team_data) > 0:
-                total_tasks = len(team_data)
-                
-                # Check for completed tasks
-                completed_tasks = 0
-                if completed_col:
-                    # Try different ways to identify completed tasks
-                    completed_tasks = len(team_data[
-                        (team_data[completed_col].str.upper() == 'TRUE') |
-                        (team_data[completed_col].str.upper() == 'YES') |
-                        (team_data[completed_col].str.upper() == 'Y') |
-                        (team_data[completed_col] == '1') |
-                        (team_data[completed_col].str.upper() == 'COMPLETE') |
-                        (team_data[completed_col].str.upper() == 'DONE')
-                    ])
-                else:
-                    print(f"   ⚠️ No completed column found, assuming 0 completed")
-                
-                # Get day type if available
-                day_type = 'Unknown'
-                if 'Day_Type' in team_data.columns:
-                    day_type = team_data['Day_Type'].iloc[0]
-                elif 'day_type' in team_data.columns:
-                    day_type = team_data['day_type'].iloc[0]
-                elif 'DayType' in team_data.columns:
-                    day_type = team_data['DayType'].iloc[0]
-                elif 'Type' in team_data.columns:
-                    day_type = team_data['Type'].iloc[0]
+            if team_name in per_leader.index:
+                completed_tasks = int(per_leader.at[team_name, 'completed'])
+                total_tasks = int(per_leader.at[team_name, 'total'])
+                day_type = per_leader.at[team_name, 'day_type']
                 
                 percentage = round((completed_tasks / total_tasks * 100), 1) if total_tasks > 0 else 0
                 
@@ -550,239 +612,50 @@ def get_checklist_status(date_str):
 # EMAIL FUNCTIONS
 # ============================================
 
-def create_email_html(team_summary, team_data, checklist_status={}):
-    """Create HTML email with team and RM-level details"""
-    
-    # Calculate overall totals
-    total_rms = sum(t['total_rms'] for t in team_summary.values())
-    total_reg_target = sum(t['registrations_target'] for t in team_summary.values())
-    total_reg_achieved = sum(t['registrations_achieved'] for t in team_summary.values())
-    avg_conversion = round((total_reg_achieved / total_reg_target * 100), 1) if total_reg_target > 0 else 0
-    
-    # Team summary table
-    team_rows = ""
-    for team_name, data in team_summary.items():
-        conv = data['conversion_rate']
-        if conv >= 15:
-            conv_color = IRONLADY_COLORS['success']
-            conv_icon = '✅'
-        elif conv >= 10:
-            conv_color = IRONLADY_COLORS['primary']
-            conv_icon = '⚠️'
-        else:
-            conv_color = '#dc3545'
-            conv_icon = '❌'
-        
-        team_rows += f"""
-        <tr>
-            <td style="padding: 12px;"><strong>{data['display_name']}</strong></td>
-            <td style="padding: 12px; text-align: center;">{data['total_rms']}</td>
-            <td style="padding: 12px; text-align: center;">{data['registrations_target']}</td>
-            <td style="padding: 12px; text-align: center;">{data['registrations_achieved']}</td>
-            <td style="padding: 12px; text-align: center;">
-                {conv_icon} <span style="color: {conv_color}; font-weight: 700;">{conv}%</span>
-            </td>
-        </tr>
-        """
-    
-    # RM-level details for each team
-    rm_details_html = ""
-    for team_name, team_info in team_data.items():
-        display_name = team_info['display_name']
-        rms = team_info['rms']
-        
-        if not rms:
-            continue
-        
-        rm_details_html += f"""
-        <h3 style="color: {IRONLADY_COLORS['secondary']}; margin-top: 30px; padding: 10px; background: {IRONLADY_COLORS['accent']};">
-            {display_name} - RM Details
-        </h3>
-        <table style="width: 100%; border-collapse: collapse; margin: 10px 0; font-size: 0.9rem;">
-            <tr style="background: {IRONLADY_COLORS['secondary']}; color: white;">
-                <th style="padding: 10px; text-align: left;">RM Name</th>
-                <th style="padding: 10px; text-align: center;">WA Audit<br/><small>T/A</small></th>
-                <th style="padding: 10px; text-align: center;">Call Audit<br/><small>T/A</small></th>
-                <th style="padding: 10px; text-align: center;">Mocks<br/><small>T/A</small></th>
-                <th style="padding: 10px; text-align: center;">SL Calls<br/><small>T/A</small></th>
-                <th style="padding: 10px; text-align: center;">Registrations<br/><small>T/A</small></th>
-            </tr>
-        """
-        
-        for rm in rms:
-            rm_details_html += f"""
-            <tr>
-                <td style="padding: 10px;">{rm['rm_name']}</td>
-                <td style="padding: 10px; text-align: center;">{rm['wa_audit_target']}/{rm['wa_audit_achieved']}</td>
-                <td style="padding: 10px; text-align: center;">{rm['call_audit_target']}/{rm['call_audit_achieved']}</td>
-                <td style="padding: 10px; text-align: center;">{rm['mocks_target']}/{rm['mocks_achieved']}</td>
-                <td style="padding: 10px; text-align: center;">{rm['sl_calls_target']}/{rm['sl_calls_achieved']}</td>
-                <td style="padding: 10px; text-align: center;">{rm['registrations_target']}/{rm['registrations_achieved']}</td>
-            </tr>
-            """
-        
-        rm_details_html += "</table>"
-    
-    # Checklist status section - IMPROVED DISPLAY
-    checklist_html = ""
-    if checklist_status and len(checklist_status) > 0:
-        checklist_html = f"""
-        <h2 class="section-title">✅ Daily Checklist Status</h2>
-        <table style="width: 100%; border-collapse: collapse; margin: 20px 0;">
-            <tr style="background: {IRONLADY_COLORS['secondary']}; color: white;">
-                <th style="padding: 12px; text-align: left;">Team Leader</th>
-                <th style="padding: 12px; text-align: center;">Day Type</th>
-                <th style="padding: 12px; text-align: center;">Completed</th>
-                <th style="padding: 12px; text-align: center;">Total Tasks</th>
-                <th style="padding: 12px; text-align: center;">Progress</th>
-                <th style="padding: 12px; text-align: center;">Status</th>
-            </tr>
-        """
-        
-        for team_name, display_name in TEAM_LEADERS.items():
-            if team_name in checklist_status:
-                status = checklist_status[team_name]
-                percentage = status['percentage']
-                
-                if percentage == 100:
-                    status_icon = '✅'
-                    status_text = 'Complete'
-                    status_color = IRONLADY_COLORS['success']
-                elif percentage >= 50:
-                    status_icon = '⚠️'
-                    status_text = 'In Progress'
-                    status_color = IRONLADY_COLORS['primary']
-                else:
-                    status_icon = '❌'
-                    status_text = 'Not Started'
-                    status_color = '#dc3545'
-                
-                checklist_html += f"""
-                <tr>
-                    <td style="padding: 12px;"><strong>{display_name}</strong></td>
-                    <td style="padding: 12px; text-align: center;">{status['day_type']}</td>
-                    <td style="padding: 12px; text-align: center; font-weight: 700;">{status['completed']}</td>
-                    <td style="padding: 12px; text-align: center;">{status['total']}</td>
-                    <td style="padding: 12px; text-align: center;">
-                        <div style="background: #e0e0e0; height: 20px; border-radius: 10px; overflow: hidden; display: inline-block; width: 100px;">
-                            <div style="background: {status_color}; height: 100%; width: {percentage}%;"></div>
-                        </div>
-                        <span style="margin-left: 10px;">{percentage}%</span>
-                    </td>
-                    <td style="padding: 12px; text-align: center;">
-                        {status_icon} <span style="color: {status_color}; font-weight: 700;">{status_text}</span>
-                    </td>
-                </tr>
-                """
-            else:
-                checklist_html += f"""
-                <tr>
-                    <td style="padding: 12px;"><strong>{display_name}</strong></td>
-                    <td style="padding: 12px; text-align: center;" colspan="5">
-                        <span style="color: #999;">No checklist data</span>
-                    </td>
-                </tr>
-                """
-        
-        checklist_html += "</table>"
-    else:
-        # Show message that checklist data is not available
-        checklist_html = f"""
-        <h2 class="section-title">✅ Daily Checklist Status</h2>
-        <div style="background: {IRONLADY_COLORS['accent']}; padding: 20px; margin: 15px 0; border-left: 5px solid {IRONLADY_COLORS['primary']}; border-radius: 5px;">
-            <p style="margin: 0; color: #666;">
-                <strong>ℹ️ Checklist data not available</strong><br/>
-                <small>Please ensure the 'Checklists' worksheet exists and contains data for today's date.</small>
-            </p>
-        </div>
-        """
-    
-    # Complete HTML
-    html = f"""
-    <html>
-    <head>
-        <style>
-            body {{ font-family: Arial, sans-serif; background: {IRONLADY_COLORS['accent']}; margin: 0; padding: 0; }}
-            .container {{ max-width: 1000px; margin: 20px auto; background: white; border-radius: 10px; box-shadow: 0 4px 12px rgba(0,0,0,0.15); }}
-            .header {{ background: linear-gradient(135deg, {IRONLADY_COLORS['primary']} 0%, {IRONLADY_COLORS['secondary']} 100%); color: white; padding: 40px; text-align: center; }}
-            .header h1 {{ margin: 0; font-size: 2.5rem; letter-spacing: 3px; font-weight: 900; }}
-            .content {{ padding: 40px 30px; }}
-            .section-title {{ color: {IRONLADY_COLORS['secondary']}; font-size: 1.5rem; font-weight: 900; margin: 30px 0 15px; padding-bottom: 10px; border-bottom: 3px solid {IRONLADY_COLORS['primary']}; }}
-            .metric {{ background: {IRONLADY_COLORS['accent']}; padding: 20px; margin: 15px 0; border-left: 5px solid {IRONLADY_COLORS['primary']}; border-radius: 5px; }}
-            table {{ width: 100%; border-collapse: collapse; margin: 20px 0; }}
-            th {{ background: {IRONLADY_COLORS['secondary']}; color: white; padding: 15px; font-weight: 700; }}
-            td {{ padding: 12px; border-bottom: 1px solid #e0e0e0; }}
-            .highlight {{ background: {IRONLADY_COLORS['primary']}; color: white; padding: 3px 8px; border-radius: 3px; font-weight: 700; }}
-            .footer {{ background: {IRONLADY_COLORS['secondary']}; color: white; text-align: center; padding: 30px; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>IRON LADY</h1>
-                <p>Daily Performance Report</p>
-                <p>{datetime.now().strftime('%B %d, %Y')}</p>
-            </div>
-            <div class="content">
-                <h2 class="section-title">📊 Executive Summary</h2>
-                <div class="metric">
-                    <strong>Total RMs:</strong> {total_rms}<br/>
-                    <strong>Registration Target:</strong> {total_reg_target}<br/>
-                    <strong>Registrations Achieved:</strong> {total_reg_achieved}<br/>
-                    <strong>Achievement Rate:</strong> <span class="highlight">{avg_conversion}%</span>
-                </div>
-                
-                <h2 class="section-title">🏆 Team Leader Performance</h2>
-                <table>
-                    <tr>
-                        <th>Team Leader</th>
-                        <th style="text-align: center;">RMs</th>
-                        <th style="text-align: center;">Reg Target</th>
-                        <th style="text-align: center;">Reg Achieved</th>
-                        <th style="text-align: center;">Achievement %</th>
-                    </tr>
-                    {team_rows}
-                </table>
-                
-                <h2 class="section-title">📋 RM-Level Details</h2>
-                <p style="font-size: 0.9rem; color: #666;"><em>T/A = Target / Achieved</em></p>
-                {rm_details_html}
-                
-                {checklist_html}
-                
-                <h2 class="section-title">💡 Key Insights</h2>
-                <div class="metric">
-                    {'✅ <strong>Excellent!</strong> Team meeting targets.' if avg_conversion >= 80 else '⚠️ <strong>Action needed:</strong> Below target achievement.'}
-                </div>
-            </div>
-            <div class="footer">
-                <p style="font-size: 1.3rem; font-weight: 900;">IRON LADY</p>
-                <p>© 2024 Iron Lady. All rights reserved.</p>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
+def create_email_html(team_summary, team_data, checklist_status={}, report_label=None, team_leaders=None, trends=None, notice=None):
+    """Create HTML email with team and RM-level details (templates in email_templates.py)"""
+    
+    if report_label is None:
+        report_label = datetime.now().strftime('%B %d, %Y')
+    
+    if team_leaders is None:
+        team_leaders = TEAM_LEADERS
     
-    return html
+    return render_report_html(team_summary, team_data, checklist_status, team_leaders, IRONLADY_COLORS, report_label, trends, notice)
 
-def send_email(recipients, subject, html_body):
-    """Send email to multiple recipients"""
+def create_leader_email_html(sheet_name, team_summary, team_data, checklist_status={}, report_label=None, trends=None, notice=None):
+    """Personalized report for one team leader - only their team's summary, RMs, trends and checklist"""
+    def only_leader(section):
+        return {name: value for name, value in section.items() if name == sheet_name}
+    
+    return create_email_html(
+        only_leader(team_summary),
+        only_leader(team_data),
+        only_leader(checklist_status),
+        report_label,
+        team_leaders=only_leader(TEAM_LEADERS),
+        trends=only_leader(trends or {}),
+        notice=notice
+    )
+
+def create_mailer():
+    """SMTP mailer that keeps one authenticated connection for the whole run"""
+    return SMTPMailer(
+        EMAIL_SMTP_SERVER,
+        EMAIL_SMTP_PORT,
+        username=EMAIL_SENDER,
+        password=EMAIL_PASSWORD,
+        starttls=EMAIL_SMTP_STARTTLS
+    )
+
+def send_email(recipients, subject, html_body, mailer=None):
+    """Send email to multiple recipients (over the run's shared connection when a mailer is given)"""
     try:
-        msg = MIMEMultipart('alternative')
-        msg['From'] = EMAIL_SENDER
-        msg['To'] = ', '.join(recipients)
-        msg['Subject'] = subject
-        
-        msg.attach(MIMEText(html_body, 'html'))
+        if mailer is None:
+            with create_mailer() as one_off_mailer:
+                return one_off_mailer.send(recipients, subject, html_body, sender=EMAIL_SENDER)
         
-        server = smtplib.SMTP(EMAIL_SMTP_SERVER, EMAIL_SMTP_PORT)
-        server.starttls()
-        server.login(EMAIL_SENDER, EMAIL_PASSWORD)
-        server.send_message(msg)
-        server.quit()
-        
-        return True, "Success"
+        return mailer.send(recipients, subject, html_body, sender=EMAIL_SENDER)
     except Exception as e:
         return False, str(e)
 
@@ -790,49 +663,76 @@ def send_email(recipients, subject, html_body):
 # MAIN
 # ============================================
 
-def main():
-    print("🚀 Iron Lady Email Automation - FIXED VERSION")
-    print(f"📅 {datetime.now().strftime('%B %d, %Y at %I:%M %p')}")
-    print("\n" + "="*60)
-    print("CONFIGURATION CHECK")
-    print("="*60)
+def parse_args(argv=None):
+    """Command line options (no options = today's report)"""
+    parser = argparse.ArgumentParser(description="Iron Lady daily email report")
+    parser.add_argument('--from', dest='from_date', metavar='YYYY-MM-DD',
+                        help="Backfill: first report date")
+    parser.add_argument('--to', dest='to_date', metavar='YYYY-MM-DD',
+                        help="Backfill: last report date (default: today)")
+    parser.add_argument('--combined', action='store_true',
+                        help="Backfill: one report for the whole period instead of one per date")
+    args = parser.parse_args(argv)
     
-    print(f"Gmail: {'✅' if EMAIL_SENDER else '❌'} {EMAIL_SENDER if EMAIL_SENDER else 'Not set'}")
-    print(f"Password: {'✅' if EMAIL_PASSWORD else '❌'}")
-    print(f"Recipients: {'✅' if RECIPIENT_EMAILS else '❌'} {len(RECIPIENT_EMAILS)} email(s)")
-    if RECIPIENT_EMAILS:
-        for email in RECIPIENT_EMAILS:
-            print(f"  → {email}")
-    else:
-        print("  ⚠️  No recipients configured")
-        print("  Set CEO_EMAIL and/or AUTO_MAIL environment variables")
-        print("  Format: single email or multiple emails separated by commas/spaces/newlines")
-    print(f"Sheet ID: {'✅' if SHEET_ID else '❌'}")
-    print(f"Credentials: {'✅' if CREDENTIALS_JSON else '❌'}")
+    if args.to_date and not args.from_date:
+        parser.error("--to needs --from")
+    if args.combined and not args.from_date:
+        parser.error("--combined needs --from")
     
-    if not all([SHEET_ID, CREDENTIALS_JSON]):
-        print("\n❌ Missing required configuration!")
-        sys.exit(1)
+    try:
+        for value in (args.from_date, args.to_date):
+            if value:
+                datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        parser.error("dates must be YYYY-MM-DD")
+    
+    if args.from_date and args.to_date and args.from_date > args.to_date:
+        parser.error("--from must not be after --to")
+    
+    return args
+
+def report_dates(from_date, to_date):
+    """Every date from from_date to to_date (inclusive) as YYYY-MM-DD"""
+    day = datetime.strptime(from_date, '%Y-%m-%d')
+    last = datetime.strptime(to_date, '%Y-%m-%d')
+    
+    dates = []
+    while day <= last:
+        dates.append(day.strftime('%Y-%m-%d'))
+        day += timedelta(days=1)
+    
+    return dates
+
+async def build_daily_report(date_str, grids, date_indexes, executor):
+    """
+    Team data, team summary, checklist status and trends for one report date (None if no team data)
+    The team sheets and the checklist are independent, so they are processed side by side
+    """
+    loop = asyncio.get_running_loop()
     
     print("\n" + "="*60)
-    print("FETCHING DATA FROM GOOGLE SHEETS")
+    print(f"PROCESSING TEAM SHEETS AND CHECKLIST STATUS - {date_str}")
     print("="*60)
     
-    today = datetime.now().strftime('%Y-%m-%d')
-    print(f"Looking for data with date: {today}")
-    
-    # Get all team data
-    team_data = get_all_team_data(today)
+    team_data, checklist_status = await asyncio.gather(
+        loop.run_in_executor(executor, partial(get_all_team_data, date_str, grids, date_indexes=date_indexes)),
+        loop.run_in_executor(executor, get_checklist_status, date_str, grids)
+    )
     
     if not team_data:
-        print(f"\n❌ No team data found!")
-        sys.exit(1)
+        print(f"\n❌ No team data found for {date_str}!")
+        return None
     
     # Aggregate summary
-    team_summary = aggregate_team_summary(team_data)
+    with TELEMETRY.span('aggregate', date_str) as span:
+        team_summary = aggregate_team_summary(team_data)
+        span.add(rows=sum(len(team['rms']) for team in team_data.values()))
+    
+    # Rollups already include today's rows (recorded by get_all_team_data)
+    trends = get_trends(date_str, list(team_data))
     
     print("\n" + "="*60)
-    print("TEAM SUMMARY")
+    print(f"TEAM SUMMARY - {date_str}")
     print("="*60)
     
     for team_name, summary in team_summary.items():
@@ -840,12 +740,10 @@ def main():
         print(f"  RMs: {summary['total_rms']}")
         print(f"  Registrations: {summary['registrations_achieved']}/{summary['registrations_target']} ({summary['conversion_rate']}%)")
     
-    # Get checklist status with improved error handling
     print("\n" + "="*60)
-    print("FETCHING CHECKLIST STATUS")
+    print("CHECKLIST STATUS")
     print("="*60)
     
-    checklist_status = get_checklist_status(today)
     if checklist_status and len(checklist_status) > 0:
         print(f"✅ Checklist data: {len(checklist_status)} team leaders")
         for team_name, status in checklist_status.items():
@@ -853,37 +751,296 @@ def main():
     else:
         print("ℹ️  No checklist data found (this section will show as 'not available' in email)")
     
-    # Create and send email
-    if not RECIPIENT_EMAILS:
+    return team_data, team_summary, checklist_status, trends
+
+def deliver_report(subject, html_body, preview_path='email_preview.html', recipients=None, mailer=None):
+    """Send the report, or save a preview when no recipients are configured. Returns True on success."""
+    if recipients is None:
+        recipients = RECIPIENT_EMAILS
+    
+    if not recipients:
         print("\n⚠️  No recipients configured - generating email preview only")
-        html_body = create_email_html(team_summary, team_data, checklist_status)
         
-        with open('email_preview.html', 'w') as f:
+        with open(preview_path, 'w') as f:
             f.write(html_body)
-        print("✅ Email preview saved to email_preview.html")
-        return
+        print(f"✅ Email preview saved to {preview_path}")
+        return True
     
     print("\n" + "="*60)
     print("SENDING EMAIL")
     print("="*60)
     
-    subject = f"Iron Lady Daily Report - {datetime.now().strftime('%B %d, %Y')}"
-    html_body = create_email_html(team_summary, team_data, checklist_status)
-    
-    success, message = send_email(RECIPIENT_EMAILS, subject, html_body)
+    with TELEMETRY.span('smtp', subject, recipients=len(recipients)) as span:
+        success, message = send_email(recipients, subject, html_body, mailer)
+        span.add(rows=1, size=len(html_body.encode('utf-8')))
+        if not success:
+            span.status = 'error'
     
     print("\n" + "="*60)
     if success:
         print("✅ SUCCESS!")
         print("="*60)
-        print(f"📧 Email sent to {len(RECIPIENT_EMAILS)} recipients")
-        for email in RECIPIENT_EMAILS:
+        print(f"📧 Email sent to {len(recipients)} recipients")
+        for email in recipients:
             print(f"  ✓ {email}")
     else:
         print("❌ FAILED!")
         print("="*60)
         print(f"Error: {message}")
+    
+    return success
+
+def deliver_reports(subject, report_label, team_summary, team_data, checklist_status, mailer, preview_prefix='email_preview',
+                    trends=None, notice=None):
+    """
+    Send the roll-up to RECIPIENT_EMAILS, then each configured team leader their own report
+    Returns True when every message was sent (or previewed)
+    """
+    with TELEMETRY.span('render', f"{report_label} roll-up") as span:
+        html_body = create_email_html(team_summary, team_data, checklist_status, report_label, trends=trends, notice=notice)
+        span.add(rows=1, size=len(html_body.encode('utf-8')))
+    success = deliver_report(subject, html_body, f"{preview_prefix}.html", mailer=mailer)
+    
+    for sheet_name, leader_emails in TEAM_LEADER_EMAILS.items():
+        if sheet_name not in team_data:
+            print(f"⚠️  No report data for team leader '{sheet_name}' - personalized report skipped")
+            continue
+        
+        with TELEMETRY.span('render', f"{report_label} {sheet_name}") as span:
+            leader_html = create_leader_email_html(sheet_name, team_summary, team_data, checklist_status, report_label, trends, notice)
+            span.add(rows=1, size=len(leader_html.encode('utf-8')))
+        leader_subject = f"{subject} - {TEAM_LEADERS.get(sheet_name, sheet_name)}"
+        
+        if not deliver_report(leader_subject, leader_html, f"{preview_prefix}_{sheet_name}.html", leader_emails, mailer):
+            success = False
+    
+    return success
+
+def main(argv=None):
+    args = parse_args(argv)
+    
+    print("🚀 Iron Lady Email Automation - FIXED VERSION")
+    print(f"📅 {datetime.now().strftime('%B %d, %Y at %I:%M %p')}")
+    print("\n" + "="*60)
+    print("CONFIGURATION CHECK")
+    print("="*60)
+    
+    print(f"Gmail: {'✅' if EMAIL_SENDER else '❌'} {EMAIL_SENDER if EMAIL_SENDER else 'Not set'}")
+    print(f"Password: {'✅' if EMAIL_PASSWORD else '❌'}")
+    print(f"SMTP: {EMAIL_SMTP_SERVER}:{EMAIL_SMTP_PORT}{' (STARTTLS)' if EMAIL_SMTP_STARTTLS else ''}")
+    print(f"Recipients: {'✅' if RECIPIENT_EMAILS else '❌'} {len(RECIPIENT_EMAILS)} email(s)")
+    if RECIPIENT_EMAILS:
+        for email in RECIPIENT_EMAILS:
+            print(f"  → {email}")
+    else:
+        print("  ⚠️  No recipients configured")
+        print("  Set CEO_EMAIL and/or AUTO_MAIL environment variables")
+        print("  Format: single email or multiple emails separated by commas/spaces/newlines")
+    if TEAM_LEADER_EMAILS:
+        print(f"Team leader reports: {', '.join(TEAM_LEADER_EMAILS)}")
+    print(f"Sheet ID: {'✅' if SHEET_ID else '❌'}")
+    print(f"Credentials: {'✅' if CREDENTIALS_JSON else '❌'}")
+    if SHEETS_BACKEND != 'google':
+        print(f"Sheets backend: {SHEETS_BACKEND}")
+    
+    if SHEETS_BACKEND != 'local' and not all([SHEET_ID, CREDENTIALS_JSON]):
+        print("\n❌ Missing required configuration!")
         sys.exit(1)
+    
+    TELEMETRY.start()
+    executor = ThreadPoolExecutor(max_workers=PIPELINE_WORKERS)
+    try:
+        exit_code = asyncio.run(asyncio.wait_for(run_pipeline(args, executor), REPORT_DEADLINE_SECONDS))
+    except asyncio.TimeoutError:
+        print(f"\n❌ Report did not finish within {REPORT_DEADLINE_SECONDS}s - giving up")
+        # Spans finished so far show which stage was stuck
+        TELEMETRY.emit()
+        sys.stdout.flush()
+        # A hung Sheets/SMTP call keeps its worker thread busy and a normal exit would
+        # wait for it, so leave immediately
+        os._exit(1)
+    
+    executor.shutdown()
+    TELEMETRY.emit()
+    if exit_code:
+        sys.exit(exit_code)
+
+async def run_pipeline(args, executor):
+    """
+    Fetch, aggregate, render and send as an async pipeline
+    Blocking Sheets and SMTP calls run on the executor; independent steps overlap.
+    Returns the process exit code.
+    """
+    loop = asyncio.get_running_loop()
+    
+    def in_executor(func, *func_args, **func_kwargs):
+        return loop.run_in_executor(executor, partial(func, *func_args, **func_kwargs))
+    
+    print("\n" + "="*60)
+    print("FETCHING DATA FROM GOOGLE SHEETS")
+    print("="*60)
+    
+    today = datetime.now().strftime('%Y-%m-%d')
+    backfill = bool(args.from_date)
+    dates = report_dates(args.from_date, args.to_date or today) if backfill else [today]
+    
+    if backfill:
+        print(f"Backfilling {len(dates)} dates: {dates[0]} to {dates[-1]}")
+    else:
+        print(f"Looking for data with date: {today}")
+    
+    # Authorize once and share the session with every stage
+    with TELEMETRY.span('auth'):
+        session = get_sheets_session()
+    
+    grids = None
+    if session:
+        # The worksheet list and the Drive change check are independent - run them together
+        try:
+            with TELEMETRY.span('open', SHEETS_BACKEND):
+                _, version = await asyncio.gather(in_executor(session.worksheets), in_executor(session.drive_version))
+        except Exception as e:
+            print(f"❌ Error opening spreadsheet: {e}")
+        else:
+            # Fetch every team worksheet and the checklist concurrently - once for all dates
+            # ('fetch' spans time each request, 'grids' the whole step including cache reuse)
+            with TELEMETRY.span('grids', f"{dates[0]} to {dates[-1]}") as span:
+                grids = await in_executor(open_report_grids, session, dates[0], dates[-1], version)
+                if grids:
+                    for grid in list(grids['teams'].values()) + [grids['checklist']]:
+                        span.add(*grid_size(grid))
+    
+    if not grids:
+        print("\n❌ Could not fetch data from Google Sheets!")
+        if backfill:
+            return 1
+        # Send today's report on time anyway, from the last recorded data
+        return await deliver_stale_report(today, in_executor)
+    
+    date_indexes = index_report_grids(grids, dates[-1])
+    
+    # One SMTP connection (and TLS handshake) for every message of the run
+    with create_mailer() as mailer:
+        if not backfill:
+            report = await build_daily_report(today, grids, date_indexes, executor)
+            if report is None:
+                return 1
+            
+            team_data, team_summary, checklist_status, trends = report
+            report_label = datetime.now().strftime('%B %d, %Y')
+            subject = f"Iron Lady Daily Report - {report_label}"
+            
+            sent = await in_executor(deliver_reports, subject, report_label, team_summary, team_data, checklist_status,
+                                     mailer, trends=trends)
+            return 0 if sent else 1
+        
+        daily_team_data = []
+        failed_dates = []
+        
+        for date_str in dates:
+            print("\n" + "="*60)
+            print(f"REPORT FOR {date_str}")
+            print("="*60)
+            
+            report = await build_daily_report(date_str, grids, date_indexes, executor)
+            if report is None:
+                continue
+            
+            team_data, team_summary, checklist_status, trends = report
+            daily_team_data.append(team_data)
+            
+            if args.combined:
+                continue
+            
+            report_label = datetime.strptime(date_str, '%Y-%m-%d').strftime('%B %d, %Y')
+            subject = f"Iron Lady Daily Report - {report_label}"
+            
+            if not await in_executor(deliver_reports, subject, report_label, team_summary, team_data,
+                                     checklist_status, mailer, f"email_preview_{date_str}", trends):
+                failed_dates.append(date_str)
+        
+        if args.combined:
+            if not daily_team_data:
+                print(f"\n❌ No team data found for {dates[0]} to {dates[-1]}!")
+                return 1
+            
+            period_data = merge_team_data(daily_team_data)
+            period_summary = aggregate_team_summary(period_data)
+            
+            first_day = datetime.strptime(dates[0], '%Y-%m-%d')
+            last_day = datetime.strptime(dates[-1], '%Y-%m-%d')
+            report_label = f"{first_day.strftime('%B %d')} - {last_day.strftime('%B %d, %Y')}"
+            subject = f"Iron Lady Period Report - {report_label}"
+            
+            # Checklists are per day, so the period report leaves them out
+            if not await in_executor(deliver_reports, subject, report_label, period_summary, period_data, {},
+                                     mailer, f"email_preview_{dates[0]}_{dates[-1]}"):
+                failed_dates.append(f"{dates[0]} to {dates[-1]}")
+    
+    if failed_dates:
+        print(f"\n❌ Reports failed for: {', '.join(failed_dates)}")
+        return 1
+    
+    return 0
+
+def load_stale_team_data(date_str):
+    """
+    Last parsed team data from the local RM history (see rm_history.py)
+    Returns (team_data, as-of date) - as of the oldest team's date - or ({}, None)
+    """
+    try:
+        records = read_latest_records(date_str, STALE_FALLBACK_MAX_AGE_DAYS)
+    except Exception as e:
+        print(f"⚠️  Could not read RM history: {e}")
+        return {}, None
+    
+    team_data = {}
+    for sheet_name, display_name in TEAM_LEADERS.items():
+        team_records = records[records['team'] == sheet_name]
+        if team_records.empty:
+            continue
+        
+        team_data[sheet_name] = {
+            'display_name': display_name,
+            'rms': team_records.drop(columns=['date', 'team']).to_dict('records')
+        }
+    
+    if not team_data:
+        return {}, None
+    
+    return team_data, records['date'].min().strftime('%Y-%m-%d')
+
+async def deliver_stale_report(date_str, in_executor):
+    """
+    Fallback when Google Sheets is unavailable: send the report from the last recorded
+    data, clearly marked stale (no checklist). Returns the process exit code.
+    """
+    team_data, as_of = load_stale_team_data(date_str)
+    if not team_data:
+        print(f"❌ No recorded data from the last {STALE_FALLBACK_MAX_AGE_DAYS} days to fall back on")
+        return 1
+    
+    as_of_label = datetime.strptime(as_of, '%Y-%m-%d').strftime('%B %d, %Y')
+    print("\n" + "="*60)
+    print(f"⚠️  STALE REPORT - last recorded data from {as_of_label}")
+    print("="*60)
+    if os.getenv('GITHUB_ACTIONS'):
+        print(f"::warning::Google Sheets unavailable - report sent from stale data ({as_of})")
+    
+    team_summary = aggregate_team_summary(team_data)
+    trends = get_trends(as_of, list(team_data))
+    
+    report_label = datetime.now().strftime('%B %d, %Y')
+    subject = f"Iron Lady Daily Report - {report_label} (STALE DATA from {as_of_label})"
+    notice = (
+        f"⚠️ <strong>Stale data:</strong> Google Sheets could not be reached, so this report shows "
+        f"the last recorded data, from <strong>{as_of_label}</strong>. Checklist status is not available."
+    )
+    
+    with create_mailer() as mailer:
+        sent = await in_executor(deliver_reports, subject, report_label, team_summary, team_data, {},
+                                 mailer, trends=trends, notice=notice)
+    return 0 if sent else 1
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,85 @@
+"""
+IRON LADY - Team Data Snapshot
+Last successful parse of the team sheets, kept as an Arrow (Feather) file
+Loaded when the dashboard starts so the first render never waits on Google Sheets
+"""
+
+import os
+from datetime import datetime
+
+# Arrow snapshots need pyarrow
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    SNAPSHOT_AVAILABLE = True
+except ImportError:
+    SNAPSHOT_AVAILABLE = False
+
+# ============================================
+# CONFIGURATION
+# ============================================
+
+SNAPSHOT_PATH = os.getenv('TEAM_SNAPSHOT_PATH', '.sheets_cache/team_data.arrow').strip()
+
+# Schema metadata key holding the time the snapshot's data was fetched
+SAVED_AT_KEY = b'saved_at'
+
+# ============================================
+# SNAPSHOT FILE
+# ============================================
+
+def save_snapshot(team_data, saved_at=None, path=SNAPSHOT_PATH):
+    """
+    Write {username: team summary} to the snapshot file
+    Returns the snapshot timestamp, or None if nothing was written
+    """
+    if not team_data or not SNAPSHOT_AVAILABLE:
+        return None
+    
+    saved_at = saved_at or datetime.now()
+    
+    try:
+        table = pa.Table.from_pylist([
+            {'username': username, **summary}
+            for username, summary in team_data.items()
+        ])
+        table = table.replace_schema_metadata({SAVED_AT_KEY: saved_at.isoformat().encode()})
+        
+        # Uncompressed so the file can be memory-mapped on load;
+        # written to a temp file first so readers never see a half-written snapshot
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = path + '.tmp'
+        feather.write_feather(table, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, path)
+    except (OSError, pa.ArrowException) as e:
+        print(f"⚠️  Could not write team data snapshot: {e}")
+        return None
+    
+    return saved_at
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    """
+    Read the snapshot file
+    Returns (team_data, saved_at), or ({}, None) when there is no usable snapshot
+    """
+    if not SNAPSHOT_AVAILABLE or not os.path.exists(path):
+        return {}, None
+    
+    try:
+        table = feather.read_table(path, memory_map=True)
+        
+        metadata = table.schema.metadata or {}
+        saved_at = None
+        if SAVED_AT_KEY in metadata:
+            saved_at = datetime.fromisoformat(metadata[SAVED_AT_KEY].decode())
+        
+        team_data = {}
+        for row in table.to_pylist():
+            username = row.pop('username')
+            team_data[username] = row
+        
+        return team_data, saved_at
+    
+    except (OSError, ValueError, KeyError, pa.ArrowException) as e:
+        print(f"⚠️  Could not read team data snapshot: {e}")
+        return {}, None